@@ -0,0 +1,59 @@
+"""Flatten weekly_reports.sentiment_breakdown into count columns
+
+Revision ID: 005_report_sentiment
+Revises: 004_company_fields
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "005_report_sentiment"
+down_revision: Union[str, None] = "004_company_fields"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("positive_count", "negative_count", "neutral_count"):
+        op.add_column(
+            "weekly_reports",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    op.execute(
+        """
+        UPDATE weekly_reports SET
+            positive_count = COALESCE((sentiment_breakdown->>'positive')::int, 0),
+            negative_count = COALESCE((sentiment_breakdown->>'negative')::int, 0),
+            neutral_count = COALESCE((sentiment_breakdown->>'neutral')::int, 0)
+        WHERE sentiment_breakdown IS NOT NULL
+        """
+    )
+
+    op.drop_column("weekly_reports", "sentiment_breakdown")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "weekly_reports",
+        sa.Column("sentiment_breakdown", postgresql.JSON(), nullable=True),
+    )
+
+    op.execute(
+        """
+        UPDATE weekly_reports SET sentiment_breakdown = json_build_object(
+            'positive', positive_count,
+            'negative', negative_count,
+            'neutral', neutral_count
+        )
+        """
+    )
+
+    op.drop_column("weekly_reports", "neutral_count")
+    op.drop_column("weekly_reports", "negative_count")
+    op.drop_column("weekly_reports", "positive_count")
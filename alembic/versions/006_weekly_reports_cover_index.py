@@ -0,0 +1,40 @@
+"""Add covering index for weekly reports list
+
+Revision ID: 006_reports_cover_index
+Revises: 005_report_sentiment
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "006_reports_cover_index"
+down_revision: Union[str, None] = "005_report_sentiment"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_weekly_reports_user_week_cover",
+        "weekly_reports",
+        ["user_id", sa.text("week_start DESC")],
+        postgresql_include=[
+            "id",
+            "week_end",
+            "total_reviews",
+            "positive_count",
+            "negative_count",
+            "neutral_count",
+            "total_change_percent",
+            "sent_at",
+            "created_at",
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_weekly_reports_user_week_cover", table_name="weekly_reports")
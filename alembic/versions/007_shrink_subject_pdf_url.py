@@ -0,0 +1,56 @@
+"""Shrink reviews.subject and weekly_reports.pdf_url
+
+Revision ID: 007_shrink_varchars
+Revises: 006_reports_cover_index
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "007_shrink_varchars"
+down_revision: Union[str, None] = "006_reports_cover_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Truncated subjects are still readable
+    op.alter_column(
+        "reviews",
+        "subject",
+        existing_type=sa.String(1000),
+        type_=sa.String(255),
+        existing_nullable=False,
+        postgresql_using="left(subject, 255)",
+    )
+    op.alter_column(
+        "weekly_reports",
+        "pdf_url",
+        existing_type=sa.String(1000),
+        type_=sa.String(512),
+        existing_nullable=True,
+        # A truncated path would point at the wrong file; clear oversize ones
+        # instead so the PDF is regenerated on the next download
+        postgresql_using="CASE WHEN length(pdf_url) <= 512 THEN pdf_url END",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "weekly_reports",
+        "pdf_url",
+        existing_type=sa.String(512),
+        type_=sa.String(1000),
+        existing_nullable=True,
+    )
+    op.alter_column(
+        "reviews",
+        "subject",
+        existing_type=sa.String(255),
+        type_=sa.String(1000),
+        existing_nullable=False,
+    )
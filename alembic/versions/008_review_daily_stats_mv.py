@@ -0,0 +1,63 @@
+"""Add review_daily_stats_mv rollup for analytics
+
+Revision ID: 008_review_daily_stats
+Revises: 007_shrink_varchars
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008_review_daily_stats"
+down_revision: Union[str, None] = "007_shrink_varchars"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW review_daily_stats_mv AS
+        SELECT
+            email_account_id,
+            (received_at AT TIME ZONE 'UTC')::date AS day,
+            count(*) AS total,
+            count(*) FILTER (WHERE sentiment = 'positive') AS positive,
+            count(*) FILTER (WHERE sentiment = 'negative') AS negative,
+            count(*) FILTER (WHERE sentiment = 'neutral') AS neutral,
+            count(*) FILTER (WHERE sentiment = 'mixed') AS mixed,
+            count(*) FILTER (WHERE priority = 'critical') AS critical,
+            count(*) FILTER (WHERE priority = 'important') AS important,
+            count(*) FILTER (WHERE priority = 'normal') AS normal,
+            count(*) FILTER (WHERE is_processed) AS processed,
+            count(*) FILTER (WHERE NOT is_processed) AS unprocessed,
+            count(*) FILTER (
+                WHERE is_processed AND processed_at IS NOT NULL
+            ) AS responded,
+            coalesce(sum(extract(epoch FROM processed_at - received_at)) FILTER (
+                WHERE is_processed AND processed_at IS NOT NULL
+            ), 0) AS sum_response_seconds,
+            min(extract(epoch FROM processed_at - received_at)) FILTER (
+                WHERE is_processed AND processed_at IS NOT NULL
+            ) AS min_response_seconds,
+            max(extract(epoch FROM processed_at - received_at)) FILTER (
+                WHERE is_processed AND processed_at IS NOT NULL
+            ) AS max_response_seconds
+        FROM reviews
+        GROUP BY email_account_id, day
+        WITH DATA
+        """
+    )
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        "ux_review_daily_stats_mv_account_day",
+        "review_daily_stats_mv",
+        ["email_account_id", "day"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS review_daily_stats_mv")
@@ -0,0 +1,44 @@
+"""Add covering and partial indexes for review account/recency scans
+
+Revision ID: 009_reviews_scan_indexes
+Revises: 008_review_daily_stats
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "009_reviews_scan_indexes"
+down_revision: Union[str, None] = "008_review_daily_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_reviews_account_received_cover",
+        "reviews",
+        ["email_account_id", sa.text("received_at DESC")],
+        postgresql_include=["sentiment", "priority", "is_processed"],
+    )
+    op.create_index(
+        "ix_reviews_account_received_unprocessed",
+        "reviews",
+        ["email_account_id", sa.text("received_at DESC")],
+        postgresql_where=sa.text("NOT is_processed"),
+    )
+    op.create_index(
+        "ix_reviews_account_received_critical",
+        "reviews",
+        ["email_account_id", sa.text("received_at DESC")],
+        postgresql_where=sa.text("priority = 'critical'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reviews_account_received_critical", table_name="reviews")
+    op.drop_index("ix_reviews_account_received_unprocessed", table_name="reviews")
+    op.drop_index("ix_reviews_account_received_cover", table_name="reviews")
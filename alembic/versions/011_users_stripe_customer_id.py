@@ -0,0 +1,37 @@
+"""Add stripe_customer_id to users
+
+Revision ID: 011_users_stripe_customer
+Revises: 010_webhook_events
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011_users_stripe_customer"
+down_revision: Union[str, None] = "010_webhook_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("stripe_customer_id", sa.String(255), nullable=True),
+    )
+    # Backfill from existing subscriptions so checkout/portal skip the lookup
+    op.execute(
+        """
+        UPDATE users
+        SET stripe_customer_id = subscriptions.stripe_customer_id
+        FROM subscriptions
+        WHERE subscriptions.user_id = users.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "stripe_customer_id")
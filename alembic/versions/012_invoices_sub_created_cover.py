@@ -0,0 +1,40 @@
+"""Replace the invoices subscription index with a covering list index
+
+Revision ID: 012_invoices_sub_created
+Revises: 011_users_stripe_customer
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "012_invoices_sub_created"
+down_revision: Union[str, None] = "011_users_stripe_customer"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_invoices_sub_created",
+        "invoices",
+        ["subscription_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_include=[
+            "stripe_invoice_id",
+            "amount",
+            "currency",
+            "status",
+            "paid_at",
+            "pdf_url",
+        ],
+    )
+    # The new index leads with subscription_id, so this one is redundant
+    op.drop_index("ix_invoices_subscription_id", table_name="invoices")
+
+
+def downgrade() -> None:
+    op.create_index("ix_invoices_subscription_id", "invoices", ["subscription_id"])
+    op.drop_index("ix_invoices_sub_created", table_name="invoices")
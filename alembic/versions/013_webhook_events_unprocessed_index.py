@@ -0,0 +1,30 @@
+"""Add a partial index for sweeping unprocessed webhook events
+
+Revision ID: 013_webhook_events_unprocessed
+Revises: 012_invoices_sub_created
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "013_webhook_events_unprocessed"
+down_revision: Union[str, None] = "012_invoices_sub_created"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_webhook_events_unprocessed",
+        "webhook_events",
+        ["created_at"],
+        postgresql_where=sa.text("status <> 'processed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_unprocessed", table_name="webhook_events")
@@ -0,0 +1,22 @@
+"""
+Response classes for returning Pydantic models without FastAPI re-encoding.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class PydanticResponse(JSONResponse):
+    """
+    JSON response rendered straight from a Pydantic model.
+
+    Returning this from an endpoint skips FastAPI's response_model
+    validation and jsonable_encoder pass; the model is serialized once
+    by pydantic-core. Only use it with models built from trusted data.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
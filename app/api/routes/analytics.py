@@ -6,16 +6,18 @@ Endpoints:
 - GET /api/analytics/trends - Trend data for charts
 - GET /api/analytics/problems - Problems breakdown
 - GET /api/analytics/response-time - Response time statistics
+- GET /api/analytics/dashboard - All of the above in one response
 """
 import logging
 from typing import List, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.api.deps import get_current_active_user
-from app.database import get_async_session
+from app.database import async_session_maker, get_async_session
 from app.models.user import User
 from app.schemas.analytics import (
+    AnalyticsDashboard,
     AnalyticsSummary,
     ProblemStat,
     ResponseTimeStats,
@@ -40,9 +42,12 @@ async def get_summary(
     period: PeriodType = Query("all", description="Time period for statistics"),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> AnalyticsSummary:
+) -> Response:
     service = AnalyticsService(db)
-    return await service.get_summary(user.id, period)
+    return Response(
+        content=await service.get_metric_json("summary", user.id, period),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -54,9 +59,12 @@ async def get_trends(
     period: PeriodType = Query("30d", description="Time period for trends"),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> List[TrendPoint]:
+) -> Response:
     service = AnalyticsService(db)
-    return await service.get_trends(user.id, period)
+    return Response(
+        content=await service.get_metric_json("trends", user.id, period),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -68,9 +76,12 @@ async def get_problems_breakdown(
     period: PeriodType = Query("all", description="Time period for problems analysis"),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> List[ProblemStat]:
+) -> Response:
     service = AnalyticsService(db)
-    return await service.get_problems_breakdown(user.id, period)
+    return Response(
+        content=await service.get_metric_json("problems", user.id, period),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -82,6 +93,23 @@ async def get_response_time_stats(
     period: PeriodType = Query("all", description="Time period for statistics"),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> ResponseTimeStats:
+) -> Response:
     service = AnalyticsService(db)
-    return await service.get_response_time_stats(user.id, period)
+    return Response(
+        content=await service.get_metric_json("response_time", user.id, period),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/dashboard",
+    response_model=AnalyticsDashboard,
+    summary="Get all dashboard analytics",
+)
+async def get_dashboard(
+    period: PeriodType = Query("30d", description="Time period for statistics"),
+    user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+) -> AnalyticsDashboard:
+    service = AnalyticsService(db, session_factory=async_session_maker)
+    return await service.get_dashboard(user.id, period)
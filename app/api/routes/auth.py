@@ -1,11 +1,14 @@
 """
 Authentication API routes for user registration, login, and token management.
 """
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
+from app.config import get_settings
 from app.database import get_async_session
 from app.models.user import User
 from app.schemas.auth import (
@@ -14,7 +17,10 @@ from app.schemas.auth import (
     UserCreate,
     UserResponse,
 )
-from app.services.auth import AuthService, create_access_token, create_refresh_token
+from app.services.auth import AuthService, create_token_pair
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -41,16 +47,26 @@ async def register(
 
     try:
         user = await auth_service.register(user_data)
-        return Token(
-            access_token=create_access_token(user.id),
-            refresh_token=create_refresh_token(user.id),
-        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
 
+    if settings.stripe_secret_key:
+        from app.tasks.billing_tasks import create_stripe_customer
+
+        # Commit first so the worker can load the new user
+        await db.commit()
+        try:
+            create_stripe_customer.delay(str(user.id))
+        except Exception as e:
+            # The account exists; get_or_create_customer creates the
+            # customer at first checkout instead
+            logger.error(f"Failed to enqueue Stripe customer for user {user.id}: {e}")
+
+    return create_token_pair(user.id)
+
 
 @router.post(
     "/login",
@@ -11,8 +11,11 @@ Endpoints:
 - POST /billing/webhook - Stripe webhook (no auth)
 """
 import logging
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
@@ -28,7 +31,7 @@ from app.schemas.billing import (
     SubscriptionResponse,
     UsageResponse,
 )
-from app.services.billing import BillingService
+from app.services.billing import INVOICE_PAGE_SIZE, BillingService
 from app.services.plan_limits import PLAN_LIMITS
 from app.services.usage_tracker import UsageTracker
 
@@ -129,14 +132,34 @@ async def get_subscription(
 
 @router.get("/invoices", response_model=InvoiceListResponse)
 async def get_invoices(
+    limit: int = Query(INVOICE_PAGE_SIZE, ge=1, le=100, description="Items per page"),
+    before: Optional[datetime] = Query(
+        None, description="next_before of the previous page"
+    ),
+    before_id: Optional[UUID] = Query(
+        None, description="next_before_id of the previous page"
+    ),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    """List all invoices for the current user."""
+    """List the current user's invoices, newest first, one page at a time."""
+    if (before is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before and before_id must be given together",
+        )
+
     billing_service = BillingService(db)
-    invoices = await billing_service.get_invoices(user.id)
+    invoices, has_more = await billing_service.get_invoices(
+        user.id,
+        limit=limit,
+        before=(before, before_id) if before is not None else None,
+    )
+    last = invoices[-1] if has_more else None
     return InvoiceListResponse(
-        items=[InvoiceResponse.model_validate(inv) for inv in invoices]
+        items=[InvoiceResponse.model_validate(inv) for inv in invoices],
+        next_before=last.created_at if last else None,
+        next_before_id=last.id if last else None,
     )
 
 
@@ -175,14 +198,18 @@ async def stripe_webhook(
     """
     Stripe webhook endpoint.
 
-    No authentication required - verified via Stripe signature.
+    No authentication required - verified via Stripe signature. The
+    event is stored and handed to a Celery worker; this only waits for
+    the insert.
     """
+    from app.tasks.billing_tasks import process_stripe_webhook
+
     payload = await request.body()
     signature = request.headers.get("stripe-signature", "")
 
     billing_service = BillingService(db)
     try:
-        await billing_service.handle_webhook(payload, signature)
+        event_id = await billing_service.receive_webhook(payload, signature)
     except ValueError as e:
         logger.error(f"Webhook error: {e}")
         raise HTTPException(
@@ -190,4 +217,13 @@ async def stripe_webhook(
             detail=str(e),
         )
 
+    # Commit before enqueueing so the worker always finds the event row
+    await db.commit()
+    if event_id is not None:
+        try:
+            process_stripe_webhook.delay(str(event_id))
+        except Exception as e:
+            # The event is stored; the sweeper or a redelivery enqueues it
+            logger.error(f"Failed to enqueue Stripe webhook {event_id}: {e}")
+
     return {"status": "ok"}
@@ -20,6 +20,7 @@ from app.config import get_settings
 from app.database import get_async_session
 from app.models.user import User
 from app.schemas.gmail import (
+    EMAIL_ACCOUNT_LIST_ADAPTER,
     EmailAccountListResponse,
     EmailAccountResponse,
     EmailAccountUpdate,
@@ -145,7 +146,9 @@ async def list_accounts(
     accounts = await oauth_service.get_user_accounts(current_user.id)
 
     return EmailAccountListResponse(
-        accounts=[EmailAccountResponse.model_validate(acc) for acc in accounts],
+        accounts=EMAIL_ACCOUNT_LIST_ADAPTER.validate_python(
+            accounts, from_attributes=True
+        ),
         total=len(accounts),
     )
 
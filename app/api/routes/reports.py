@@ -15,6 +15,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import FileResponse
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.api.deps import require_plan
 from app.database import get_async_session
@@ -22,10 +23,10 @@ from app.models.enums import PlanType
 from app.models.user import User
 from app.models.weekly_report import WeeklyReport
 from app.schemas.reports import (
+    WEEKLY_REPORT_LIST_ADAPTER,
     GenerateReportResponse,
     WeeklyReportDetail,
     WeeklyReportListResponse,
-    WeeklyReportSummary,
 )
 from app.services.weekly_report import WeeklyReportService
 
@@ -57,9 +58,24 @@ async def list_weekly_reports(
     )
     total = count_result.scalar() or 0
 
-    # Get reports
+    # Get reports, loading only the summary columns covered by
+    # ix_weekly_reports_user_week_cover
     result = await db.execute(
         select(WeeklyReport)
+        .options(
+            load_only(
+                WeeklyReport.id,
+                WeeklyReport.week_start,
+                WeeklyReport.week_end,
+                WeeklyReport.total_reviews,
+                WeeklyReport.positive_count,
+                WeeklyReport.negative_count,
+                WeeklyReport.neutral_count,
+                WeeklyReport.total_change_percent,
+                WeeklyReport.sent_at,
+                WeeklyReport.created_at,
+            )
+        )
         .where(WeeklyReport.user_id == user.id)
         .order_by(WeeklyReport.week_start.desc())
         .offset(offset)
@@ -68,19 +84,9 @@ async def list_weekly_reports(
     reports = result.scalars().all()
 
     return WeeklyReportListResponse(
-        reports=[
-            WeeklyReportSummary(
-                id=r.id,
-                week_start=r.week_start,
-                week_end=r.week_end,
-                total_reviews=r.total_reviews,
-                sentiment_breakdown=r.sentiment_breakdown,
-                total_change_percent=r.total_change_percent,
-                sent_at=r.sent_at,
-                created_at=r.created_at,
-            )
-            for r in reports
-        ],
+        reports=WEEKLY_REPORT_LIST_ADAPTER.validate_python(
+            reports, from_attributes=True
+        ),
         total=total,
     )
 
@@ -119,6 +125,9 @@ async def get_weekly_report(
         week_start=report.week_start,
         week_end=report.week_end,
         total_reviews=report.total_reviews,
+        positive_count=report.positive_count,
+        negative_count=report.negative_count,
+        neutral_count=report.neutral_count,
         sentiment_breakdown=report.sentiment_breakdown,
         top_problems=report.top_problems,
         critical_reviews=report.critical_reviews,
@@ -12,7 +12,7 @@ Endpoints:
 import logging
 import math
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_current_active_user, PLAN_HIERARCHY
+from app.api.responses import PydanticResponse
 from app.database import get_async_session
 from app.models.draft_response import DraftResponse
 from app.models.email_account import EmailAccount
@@ -90,12 +91,18 @@ async def verify_review_access(
     return review
 
 
-async def get_user_email_account_ids(user_id: UUID, db: AsyncSession) -> List[UUID]:
-    """Get all email account IDs for a user."""
-    result = await db.execute(
-        select(EmailAccount.id).where(EmailAccount.user_id == user_id)
+def user_email_account_ids(user_id: UUID):
+    """
+    Scalar subquery for a user's email account IDs.
+
+    Used inside IN (...) so the account set is resolved by the review
+    query itself instead of a separate lookup round-trip.
+    """
+    return (
+        select(EmailAccount.id)
+        .where(EmailAccount.user_id == user_id)
+        .scalar_subquery()
     )
-    return [row[0] for row in result.fetchall()]
 
 
 def check_drafts_plan(user: User) -> int:
@@ -149,7 +156,7 @@ async def list_reviews(
     is_processed: Optional[bool] = Query(None, description="Filter by processed status"),
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> ReviewListResponse:
+) -> PydanticResponse:
     """
     List reviews with filtering and pagination.
 
@@ -168,13 +175,8 @@ async def list_reviews(
     Returns:
         Paginated list of reviews
     """
-    # Get user's email account IDs
-    account_ids = await get_user_email_account_ids(user.id, db)
-    if not account_ids:
-        return ReviewListResponse(items=[], total=0, page=page, per_page=per_page, pages=0)
-
-    # Build query conditions
-    conditions = [Review.email_account_id.in_(account_ids)]
+    # Build query conditions; a user without accounts simply matches nothing
+    conditions = [Review.email_account_id.in_(user_email_account_ids(user.id))]
 
     if sentiment:
         if sentiment not in [s.value for s in SentimentType]:
@@ -231,9 +233,10 @@ async def list_reviews(
     )
     reviews = result.scalars().all()
 
-    # Convert to response
+    # Rows come straight from the database, whose column types and
+    # constraints already guarantee the schema, so validation is skipped
     items = [
-        ReviewListItem(
+        ReviewListItem.model_construct(
             id=review.id,
             sender_email=review.sender_email,
             sender_name=review.sender_name,
@@ -249,12 +252,14 @@ async def list_reviews(
         for review in reviews
     ]
 
-    return ReviewListResponse(
-        items=items,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=pages,
+    return PydanticResponse(
+        ReviewListResponse.model_construct(
+            items=items,
+            total=total,
+            page=page,
+            per_page=per_page,
+            pages=pages,
+        )
     )
 
 
@@ -268,7 +273,7 @@ async def get_review(
     review_id: UUID,
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> ReviewDetail:
+) -> PydanticResponse:
     """
     Get detailed review information.
 
@@ -298,7 +303,7 @@ async def get_review(
     drafts = drafts_result.scalars().all()
 
     draft_responses = [
-        DraftResponseResponse(
+        DraftResponseResponse.model_construct(
             id=draft.id,
             review_id=draft.review_id,
             content=draft.content,
@@ -309,23 +314,25 @@ async def get_review(
         for draft in drafts
     ]
 
-    return ReviewDetail(
-        id=review.id,
-        sender_email=review.sender_email,
-        sender_name=review.sender_name,
-        subject=review.subject,
-        sentiment=review.sentiment,
-        priority=review.priority,
-        summary=review.summary,
-        problems=review.problems or [],
-        is_processed=review.is_processed,
-        received_at=review.received_at,
-        notes=review.notes,
-        suggestions=review.suggestions or [],
-        drafts=draft_responses,
-        email_account_email=email_account.email,
-        created_at=review.created_at,
-        processed_at=review.processed_at,
+    return PydanticResponse(
+        ReviewDetail.model_construct(
+            id=review.id,
+            sender_email=review.sender_email,
+            sender_name=review.sender_name,
+            subject=review.subject,
+            sentiment=review.sentiment,
+            priority=review.priority,
+            summary=review.summary,
+            problems=review.problems or [],
+            is_processed=review.is_processed,
+            received_at=review.received_at,
+            notes=review.notes,
+            suggestions=review.suggestions or [],
+            drafts=draft_responses,
+            email_account_email=email_account.email,
+            created_at=review.created_at,
+            processed_at=review.processed_at,
+        )
     )
 
 
@@ -340,7 +347,7 @@ async def update_review(
     data: ReviewUpdate,
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> ReviewDetail:
+) -> PydanticResponse:
     """
     Update a review.
 
@@ -382,7 +389,7 @@ async def update_review(
     drafts = drafts_result.scalars().all()
 
     draft_responses = [
-        DraftResponseResponse(
+        DraftResponseResponse.model_construct(
             id=draft.id,
             review_id=draft.review_id,
             content=draft.content,
@@ -393,23 +400,25 @@ async def update_review(
         for draft in drafts
     ]
 
-    return ReviewDetail(
-        id=review.id,
-        sender_email=review.sender_email,
-        sender_name=review.sender_name,
-        subject=review.subject,
-        sentiment=review.sentiment,
-        priority=review.priority,
-        summary=review.summary,
-        problems=review.problems or [],
-        is_processed=review.is_processed,
-        received_at=review.received_at,
-        notes=review.notes,
-        suggestions=review.suggestions or [],
-        drafts=draft_responses,
-        email_account_email=email_account.email,
-        created_at=review.created_at,
-        processed_at=review.processed_at,
+    return PydanticResponse(
+        ReviewDetail.model_construct(
+            id=review.id,
+            sender_email=review.sender_email,
+            sender_name=review.sender_name,
+            subject=review.subject,
+            sentiment=review.sentiment,
+            priority=review.priority,
+            summary=review.summary,
+            problems=review.problems or [],
+            is_processed=review.is_processed,
+            received_at=review.received_at,
+            notes=review.notes,
+            suggestions=review.suggestions or [],
+            drafts=draft_responses,
+            email_account_email=email_account.email,
+            created_at=review.created_at,
+            processed_at=review.processed_at,
+        )
     )
 
 
@@ -425,7 +434,7 @@ async def get_review_drafts(
     review_id: UUID,
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> DraftResponseListResponse:
+) -> PydanticResponse:
     """
     Get all draft responses for a review.
 
@@ -452,7 +461,7 @@ async def get_review_drafts(
     drafts = result.scalars().all()
 
     draft_responses = [
-        DraftResponseResponse(
+        DraftResponseResponse.model_construct(
             id=draft.id,
             review_id=draft.review_id,
             content=draft.content,
@@ -463,9 +472,11 @@ async def get_review_drafts(
         for draft in drafts
     ]
 
-    return DraftResponseListResponse(
-        drafts=draft_responses,
-        total=len(draft_responses),
+    return PydanticResponse(
+        DraftResponseListResponse.model_construct(
+            drafts=draft_responses,
+            total=len(draft_responses),
+        )
     )
 
 
@@ -540,7 +551,7 @@ async def get_draft(
     draft_id: UUID,
     user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
-) -> DraftResponseResponse:
+) -> PydanticResponse:
     """
     Get a specific draft response.
 
@@ -574,11 +585,13 @@ async def get_draft(
             detail="Draft response not found",
         )
 
-    return DraftResponseResponse(
-        id=draft.id,
-        review_id=draft.review_id,
-        content=draft.content,
-        tone=draft.tone,
-        variant_number=draft.variant_number,
-        created_at=draft.created_at,
+    return PydanticResponse(
+        DraftResponseResponse.model_construct(
+            id=draft.id,
+            review_id=draft.review_id,
+            content=draft.content,
+            tone=draft.tone,
+            variant_number=draft.variant_number,
+            created_at=draft.created_at,
+        )
     )
@@ -1,12 +1,17 @@
 """
 Database configuration and session management.
 """
+import asyncio
+import logging
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
+from app.utils.serialization import json_dumps, json_loads
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Create async engine
@@ -14,8 +19,11 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
 )
 
 # Create async session factory
@@ -28,6 +36,22 @@ async_session_maker = async_sessionmaker(
 )
 
 
+async def warm_pool() -> None:
+    """
+    Open pool_size connections up front.
+
+    The connections are checked out concurrently so each one is new, then
+    returned to the pool, where they stay for later requests.
+    """
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(settings.db_pool_size)))
+    logger.info(f"Warmed database pool with {settings.db_pool_size} connections")
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database sessions.
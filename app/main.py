@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy import text
 
 from app.config import get_settings
+from app.database import engine as database_engine, warm_pool
 
 # Sentry initialization (must be before app creation)
 settings_early = get_settings()
@@ -39,7 +40,19 @@ from app.api.routes import analytics as analytics_routes
 from app.api.routes import reports as reports_routes
 from app.api.routes import billing as billing_routes
 from app.api.routes import settings as settings_routes
+from app.schemas.response import (
+    DraftResponseCreate,
+    DraftResponseListResponse,
+    DraftResponseResponse,
+)
+from app.schemas.reviews import ReviewDetail, ReviewListItem, ReviewListResponse
+from app.schemas.settings import (
+    CompanySettingsResponse,
+    NotificationSettingsResponse,
+    ProfileResponse,
+)
 from app.services.redis_client import close_redis_client
+from app.utils.serialization import json_dumps, json_loads
 
 # Configure logging
 logging.basicConfig(
@@ -51,11 +64,31 @@ logger = logging.getLogger(__name__)
 # Get settings
 settings = get_settings()
 
-# Database engine
+# Schemas declared with defer_build; built during startup instead of on the
+# first request that touches them. Request body models are not deferred:
+# FastAPI builds those while registering routes.
+DEFERRED_SCHEMAS = (
+    DraftResponseCreate,
+    DraftResponseResponse,
+    DraftResponseListResponse,
+    ReviewListItem,
+    ReviewDetail,
+    ReviewListResponse,
+    NotificationSettingsResponse,
+    CompanySettingsResponse,
+    ProfileResponse,
+)
+
+# Database engine for the startup check and health endpoint; request
+# sessions use the pool in app.database, so this one stays small
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
+    pool_size=1,
+    max_overflow=2,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
 )
 
 # Session factory
@@ -86,15 +119,22 @@ async def lifespan(app: FastAPI):
         async with engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
         logger.info("Database connection established")
+        # Pre-open the pool behind get_async_session (most routes, webhooks)
+        await warm_pool()
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
 
+    for schema in DEFERRED_SCHEMAS:
+        schema.model_rebuild(force=True)
+    logger.info(f"Built {len(DEFERRED_SCHEMAS)} deferred schemas")
+
     yield
 
     # Cleanup
     logger.info("Shutting down Email Agent API...")
     await close_redis_client()
     await engine.dispose()
+    await database_engine.dispose()
 
 
 # API Tags metadata for OpenAPI documentation
@@ -17,6 +17,7 @@ from app.models.notification_settings import NotificationSettings
 from app.models.review import Review
 from app.models.subscription import Subscription
 from app.models.user import User
+from app.models.webhook_event import WebhookEvent
 from app.models.weekly_report import WeeklyReport
 
 __all__ = [
@@ -41,4 +42,5 @@ __all__ = [
     "WeeklyReport",
     "Subscription",
     "Invoice",
+    "WebhookEvent",
 ]
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,7 +24,6 @@ class Invoice(Base, UUIDMixin, TimestampMixin):
         UUID(as_uuid=True),
         ForeignKey("subscriptions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     stripe_invoice_id: Mapped[str] = mapped_column(
         String(255),
@@ -59,5 +58,25 @@ class Invoice(Base, UUIDMixin, TimestampMixin):
         back_populates="invoices",
     )
 
+    __table_args__ = (
+        # Serves the (created_at, id) keyset-paginated invoice list as an
+        # index-only scan; its leading column also covers subscription_id
+        # lookups
+        Index(
+            "ix_invoices_sub_created",
+            "subscription_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_include=(
+                "stripe_invoice_id",
+                "amount",
+                "currency",
+                "status",
+                "paid_at",
+                "pdf_url",
+            ),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Invoice(id={self.id}, stripe_invoice_id={self.stripe_invoice_id}, amount={self.amount})>"
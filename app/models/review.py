@@ -13,6 +13,7 @@ from sqlalchemy import (
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -49,7 +50,7 @@ class Review(Base, UUIDMixin):
         nullable=True,
     )
     subject: Mapped[str] = mapped_column(
-        String(1000),
+        String(255),
         nullable=False,
     )
     received_at: Mapped[datetime] = mapped_column(
@@ -124,6 +125,27 @@ class Review(Base, UUIDMixin):
             "message_id",
             unique=True,
         ),
+        # Account + recency scans (review list, weekly report) can read the
+        # filter columns from the index without touching the heap
+        Index(
+            "ix_reviews_account_received_cover",
+            "email_account_id",
+            received_at.desc(),
+            postgresql_include=("sentiment", "priority", "is_processed"),
+        ),
+        # Small partial indexes for the "unprocessed" and "critical" views
+        Index(
+            "ix_reviews_account_received_unprocessed",
+            "email_account_id",
+            received_at.desc(),
+            postgresql_where=text("NOT is_processed"),
+        ),
+        Index(
+            "ix_reviews_account_received_critical",
+            "email_account_id",
+            received_at.desc(),
+            postgresql_where=text("priority = 'critical'"),
+        ),
     )
 
     def __repr__(self) -> str:
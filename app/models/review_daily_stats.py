@@ -0,0 +1,32 @@
+"""
+Daily review rollup backed by the review_daily_stats_mv materialized view.
+
+The view is created by migration 008 and refreshed by the
+refresh_review_daily_stats Celery task. It is declared on its own MetaData
+so that create_all and Alembic autogenerate do not treat it as a table.
+"""
+from sqlalchemy import Column, Date, Float, Integer, MetaData, Table
+from sqlalchemy.dialects.postgresql import UUID
+
+view_metadata = MetaData()
+
+review_daily_stats = Table(
+    "review_daily_stats_mv",
+    view_metadata,
+    Column("email_account_id", UUID(as_uuid=True), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("total", Integer, nullable=False),
+    Column("positive", Integer, nullable=False),
+    Column("negative", Integer, nullable=False),
+    Column("neutral", Integer, nullable=False),
+    Column("mixed", Integer, nullable=False),
+    Column("critical", Integer, nullable=False),
+    Column("important", Integer, nullable=False),
+    Column("normal", Integer, nullable=False),
+    Column("processed", Integer, nullable=False),
+    Column("unprocessed", Integer, nullable=False),
+    Column("responded", Integer, nullable=False),
+    Column("sum_response_seconds", Float, nullable=False),
+    Column("min_response_seconds", Float, nullable=True),
+    Column("max_response_seconds", Float, nullable=True),
+)
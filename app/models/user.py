@@ -58,6 +58,11 @@ class User(Base, UUIDMixin, TimestampMixin):
         DateTime(timezone=True),
         nullable=True,
     )
+    # Created in the background at signup so checkout/portal don't wait on Stripe
+    stripe_customer_id: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True,
+    )
 
     # Relationships
     email_accounts: Mapped[List["EmailAccount"]] = relationship(
@@ -0,0 +1,62 @@
+"""
+WebhookEvent model for queued Stripe webhook deliveries.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDMixin
+
+
+class WebhookEvent(Base, UUIDMixin, TimestampMixin):
+    """
+    Verified Stripe event stored for processing outside the request.
+
+    external_id is Stripe's event ID; its unique constraint makes
+    duplicate deliveries a no-op insert.
+    """
+
+    __tablename__ = "webhook_events"
+
+    external_id: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        unique=True,
+    )
+    type: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    payload: Mapped[Dict[str, Any]] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+    # pending -> processed | failed
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default="pending",
+        nullable=False,
+    )
+    error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    __table_args__ = (
+        # Keeps the sweeper's scan to the few unprocessed events
+        Index(
+            "ix_webhook_events_unprocessed",
+            "created_at",
+            postgresql_where=text("status <> 'processed'"),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WebhookEvent(id={self.id}, external_id={self.external_id}, status={self.status})>"
@@ -41,9 +41,22 @@ class WeeklyReport(Base, UUIDMixin):
         nullable=False,
         default=0,
     )
-    sentiment_breakdown: Mapped[Optional[Dict]] = mapped_column(
-        JSON,
-        nullable=True,
+    # Sentiment values are a fixed enum, so counts live in plain columns
+    # that can be read without JSON decoding and aggregated in SQL.
+    positive_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    negative_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    neutral_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
     )
     top_problems: Mapped[Optional[List[Dict]]] = mapped_column(
         JSON,
@@ -76,7 +89,7 @@ class WeeklyReport(Base, UUIDMixin):
         nullable=True,
     )
     pdf_url: Mapped[Optional[str]] = mapped_column(
-        String(1000),
+        String(512),
         nullable=True,
     )
 
@@ -99,7 +112,33 @@ class WeeklyReport(Base, UUIDMixin):
             "week_start",
             unique=True,
         ),
+        # Covers the reports list endpoint so it can run as an index-only scan
+        Index(
+            "ix_weekly_reports_user_week_cover",
+            "user_id",
+            week_start.desc(),
+            postgresql_include=(
+                "id",
+                "week_end",
+                "total_reviews",
+                "positive_count",
+                "negative_count",
+                "neutral_count",
+                "total_change_percent",
+                "sent_at",
+                "created_at",
+            ),
+        ),
     )
 
+    @property
+    def sentiment_breakdown(self) -> Dict[str, int]:
+        """Sentiment counts in the legacy dict shape used by the API and PDFs."""
+        return {
+            "positive": self.positive_count or 0,
+            "negative": self.negative_count or 0,
+            "neutral": self.neutral_count or 0,
+        }
+
     def __repr__(self) -> str:
         return f"<WeeklyReport(id={self.id}, user_id={self.user_id}, week={self.week_start})>"
@@ -30,13 +30,13 @@ from app.schemas.response import (
     RegenerateRequest,
 )
 from app.schemas.reviews import (
-    PaginatedResponse,
     ReviewDetail,
     ReviewListItem,
     ReviewListResponse,
     ReviewUpdate,
 )
 from app.schemas.analytics import (
+    AnalyticsDashboard,
     AnalyticsSummary,
     ProblemStat,
     TrendPoint,
@@ -80,9 +80,9 @@ __all__ = [
     "ReviewListItem",
     "ReviewDetail",
     "ReviewUpdate",
-    "PaginatedResponse",
     "ReviewListResponse",
     # Analytics
+    "AnalyticsDashboard",
     "AnalyticsSummary",
     "TrendPoint",
     "ProblemStat",
@@ -1,9 +1,10 @@
 """
 Pydantic schemas for AI analysis results.
 """
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, TypedDict
 
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, Field, field_validator
 
 
 class ReviewAnalysis(BaseModel):
@@ -39,33 +40,196 @@ class ReviewAnalysis(BaseModel):
     )
 
 
-class AnalysisState(BaseModel):
-    """State object for LangGraph analysis workflow."""
+class ReviewAnalysisStruct(msgspec.Struct, array_like=True):
+    """msgpack transport form of ReviewAnalysis for Redis, same fields."""
+
+    sentiment: Literal["positive", "negative", "neutral"]
+    priority: Literal["critical", "important", "normal"]
+    summary: str
+    problems: List[str] = []
+    suggestions: List[str] = []
+    customer_name: Optional[str] = None
+    requires_response: bool = True
+
+
+def encode_analysis(analysis: ReviewAnalysis) -> bytes:
+    """Encode a ReviewAnalysis as msgpack."""
+    return msgspec.msgpack.encode(
+        ReviewAnalysisStruct(
+            sentiment=analysis.sentiment,
+            priority=analysis.priority,
+            summary=analysis.summary,
+            problems=analysis.problems,
+            suggestions=analysis.suggestions,
+            customer_name=analysis.customer_name,
+            requires_response=analysis.requires_response,
+        )
+    )
+
+
+def decode_analysis(data: bytes) -> ReviewAnalysis:
+    """
+    Decode msgpack produced by encode_analysis.
+
+    msgspec validates the payload while decoding, so the ReviewAnalysis is
+    built without a second Pydantic validation pass.
+
+    Raises:
+        msgspec.DecodeError: If the payload is malformed or has invalid values
+    """
+    struct = msgspec.msgpack.decode(data, type=ReviewAnalysisStruct)
+    return ReviewAnalysis.model_construct(
+        sentiment=struct.sentiment,
+        priority=struct.priority,
+        summary=struct.summary,
+        problems=struct.problems,
+        suggestions=struct.suggestions,
+        customer_name=struct.customer_name,
+        requires_response=struct.requires_response,
+    )
+
+
+class AnalysisState(TypedDict, total=False):
+    """
+    State object for LangGraph analysis workflow.
+
+    A plain TypedDict: LangGraph merges node updates into it without running
+    Pydantic validation on every step. Build the initial value with
+    initial_analysis_state so every key is present.
+    """
 
     # Input
-    review_text: str = ""
-    subject: str = ""
+    review_text: str
+    subject: str
+    sender_name: Optional[str]
 
     # Preprocessing
-    cleaned_text: str = ""
+    cleaned_text: str
+    triaged: bool
 
     # Classification
-    sentiment: Optional[Literal["positive", "negative", "neutral"]] = None
+    sentiment: Optional[Literal["positive", "negative", "neutral"]]
 
     # Extraction
-    problems: List[str] = Field(default_factory=list)
-    suggestions: List[str] = Field(default_factory=list)
-    customer_name: Optional[str] = None
+    problems: List[str]
+    suggestions: List[str]
+    customer_name: Optional[str]
 
     # Summary
-    summary: str = ""
+    summary: str
 
     # Priority
-    priority: Optional[Literal["critical", "important", "normal"]] = None
+    priority: Optional[Literal["critical", "important", "normal"]]
 
     # Response decision
-    requires_response: bool = False
+    requires_response: bool
 
     # Error tracking
-    error: Optional[str] = None
-    analysis_failed: bool = False
+    error: Optional[str]
+    analysis_failed: bool
+
+
+def initial_analysis_state(
+    review_text: str = "",
+    subject: str = "",
+    sender_name: Optional[str] = None,
+) -> AnalysisState:
+    """
+    Build a complete AnalysisState with defaults for every key.
+
+    Args:
+        review_text: The text of the review to analyze
+        subject: The subject/title of the review
+        sender_name: Display name from the email From: header, if any
+
+    Returns:
+        AnalysisState ready to pass to the graph
+    """
+    return AnalysisState(
+        review_text=review_text,
+        subject=subject,
+        sender_name=sender_name,
+        cleaned_text="",
+        triaged=False,
+        sentiment=None,
+        problems=[],
+        suggestions=[],
+        customer_name=None,
+        summary="",
+        priority=None,
+        requires_response=False,
+        error=None,
+        analysis_failed=False,
+    )
+
+
+# Per-step LLM outputs for the multi-node workflow. Parsing the raw
+# response straight into these models validates the JSON in one pass.
+
+
+class SentimentResult(BaseModel):
+    """LLM output of the sentiment step."""
+
+    sentiment: Literal["positive", "negative", "neutral"] = "neutral"
+
+
+class ProblemsResult(BaseModel):
+    """LLM output of the problems step."""
+
+    problems: List[str] = Field(default_factory=list)
+
+
+class SuggestionsResult(BaseModel):
+    """LLM output of the suggestions step."""
+
+    suggestions: List[str] = Field(default_factory=list)
+
+
+class SummaryResult(BaseModel):
+    """LLM output of the summary step."""
+
+    summary: str = ""
+
+
+class PriorityResult(BaseModel):
+    """LLM output of the priority step."""
+
+    priority: Literal["critical", "important", "normal"] = "normal"
+
+
+class CustomerNameResult(BaseModel):
+    """LLM output of the name extraction step."""
+
+    customer_name: Optional[str] = None
+
+
+class RequiresResponseResult(BaseModel):
+    """LLM output of the response decision step."""
+
+    requires_response: bool = True
+
+
+class UnifiedAnalysisResult(BaseModel):
+    """LLM output of the single-prompt workflow."""
+
+    sentiment: str = "neutral"
+    problems: List[str] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list)
+    summary: str = ""
+    priority: Optional[str] = None
+    customer_name: Optional[str] = None
+    requires_response: bool = True
+
+    @field_validator("sentiment", mode="before")
+    @classmethod
+    def _normalize_sentiment(cls, v):
+        """Accept any casing; an unknown label resets only this field."""
+        v = str(v).strip().lower() if v is not None else ""
+        return v if v in ("positive", "negative", "neutral") else "neutral"
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, v):
+        """Accept any casing; _postprocess picks a default for None."""
+        v = str(v).strip().lower() if v is not None else ""
+        return v if v in ("critical", "important", "normal") else None
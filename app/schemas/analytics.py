@@ -1,9 +1,9 @@
 """
 Pydantic schemas for analytics API.
 """
-from typing import Dict, List, Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class AnalyticsSummary(BaseModel):
@@ -51,3 +51,19 @@ class ResponseTimeStats(BaseModel):
     max_hours: Optional[float] = Field(None, description="Maximum response time in hours")
     processed_count: int = Field(0, description="Number of processed reviews")
     total_count: int = Field(0, description="Total number of reviews")
+
+
+class AnalyticsDashboard(BaseModel):
+    """Schema for all dashboard analytics in one response."""
+
+    summary: AnalyticsSummary
+    trends: List[TrendPoint] = Field(default_factory=list)
+    problems: List[ProblemStat] = Field(default_factory=list)
+    response_time: ResponseTimeStats
+
+
+# Cached JSON is validated straight from bytes with these
+ANALYTICS_SUMMARY_ADAPTER = TypeAdapter(AnalyticsSummary)
+TREND_POINT_LIST_ADAPTER = TypeAdapter(List[TrendPoint])
+PROBLEM_STAT_LIST_ADAPTER = TypeAdapter(List[ProblemStat])
+RESPONSE_TIME_STATS_ADAPTER = TypeAdapter(ResponseTimeStats)
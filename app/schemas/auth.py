@@ -2,7 +2,6 @@
 Authentication schemas for user registration, login, and token management.
 """
 from datetime import datetime
-from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
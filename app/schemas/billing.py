@@ -52,8 +52,14 @@ class InvoiceResponse(BaseModel):
 
 
 class InvoiceListResponse(BaseModel):
-    """List of invoices."""
+    """Page of invoices, newest first."""
     items: List[InvoiceResponse]
+    next_before: Optional[datetime] = Field(
+        None, description="Pass as `before` to fetch the next page"
+    )
+    next_before_id: Optional[UUID] = Field(
+        None, description="Pass as `before_id` to fetch the next page"
+    )
 
 
 class UsageResponse(BaseModel):
@@ -14,8 +14,9 @@ class GmailMessage(BaseModel):
     thread_id: str = Field(..., description="Gmail thread ID")
     sender_email: str = Field(..., description="Sender's email address")
     sender_name: Optional[str] = Field(None, description="Sender's display name")
-    subject: str = Field(..., description="Email subject")
+    subject: str = Field(..., max_length=255, description="Email subject")
     body_text: str = Field("", description="Plain text email body")
+    snippet: Optional[str] = Field(None, description="Gmail's short preview of the body")
     received_at: datetime = Field(..., description="When the email was received")
     labels: List[str] = Field(default_factory=list, description="Gmail labels")
 
@@ -29,7 +30,7 @@ class MessageDetails(BaseModel):
     thread_id: str
     sender_email: str
     sender_name: Optional[str] = None
-    subject: str
+    subject: str = Field(..., max_length=255)
     body_text: str = ""
     body_html: Optional[str] = None
     received_at: datetime
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class EmailAccountResponse(BaseModel):
@@ -54,3 +54,6 @@ class EmailAccountListResponse(BaseModel):
 
     accounts: list[EmailAccountResponse]
     total: int
+
+
+EMAIL_ACCOUNT_LIST_ADAPTER = TypeAdapter(list[EmailAccountResponse])
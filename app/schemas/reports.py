@@ -5,7 +5,7 @@ from datetime import date, datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class WeeklyReportSummary(BaseModel):
@@ -15,6 +15,9 @@ class WeeklyReportSummary(BaseModel):
     week_start: date = Field(..., description="Week start date (Monday)")
     week_end: date = Field(..., description="Week end date (Sunday)")
     total_reviews: int = Field(..., description="Total reviews in the week")
+    positive_count: int = Field(0, description="Positive reviews in the week")
+    negative_count: int = Field(0, description="Negative reviews in the week")
+    neutral_count: int = Field(0, description="Neutral reviews in the week")
     sentiment_breakdown: Optional[Dict[str, int]] = Field(
         None, description="Sentiment counts"
     )
@@ -24,6 +27,8 @@ class WeeklyReportSummary(BaseModel):
     sent_at: Optional[datetime] = Field(None, description="When the report was sent")
     created_at: datetime = Field(..., description="When the report was created")
 
+    model_config = {"from_attributes": True}
+
 
 class WeeklyReportDetail(BaseModel):
     """Schema for weekly report detail."""
@@ -33,6 +38,9 @@ class WeeklyReportDetail(BaseModel):
     week_start: date
     week_end: date
     total_reviews: int
+    positive_count: int = 0
+    negative_count: int = 0
+    neutral_count: int = 0
     sentiment_breakdown: Optional[Dict[str, int]] = None
     top_problems: Optional[List[Dict]] = None
     critical_reviews: Optional[List[str]] = None
@@ -40,7 +48,7 @@ class WeeklyReportDetail(BaseModel):
     sentiment_change: Optional[Dict[str, float]] = None
     recommendations: Optional[List[str]] = None
     sent_at: Optional[datetime] = None
-    pdf_url: Optional[str] = None
+    pdf_url: Optional[str] = Field(None, max_length=512)
     created_at: datetime
 
 
@@ -51,6 +59,9 @@ class WeeklyReportListResponse(BaseModel):
     total: int = Field(..., description="Total number of reports")
 
 
+WEEKLY_REPORT_LIST_ADAPTER = TypeAdapter(List[WeeklyReportSummary])
+
+
 class GenerateReportResponse(BaseModel):
     """Schema for report generation result."""
 
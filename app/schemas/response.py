@@ -2,10 +2,22 @@
 Pydantic schemas for draft response operations.
 """
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.enums import ResponseTone
+
+# Checked by a plain set lookup instead of a Literal validator per field
+RESPONSE_TONES = frozenset(tone.value for tone in ResponseTone)
+
+
+def validate_tone(value: Optional[str]) -> Optional[str]:
+    """Check that a tone is one of RESPONSE_TONES (None passes through)."""
+    if value is not None and value not in RESPONSE_TONES:
+        raise ValueError(f"Tone must be one of: {', '.join(sorted(RESPONSE_TONES))}")
+    return value
 
 
 class DraftResponseCreate(BaseModel):
@@ -17,9 +29,9 @@ class DraftResponseCreate(BaseModel):
         min_length=1,
         max_length=5000,
     )
-    tone: Literal["formal", "friendly", "professional"] = Field(
+    tone: str = Field(
         ...,
-        description="Tone of the response",
+        description="Tone of the response (formal/friendly/professional)",
     )
     variant_number: int = Field(
         ...,
@@ -28,6 +40,10 @@ class DraftResponseCreate(BaseModel):
         le=3,
     )
 
+    _validate_tone = field_validator("tone")(validate_tone)
+
+    model_config = {"defer_build": True}
+
 
 class DraftResponseResponse(BaseModel):
     """Schema for draft response in API responses."""
@@ -39,7 +55,7 @@ class DraftResponseResponse(BaseModel):
     variant_number: int = Field(..., description="Variant number")
     created_at: datetime = Field(..., description="Creation timestamp")
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class DraftResponseListResponse(BaseModel):
@@ -51,11 +67,15 @@ class DraftResponseListResponse(BaseModel):
     )
     total: int = Field(..., description="Total number of drafts")
 
+    model_config = {"defer_build": True}
+
 
 class RegenerateRequest(BaseModel):
     """Schema for regeneration request."""
 
-    tone: Optional[Literal["formal", "friendly", "professional"]] = Field(
+    tone: Optional[str] = Field(
         None,
-        description="Override tone for regeneration (optional)",
+        description="Override tone for regeneration (formal/friendly/professional)",
     )
+
+    _validate_tone = field_validator("tone")(validate_tone)
@@ -2,24 +2,21 @@
 Pydantic schemas for reviews API.
 """
 from datetime import datetime
-from typing import Generic, List, Optional, TypeVar
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.schemas.response import DraftResponseResponse
 
 
-T = TypeVar("T")
-
-
 class ReviewListItem(BaseModel):
     """Schema for review in list responses."""
 
     id: UUID = Field(..., description="Review unique identifier")
     sender_email: str = Field(..., description="Sender email address")
     sender_name: Optional[str] = Field(None, description="Sender name if available")
-    subject: str = Field(..., description="Email subject")
+    subject: str = Field(..., max_length=255, description="Email subject")
     sentiment: Optional[str] = Field(None, description="Detected sentiment (positive/negative/neutral)")
     priority: Optional[str] = Field(None, description="Priority level (critical/important/normal)")
     summary: Optional[str] = Field(None, description="AI-generated summary")
@@ -28,7 +25,13 @@ class ReviewListItem(BaseModel):
     received_at: datetime = Field(..., description="When the email was received")
     notes: Optional[str] = Field(None, description="User notes")
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
+
+    @field_validator("problems", mode="before")
+    @classmethod
+    def _none_to_empty(cls, v):
+        """ORM rows store missing problems as NULL."""
+        return v or []
 
 
 class ReviewDetail(ReviewListItem):
@@ -50,17 +53,13 @@ class ReviewUpdate(BaseModel):
     notes: Optional[str] = Field(None, description="User notes for the review", max_length=5000)
 
 
-class PaginatedResponse(BaseModel, Generic[T]):
-    """Generic paginated response schema."""
+class ReviewListResponse(BaseModel):
+    """Paginated response for reviews list."""
 
-    items: List[T] = Field(..., description="List of items")
+    items: List[ReviewListItem] = Field(..., description="List of items")
     total: int = Field(..., description="Total number of items", ge=0)
     page: int = Field(..., description="Current page number", ge=1)
     per_page: int = Field(..., description="Items per page", ge=1, le=100)
     pages: int = Field(..., description="Total number of pages", ge=0)
 
-
-class ReviewListResponse(PaginatedResponse[ReviewListItem]):
-    """Paginated response for reviews list."""
-
-    pass
+    model_config = {"defer_build": True}
@@ -1,9 +1,11 @@
 """
 Pydantic schemas for settings API.
 """
-from typing import Literal, Optional
+from typing import Optional
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, field_validator
+
+from app.schemas.response import validate_tone
 
 
 # Notification Settings Schemas
@@ -21,7 +23,7 @@ class NotificationSettingsResponse(BaseModel):
     notify_on_important: bool = Field(..., description="Notify on important reviews")
     notify_on_normal: bool = Field(..., description="Notify on normal reviews")
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class NotificationSettingsUpdate(BaseModel):
@@ -50,7 +52,7 @@ class CompanySettingsResponse(BaseModel):
         None, description="Custom AI instructions"
     )
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class CompanySettingsUpdate(BaseModel):
@@ -62,13 +64,15 @@ class CompanySettingsUpdate(BaseModel):
     industry: Optional[str] = Field(
         None, description="Company industry", max_length=255
     )
-    response_tone: Optional[Literal["formal", "friendly", "professional"]] = Field(
-        None, description="Default response tone"
+    response_tone: Optional[str] = Field(
+        None, description="Default response tone (formal/friendly/professional)"
     )
     custom_instructions: Optional[str] = Field(
         None, description="Custom AI instructions"
     )
 
+    _validate_tone = field_validator("response_tone")(validate_tone)
+
 
 # Profile Schemas
 
@@ -80,7 +84,7 @@ class ProfileResponse(BaseModel):
     plan: str = Field(..., description="Current subscription plan")
     is_verified: bool = Field(..., description="Email verification status")
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class ProfileUpdate(BaseModel):
@@ -1,11 +1,15 @@
 # Business logic services
 from app.services.auth import (
     AuthService,
+    clear_token_cache,
     create_access_token,
     create_refresh_token,
+    create_token_pair,
     decode_token,
     hash_password,
+    hash_password_async,
     verify_password,
+    verify_password_async,
 )
 from app.services.encryption import (
     TokenEncryption,
@@ -34,10 +38,14 @@ from app.services.notification_service import (
 __all__ = [
     "AuthService",
     "hash_password",
+    "hash_password_async",
     "verify_password",
+    "verify_password_async",
     "create_access_token",
     "create_refresh_token",
+    "create_token_pair",
     "decode_token",
+    "clear_token_cache",
     "TokenEncryption",
     "get_token_encryption",
     "generate_encryption_key",
@@ -8,24 +8,181 @@ Provides intelligent analysis of customer reviews with:
 - Priority determination
 - Summary generation
 """
-import json
+import asyncio
+import hashlib
+import importlib.util
 import logging
 import re
-from typing import Any, Dict, List, Literal, Optional
-
+import time
+from functools import cached_property, wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+import httpx
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_mistralai import ChatMistralAI
 from langgraph.graph import END, StateGraph
+from pydantic import BaseModel
+
+try:
+    from blake3 import blake3 as _hash
+except ImportError:  # pragma: no cover - optional speedup
+    _hash = hashlib.sha256
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional speedup
+    LexborHTMLParser = None
 
 from app.config import get_settings
-from app.schemas.analysis import AnalysisState, ReviewAnalysis
+from app.services.redis_client import get_redis_binary_client, get_redis_client
+from app.schemas.analysis import (
+    AnalysisState,
+    CustomerNameResult,
+    PriorityResult,
+    ProblemsResult,
+    RequiresResponseResult,
+    ReviewAnalysis,
+    SentimentResult,
+    SuggestionsResult,
+    SummaryResult,
+    UnifiedAnalysisResult,
+    decode_analysis,
+    encode_analysis,
+    initial_analysis_state,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+ResultT = TypeVar("ResultT", bound=BaseModel)
+
+# Outermost JSON object in an LLM reply (tolerates code fences and nesting)
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+_WS_RE = re.compile(r"\s+")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+MISTRAL_API_BASE_URL = "https://api.mistral.ai/v1"
+# Connection pool of the shared Mistral HTTP client
+MISTRAL_MAX_CONNECTIONS = 16
+MISTRAL_MAX_KEEPALIVE_CONNECTIONS = 8
+
+# Limit text length to prevent token overflow
+MAX_REVIEW_CHARS = 4000
+
+# Consecutive Redis errors after which the rpm budget fails closed
+RPM_BUDGET_MAX_REDIS_ERRORS = 3
+
+
+def _clean_text(text: str) -> str:
+    """
+    Truncate, strip HTML and collapse whitespace in review text.
+
+    Truncating first keeps the cleanup bounded to MAX_REVIEW_CHARS.
+    HTML goes through selectolax's C parser when it is installed.
+    """
+    truncated = len(text) > MAX_REVIEW_CHARS
+    text = text[:MAX_REVIEW_CHARS]
+
+    if "<" in text:
+        if LexborHTMLParser is not None:
+            text = LexborHTMLParser(text).text(separator=" ")
+        else:
+            text = _HTML_TAG_RE.sub("", text)
+
+    text = _WS_RE.sub(" ", text).strip()
+    return text + "..." if truncated else text
+
+
+# Short messages shorter than this are classified by keyword, without the LLM
+TRIAGE_MAX_CHARS = 20
+POSITIVE_KEYWORDS = ("спасиб", "благодар", "отлично")
+NEGATIVE_KEYWORDS = ("жалоб", "ужасно", "верните")
+
+
+def _fallback_summary(text: str) -> str:
+    """Summary used when the LLM gives none: the first 200 characters."""
+    return text[:200] + "..." if len(text) > 200 else text
+
+
+def _clean_name(name: Optional[str]) -> Optional[str]:
+    """Strip a customer name, dropping values too short or long to be real."""
+    if not name:
+        return None
+    name = name.strip()
+    if len(name) < 2 or len(name) > 100:
+        return None
+    return name
+
+
+class LLMUnavailableError(Exception):
+    """Raised instead of calling the LLM while it is failing or over budget."""
+    pass
 
-# Prompts in Russian
+
+class CircuitBreaker:
+    """
+    Minimal consecutive-failure circuit breaker.
+
+    After fail_max failures in a row the breaker opens and allow() returns
+    False for reset_seconds; then one trial call is let through and its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, fail_max: int, reset_seconds: float):
+        self.fail_max = fail_max
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being skipped."""
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self.reset_seconds
+        )
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        # Half-open: let this call through, re-open at once if it fails
+        self._opened_at = None
+        self._failures = self.fail_max - 1
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at fail_max."""
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            if self._opened_at is None:
+                logger.warning(
+                    f"LLM circuit breaker opened for {self.reset_seconds}s "
+                    f"after {self._failures} failures"
+                )
+            self._opened_at = time.monotonic()
+
+
+# Prompts in Russian. Every request is SYSTEM_PROMPT + the review prefix from
+# _review_prompt + a short task prompt, so all calls for one review share an
+# identical prefix that the provider can reuse; only the task tail differs.
+# Prompts with values are f-string builders; the rest are plain strings.
 SYSTEM_PROMPT = """Ты - AI-ассистент для анализа отзывов клиентов.
 Анализируй отзывы на русском языке, выделяя ключевую информацию.
 Всегда отвечай в запрошенном формате JSON."""
@@ -35,52 +192,35 @@ SENTIMENT_PROMPT = """Определи тональность отзыва кл
 - negative: жалоба, недовольство, претензия
 - neutral: информационный запрос, нейтральное сообщение
 
-Тема письма: {subject}
-
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
-{{"sentiment": "positive" | "negative" | "neutral"}}"""
+{"sentiment": "positive" | "negative" | "neutral"}"""
 
 PROBLEMS_PROMPT = """Выдели конкретные проблемы, о которых упоминает клиент.
 Категории: доставка, качество товара, обслуживание, цена, упаковка, возврат, коммуникация, другое.
 
-Тема письма: {subject}
-
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
-{{"problems": ["проблема 1", "проблема 2", ...]}}
+{"problems": ["проблема 1", "проблема 2", ...]}
 
 Если проблем нет, верни пустой список."""
 
 SUGGESTIONS_PROMPT = """Выдели предложения и пожелания клиента из отзыва.
 Это могут быть: улучшения, новые функции, изменения в сервисе.
 
-Тема письма: {subject}
-
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
-{{"suggestions": ["предложение 1", "предложение 2", ...]}}
+{"suggestions": ["предложение 1", "предложение 2", ...]}
 
 Если предложений нет, верни пустой список."""
 
 SUMMARY_PROMPT = """Создай краткое содержание отзыва (2-3 предложения).
 Укажи основную суть обращения клиента.
 
-Тема письма: {subject}
-
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
-{{"summary": "краткое содержание"}}"""
+{"summary": "краткое содержание"}"""
+
 
-PRIORITY_PROMPT = """Определи приоритет обработки отзыва:
+def _priority_prompt(sentiment: Optional[str], problems: str) -> str:
+    """Task prompt for the priority step."""
+    return f"""Определи приоритет обработки отзыва:
 - critical: срочные проблемы, угроза потери клиента, юридические вопросы, массовая проблема
 - important: значительные жалобы, требующие внимания, негативные отзывы
 - normal: обычные запросы, положительные отзывы, информационные сообщения
@@ -88,51 +228,182 @@ PRIORITY_PROMPT = """Определи приоритет обработки от
 Тональность: {sentiment}
 Проблемы: {problems}
 
-Тема письма: {subject}
-
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
 {{"priority": "critical" | "important" | "normal"}}"""
 
+
 EXTRACT_NAME_PROMPT = """Извлеки имя клиента из текста отзыва, если оно указано.
 Ищи подписи, приветствия, упоминания имени.
 
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
-{{"customer_name": "имя" или null}}"""
+{"customer_name": "имя" или null}"""
 
-REQUIRES_RESPONSE_PROMPT = """Определи, требует ли отзыв ответа от компании:
+
+def _requires_response_prompt(sentiment: Optional[str], priority: Optional[str]) -> str:
+    """Task prompt for the response decision step."""
+    return f"""Определи, требует ли отзыв ответа от компании:
 - true: вопрос, жалоба, просьба, негативный отзыв, запрос информации
 - false: благодарность без вопросов, информационное сообщение без запроса
 
 Тональность: {sentiment}
 Приоритет: {priority}
 
-Текст отзыва:
-{text}
-
 Ответь в формате JSON:
 {{"requires_response": true | false}}"""
 
 
+UNIFIED_PROMPT = """Проанализируй отзыв клиента и заполни все поля:
+- sentiment: тональность отзыва
+  - positive: клиент доволен, благодарит, хвалит
+  - negative: жалоба, недовольство, претензия
+  - neutral: информационный запрос, нейтральное сообщение
+- problems: конкретные проблемы, о которых упоминает клиент
+  (доставка, качество товара, обслуживание, цена, упаковка, возврат, коммуникация, другое);
+  пустой список, если проблем нет
+- suggestions: предложения и пожелания клиента (улучшения, новые функции,
+  изменения в сервисе); пустой список, если предложений нет
+- summary: краткое содержание отзыва (2-3 предложения), основная суть обращения
+- priority: приоритет обработки
+  - critical: срочные проблемы, угроза потери клиента, юридические вопросы, массовая проблема
+  - important: значительные жалобы, требующие внимания, негативные отзывы
+  - normal: обычные запросы, положительные отзывы, информационные сообщения
+- customer_name: имя клиента из подписи, приветствия или упоминания, иначе null
+- requires_response: требует ли отзыв ответа от компании
+  - true: вопрос, жалоба, просьба, негативный отзыв, запрос информации
+  - false: благодарность без вопросов, информационное сообщение без запроса
+
+Ответь одним объектом в формате JSON:
+{"sentiment": "positive" | "negative" | "neutral", "problems": ["..."], "suggestions": ["..."], "summary": "...", "priority": "critical" | "important" | "normal", "customer_name": "имя" или null, "requires_response": true | false}"""
+
+
+def _review_prompt(subject: str, text: str, task: str) -> str:
+    """
+    Build a prompt from the shared review prefix and a task prompt.
+
+    Args:
+        subject: Email subject
+        text: Cleaned review text
+        task: Task prompt
+
+    Returns:
+        Full prompt text
+    """
+    return f"Тема письма: {subject}\n\nТекст отзыва:\n{text}\n\nЗадание:\n{task}"
+
+
+# Fingerprint of every prompt an analysis can use, so cached analyses are
+# not served after a prompt changes
+_PROMPTS_DIGEST = _hash(
+    "\x00".join(
+        (
+            _review_prompt("", "", ""),
+            SYSTEM_PROMPT,
+            SENTIMENT_PROMPT,
+            PROBLEMS_PROMPT,
+            SUGGESTIONS_PROMPT,
+            SUMMARY_PROMPT,
+            _priority_prompt("", ""),
+            EXTRACT_NAME_PROMPT,
+            _requires_response_prompt("", ""),
+            UNIFIED_PROMPT,
+        )
+    ).encode()
+).hexdigest()
+
+
+def _node(
+    model: Type[BaseModel],
+    default: Any,
+    postprocess: Optional[Callable[["AnalysisState", Any], Any]] = None,
+    record_error: bool = False,
+) -> Callable[
+    [Callable[[Any, "AnalysisState"], str]],
+    Callable[[Any, "AnalysisState"], Awaitable[Dict[str, Any]]],
+]:
+    """
+    Turn a prompt builder into a single-field LLM graph node.
+
+    The node sends the built prompt, parses the reply into model and returns
+    its only field. Any error is logged and the default is returned instead.
+
+    Args:
+        model: Result model with exactly one field
+        default: Fallback value, or a callable taking the state
+        postprocess: Optional (state, value) -> value applied to the reply
+        record_error: Also store the error message in the state; only one
+            node per parallel step may set this
+
+    Returns:
+        Decorator producing the async node method
+    """
+    field = next(iter(model.model_fields))
+
+    def decorator(build_prompt):
+        @wraps(build_prompt)
+        async def node(self, state: "AnalysisState") -> Dict[str, Any]:
+            try:
+                response = await self._acall_llm(build_prompt(self, state))
+                value = getattr(self._parse_json_response(response, model), field)
+                if postprocess is not None:
+                    value = postprocess(state, value)
+                return {field: value}
+            except Exception as e:
+                logger.error(f"Error in {build_prompt.__name__}: {e}")
+                update = {field: default(state) if callable(default) else default}
+                if record_error:
+                    update["error"] = str(e)
+                return update
+
+        return node
+
+    return decorator
+
+
+def _escalate_priority(state: "AnalysisState", priority: str) -> str:
+    """Auto-escalate negative reviews to at least important."""
+    if state["sentiment"] == "negative" and priority == "normal":
+        return "important"
+    return priority
+
+
+def _force_response(state: "AnalysisState", requires_response: bool) -> bool:
+    """Always respond to negative/critical reviews."""
+    return (
+        requires_response
+        or state["sentiment"] == "negative"
+        or state["priority"] == "critical"
+    )
+
+
+# Nodes that only depend on the preprocessed text and can run concurrently
+PARALLEL_NODES = (
+    "classify_sentiment",
+    "extract_problems",
+    "extract_suggestions",
+    "summarize",
+    "extract_name",
+)
+
+
 class ReviewAnalyzer:
     """
     AI-powered review analyzer using LangGraph workflow.
 
-    Workflow:
+    Both workflows start with:
     1. preprocess -> Clean and normalize text
-    2. classify_sentiment -> Determine sentiment
-    3. extract_problems -> Extract problems
-    4. extract_suggestions -> Extract suggestions
-    5. summarize -> Create summary
-    6. prioritize -> Determine priority
-    7. extract_name -> Extract customer name
-    8. decide_response -> Decide if response needed
-    9. aggregate -> Compile final result
+    2. triage -> Answer empty or short keyword-only messages without the LLM
+       and finish; everything else continues below
+
+    Unified workflow (default, settings.ai_unified_analysis):
+    3. unified_analyze -> One LLM call returning every field as JSON
+    4. postprocess -> Apply deterministic priority/response rules
+
+    Multi-node workflow:
+    3. In parallel (no data dependencies between them):
+       classify_sentiment, extract_problems, extract_suggestions,
+       summarize, extract_name (skipped when the From: header has a name)
+    4. prioritize -> Determine priority (needs sentiment + problems)
+    5. decide_response -> Decide if response needed (needs sentiment + priority)
     """
 
     def __init__(self):
@@ -140,20 +411,43 @@ class ReviewAnalyzer:
         if not settings.mistral_api_key:
             raise ValueError("MISTRAL_API_KEY is not configured")
 
-        self.llm = ChatMistralAI(
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._breaker = CircuitBreaker(
+            settings.llm_breaker_fail_max, settings.llm_breaker_reset_seconds
+        )
+        self._rpm_redis_errors = 0
+
+        # Triage hit-rate counters
+        self.analyzed_count = 0
+        self.triaged_count = 0
+
+    @cached_property
+    def llm(self) -> ChatMistralAI:
+        """Mistral chat model, created on first use."""
+        return ChatMistralAI(
             api_key=settings.mistral_api_key,
             model=settings.ai_model,
             max_tokens=settings.ai_max_tokens,
             temperature=settings.ai_temperature,
+            async_client=get_mistral_http_client(),
         )
-        self.graph = self._build_graph()
+
+    @cached_property
+    def graph(self):
+        """Compiled LangGraph workflow, built on first use."""
+        return self._build_graph()
 
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph workflow."""
+        if settings.ai_unified_analysis:
+            return self._build_unified_graph()
+
         workflow = StateGraph(AnalysisState)
 
         # Add nodes
         workflow.add_node("preprocess", self._preprocess)
+        workflow.add_node("triage", self._triage)
         workflow.add_node("classify_sentiment", self._classify_sentiment)
         workflow.add_node("extract_problems", self._extract_problems)
         workflow.add_node("extract_suggestions", self._extract_suggestions)
@@ -162,19 +456,42 @@ class ReviewAnalyzer:
         workflow.add_node("extract_name", self._extract_name)
         workflow.add_node("decide_response", self._decide_response)
 
-        # Define edges
+        # Define edges: fan out the independent LLM calls after preprocessing,
+        # then join before the steps that depend on their results. The
+        # parallel nodes share one superstep, so prioritize runs once.
         workflow.set_entry_point("preprocess")
-        workflow.add_edge("preprocess", "classify_sentiment")
-        workflow.add_edge("classify_sentiment", "extract_problems")
-        workflow.add_edge("extract_problems", "extract_suggestions")
-        workflow.add_edge("extract_suggestions", "summarize")
-        workflow.add_edge("summarize", "prioritize")
-        workflow.add_edge("prioritize", "extract_name")
-        workflow.add_edge("extract_name", "decide_response")
+        workflow.add_edge("preprocess", "triage")
+        workflow.add_conditional_edges(
+            "triage", self._route_parallel, [*PARALLEL_NODES, END]
+        )
+        for node in PARALLEL_NODES:
+            workflow.add_edge(node, "prioritize")
+        workflow.add_edge("prioritize", "decide_response")
         workflow.add_edge("decide_response", END)
 
         return workflow.compile()
 
+    def _build_unified_graph(self) -> StateGraph:
+        """Build the single-LLM-call workflow."""
+        workflow = StateGraph(AnalysisState)
+
+        workflow.add_node("preprocess", self._preprocess)
+        workflow.add_node("triage", self._triage)
+        workflow.add_node("unified_analyze", self._unified_analyze)
+        workflow.add_node("postprocess", self._postprocess)
+
+        workflow.set_entry_point("preprocess")
+        workflow.add_edge("preprocess", "triage")
+        workflow.add_conditional_edges(
+            "triage",
+            lambda state: END if state["triaged"] else "unified_analyze",
+            ["unified_analyze", END],
+        )
+        workflow.add_edge("unified_analyze", "postprocess")
+        workflow.add_edge("postprocess", END)
+
+        return workflow.compile()
+
     def _call_llm(self, prompt: str) -> str:
         """
         Call the LLM with a prompt.
@@ -184,234 +501,389 @@ class ReviewAnalyzer:
 
         Returns:
             LLM response text
+
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
         """
+        if not self._breaker.allow():
+            raise LLMUnavailableError("LLM circuit breaker is open")
+
         messages = [
             SystemMessage(content=SYSTEM_PROMPT),
             HumanMessage(content=prompt),
         ]
-        response = self.llm.invoke(messages)
+        try:
+            response = self.llm.invoke(messages)
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
         return response.content
 
-    def _parse_json_response(self, response: str, default: Any = None) -> Any:
+    def _llm_cache_key(self, prompt: str) -> str:
+        """Build the Redis key for a prompt under the current model settings."""
+        digest = _hash(
+            "|".join(
+                (
+                    settings.ai_model,
+                    str(settings.ai_temperature),
+                    str(settings.ai_max_tokens),
+                    SYSTEM_PROMPT,
+                    prompt,
+                )
+            ).encode()
+        ).hexdigest()
+        return f"llm:{digest}"
+
+    def _analysis_cache_key(
+        self, review_text: str, subject: str, sender_name: Optional[str]
+    ) -> str:
+        """Redis key for a full analysis result under the current prompts and settings."""
+        digest = _hash(
+            "\x00".join(
+                (
+                    settings.ai_model,
+                    str(settings.ai_temperature),
+                    str(settings.ai_max_tokens),
+                    str(settings.ai_unified_analysis),
+                    _PROMPTS_DIGEST,
+                    review_text,
+                    subject,
+                    sender_name or "",
+                )
+            ).encode()
+        ).hexdigest()
+        return f"analysis:{digest}"
+
+    async def _take_rate_token(self) -> None:
         """
-        Parse JSON from LLM response.
+        Count one LLM request against settings.mistral_rpm_budget.
 
-        Args:
-            response: LLM response text
-            default: Default value if parsing fails
+        Uses a Redis counter per wall-clock minute shared by all workers.
+        A Redis error lets the request through, unless it is the
+        RPM_BUDGET_MAX_REDIS_ERRORS-th in a row.
 
-        Returns:
-            Parsed JSON or default
+        Raises:
+            LLMUnavailableError: If this minute's budget is used up, or the
+                budget can't be checked
         """
+        budget = settings.mistral_rpm_budget
+        if budget <= 0:
+            return
+
+        key = f"llm:rpm:{int(time.time() // 60)}"
         try:
-            # Try to extract JSON from response
-            # Handle cases where LLM wraps JSON in markdown code blocks
-            json_match = re.search(r"\{[^{}]*\}", response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON response: {e}")
-            return default
+            redis = await get_redis_client()
+            pipe = redis.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, 60)
+            count, _ = await pipe.execute()
+        except Exception as e:
+            self._rpm_redis_errors += 1
+            logger.error(
+                f"Redis LLM rate limit error ({self._rpm_redis_errors} in a row): {e}"
+            )
+            if self._rpm_redis_errors >= RPM_BUDGET_MAX_REDIS_ERRORS:
+                raise LLMUnavailableError("Mistral budget can't be checked") from e
+            return
+        self._rpm_redis_errors = 0
 
-    def _preprocess(self, state: AnalysisState) -> Dict[str, Any]:
-        """
-        Preprocess and clean the review text.
+        if count > budget:
+            raise LLMUnavailableError(f"Mistral budget of {budget} requests/min used up")
 
-        Removes excessive whitespace, normalizes encoding.
+    async def _acall_llm(self, prompt: str) -> str:
         """
-        text = state.review_text
+        Call the LLM asynchronously with a prompt.
 
-        # Clean whitespace
-        text = re.sub(r"\s+", " ", text).strip()
+        Identical prompts are served from Redis when settings.llm_cache_enabled
+        is set; cache errors fall through to the LLM. Calls are skipped while
+        the circuit breaker is open or the per-minute budget is used up.
 
-        # Remove HTML tags if any
-        text = re.sub(r"<[^>]+>", "", text)
+        Args:
+            prompt: The prompt to send
 
-        # Limit text length to prevent token overflow
-        max_chars = 4000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "..."
+        Returns:
+            LLM response text
 
-        return {"cleaned_text": text}
+        Raises:
+            LLMUnavailableError: If the breaker is open or over budget
+        """
+        cache_key = None
+        if settings.llm_cache_enabled:
+            cache_key = self._llm_cache_key(prompt)
+            try:
+                redis = await get_redis_client()
+                cached = await redis.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"LLM cache hit for {cache_key}")
+                    return cached
+            except Exception as e:
+                logger.warning(f"Redis LLM cache read error: {e}")
+
+        if not self._breaker.allow():
+            raise LLMUnavailableError("LLM circuit breaker is open")
+        await self._take_rate_token()
 
-    def _classify_sentiment(self, state: AnalysisState) -> Dict[str, Any]:
-        """Classify the sentiment of the review."""
+        messages = [
+            SystemMessage(content=SYSTEM_PROMPT),
+            HumanMessage(content=prompt),
+        ]
         try:
-            prompt = SENTIMENT_PROMPT.format(
-                subject=state.subject,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"sentiment": "neutral"})
-            sentiment = result.get("sentiment", "neutral")
-
-            # Validate sentiment
-            if sentiment not in ["positive", "negative", "neutral"]:
-                sentiment = "neutral"
+            response = await self.llm.ainvoke(messages)
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        content = response.content
+
+        if cache_key is not None:
+            try:
+                redis = await get_redis_client()
+                await redis.setex(cache_key, settings.llm_cache_ttl_seconds, content)
+            except Exception as e:
+                logger.warning(f"Redis LLM cache write error: {e}")
+
+        return content
+
+    def _parse_json_response(self, response: str, model: Type[ResultT]) -> ResultT:
+        """
+        Parse and validate JSON from an LLM response.
 
-            return {"sentiment": sentiment}
-        except Exception as e:
-            logger.error(f"Error classifying sentiment: {e}")
-            return {"sentiment": "neutral", "error": str(e)}
+        Args:
+            response: LLM response text
+            model: Pydantic model describing the expected JSON object
 
-    def _extract_problems(self, state: AnalysisState) -> Dict[str, Any]:
-        """Extract problems mentioned in the review."""
-        try:
-            prompt = PROBLEMS_PROMPT.format(
-                subject=state.subject,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"problems": []})
-            problems = result.get("problems", [])
+        Returns:
+            Validated model instance
 
-            # Ensure it's a list
-            if not isinstance(problems, list):
-                problems = []
+        Raises:
+            pydantic.ValidationError: If the response is not valid for the model
+        """
+        # Handle cases where LLM wraps JSON in markdown code blocks or prose
+        json_match = _JSON_RE.search(response)
+        return model.model_validate_json(json_match.group() if json_match else response)
 
-            return {"problems": problems}
-        except Exception as e:
-            logger.error(f"Error extracting problems: {e}")
-            return {"problems": []}
+    def _preprocess(self, state: AnalysisState) -> Dict[str, Any]:
+        """
+        Preprocess and clean the review text.
 
-    def _extract_suggestions(self, state: AnalysisState) -> Dict[str, Any]:
-        """Extract suggestions from the review."""
-        try:
-            prompt = SUGGESTIONS_PROMPT.format(
-                subject=state.subject,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"suggestions": []})
-            suggestions = result.get("suggestions", [])
+        Removes HTML tags and excessive whitespace, limits length.
+        Takes the customer name from the sender's display name when usable.
+        """
+        return {
+            "cleaned_text": _clean_text(state["review_text"]),
+            "customer_name": _clean_name(state["sender_name"]),
+        }
 
-            # Ensure it's a list
-            if not isinstance(suggestions, list):
-                suggestions = []
+    def _triage(self, state: AnalysisState) -> Dict[str, Any]:
+        """
+        Classify empty and short keyword-only messages without the LLM.
 
-            return {"suggestions": suggestions}
-        except Exception as e:
-            logger.error(f"Error extracting suggestions: {e}")
-            return {"suggestions": []}
+        Messages shorter than TRIAGE_MAX_CHARS that hit only positive or only
+        negative keywords (or are empty) get a complete rule-based result.
+        Anything else is left for the LLM workflow.
+        """
+        text = state["cleaned_text"]
+        if len(text) >= TRIAGE_MAX_CHARS:
+            return {"triaged": False}
 
-    def _summarize(self, state: AnalysisState) -> Dict[str, Any]:
-        """Create a summary of the review."""
-        try:
-            prompt = SUMMARY_PROMPT.format(
-                subject=state.subject,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"summary": ""})
-            summary = result.get("summary", "")
+        lowered = text.lower()
+        positive = any(word in lowered for word in POSITIVE_KEYWORDS)
+        negative = any(word in lowered for word in NEGATIVE_KEYWORDS)
 
-            # Fallback summary if empty
-            if not summary:
-                summary = state.cleaned_text[:200] + "..." if len(state.cleaned_text) > 200 else state.cleaned_text
+        if not text:
+            sentiment = "neutral"
+        elif positive and not negative:
+            sentiment = "positive"
+        elif negative and not positive:
+            sentiment = "negative"
+        else:
+            return {"triaged": False}
+
+        return {
+            "triaged": True,
+            "sentiment": sentiment,
+            "priority": "important" if sentiment == "negative" else "normal",
+            "summary": text,
+            "problems": [],
+            "suggestions": [],
+            "requires_response": sentiment == "negative",
+        }
+
+    def _route_parallel(self, state: AnalysisState) -> List[str]:
+        """Pick the parallel nodes to run; name extraction needs no LLM if known."""
+        if state["triaged"]:
+            return [END]
+        if state["customer_name"]:
+            return [node for node in PARALLEL_NODES if node != "extract_name"]
+        return list(PARALLEL_NODES)
+
+    @_node(SentimentResult, default="neutral", record_error=True)
+    def _classify_sentiment(self, state: AnalysisState) -> str:
+        """Classify the sentiment of the review."""
+        return _review_prompt(state["subject"], state["cleaned_text"], SENTIMENT_PROMPT)
 
-            return {"summary": summary}
-        except Exception as e:
-            logger.error(f"Error creating summary: {e}")
-            return {"summary": state.cleaned_text[:200] + "..." if len(state.cleaned_text) > 200 else state.cleaned_text}
+    @_node(ProblemsResult, default=lambda state: [])
+    def _extract_problems(self, state: AnalysisState) -> str:
+        """Extract problems mentioned in the review."""
+        return _review_prompt(state["subject"], state["cleaned_text"], PROBLEMS_PROMPT)
 
-    def _prioritize(self, state: AnalysisState) -> Dict[str, Any]:
+    @_node(SuggestionsResult, default=lambda state: [])
+    def _extract_suggestions(self, state: AnalysisState) -> str:
+        """Extract suggestions from the review."""
+        return _review_prompt(state["subject"], state["cleaned_text"], SUGGESTIONS_PROMPT)
+
+    @_node(
+        SummaryResult,
+        default=lambda state: _fallback_summary(state["cleaned_text"]),
+        postprocess=lambda state, summary: summary or _fallback_summary(state["cleaned_text"]),
+    )
+    def _summarize(self, state: AnalysisState) -> str:
+        """Create a summary of the review."""
+        return _review_prompt(state["subject"], state["cleaned_text"], SUMMARY_PROMPT)
+
+    @_node(
+        PriorityResult,
+        default=lambda state: "important" if state["sentiment"] == "negative" else "normal",
+        postprocess=_escalate_priority,
+    )
+    def _prioritize(self, state: AnalysisState) -> str:
         """Determine the priority of the review."""
-        try:
-            prompt = PRIORITY_PROMPT.format(
-                sentiment=state.sentiment,
-                problems=", ".join(state.problems) if state.problems else "нет",
-                subject=state.subject,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"priority": "normal"})
-            priority = result.get("priority", "normal")
-
-            # Validate priority
-            if priority not in ["critical", "important", "normal"]:
-                priority = "normal"
-
-            # Auto-escalate negative reviews to at least important
-            if state.sentiment == "negative" and priority == "normal":
-                priority = "important"
-
-            return {"priority": priority}
-        except Exception as e:
-            logger.error(f"Error determining priority: {e}")
-            # Default: negative -> important, others -> normal
-            priority = "important" if state.sentiment == "negative" else "normal"
-            return {"priority": priority}
+        return _review_prompt(
+            state["subject"],
+            state["cleaned_text"],
+            _priority_prompt(
+                state["sentiment"],
+                ", ".join(state["problems"]) if state["problems"] else "нет",
+            ),
+        )
 
-    def _extract_name(self, state: AnalysisState) -> Dict[str, Any]:
+    @_node(
+        CustomerNameResult,
+        default=None,
+        postprocess=lambda state, name: _clean_name(name),
+    )
+    def _extract_name(self, state: AnalysisState) -> str:
         """Extract customer name from the review."""
-        try:
-            prompt = EXTRACT_NAME_PROMPT.format(text=state.cleaned_text)
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"customer_name": None})
-            name = result.get("customer_name")
-
-            # Clean up name
-            if name and isinstance(name, str):
-                name = name.strip()
-                if len(name) < 2 or len(name) > 100:
-                    name = None
-
-            return {"customer_name": name}
-        except Exception as e:
-            logger.error(f"Error extracting name: {e}")
-            return {"customer_name": None}
-
-    def _decide_response(self, state: AnalysisState) -> Dict[str, Any]:
+        return _review_prompt(state["subject"], state["cleaned_text"], EXTRACT_NAME_PROMPT)
+
+    @_node(
+        RequiresResponseResult,
+        default=lambda state: state["sentiment"] == "negative",
+        postprocess=_force_response,
+    )
+    def _decide_response(self, state: AnalysisState) -> str:
         """Decide if the review requires a response."""
-        try:
-            prompt = REQUIRES_RESPONSE_PROMPT.format(
-                sentiment=state.sentiment,
-                priority=state.priority,
-                text=state.cleaned_text,
-            )
-            response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"requires_response": True})
-            requires_response = result.get("requires_response", True)
-
-            # Ensure boolean
-            if not isinstance(requires_response, bool):
-                requires_response = True
+        return _review_prompt(
+            state["subject"],
+            state["cleaned_text"],
+            _requires_response_prompt(state["sentiment"], state["priority"]),
+        )
 
-            # Always respond to negative/critical
-            if state.sentiment == "negative" or state.priority == "critical":
-                requires_response = True
+    async def _unified_analyze(self, state: AnalysisState) -> Dict[str, Any]:
+        """Extract every analysis field with a single LLM call."""
+        try:
+            prompt = _review_prompt(state["subject"], state["cleaned_text"], UNIFIED_PROMPT)
+            response = await self._acall_llm(prompt)
+            result = self._parse_json_response(response, UnifiedAnalysisResult)
 
-            return {"requires_response": requires_response}
+            summary = result.summary
+            if not summary:
+                summary = _fallback_summary(state["cleaned_text"])
+
+            # A name from the From: header wins over the model's guess
+            name = state["customer_name"] or _clean_name(result.customer_name)
+
+            return {
+                "sentiment": result.sentiment,
+                "problems": result.problems,
+                "suggestions": result.suggestions,
+                "summary": summary,
+                "priority": result.priority,
+                "customer_name": name,
+                "requires_response": result.requires_response,
+            }
         except Exception as e:
-            logger.error(f"Error deciding response: {e}")
-            # Default: always respond to negative
-            return {"requires_response": state.sentiment == "negative"}
-
-    def analyze(self, review_text: str, subject: str = "") -> ReviewAnalysis:
+            logger.error(f"Error in unified analysis: {e}")
+            return {
+                "sentiment": "neutral",
+                "summary": _fallback_summary(state["cleaned_text"]),
+                "error": str(e),
+            }
+
+    def _postprocess(self, state: AnalysisState) -> Dict[str, Any]:
+        """Apply the deterministic priority and response rules."""
+        priority = state["priority"]
+        if priority not in ["critical", "important", "normal"]:
+            priority = "normal"
+
+        # Auto-escalate negative reviews to at least important
+        if state["sentiment"] == "negative" and priority == "normal":
+            priority = "important"
+
+        # Always respond to negative/critical
+        requires_response = state["requires_response"]
+        if state["sentiment"] == "negative" or priority == "critical":
+            requires_response = True
+
+        return {"priority": priority, "requires_response": requires_response}
+
+    async def analyze_async(
+        self,
+        review_text: str,
+        subject: str = "",
+        sender_name: Optional[str] = None,
+    ) -> ReviewAnalysis:
         """
         Analyze a review using the LangGraph workflow.
 
         Args:
             review_text: The text of the review to analyze
             subject: The subject/title of the review (e.g., email subject)
+            sender_name: Display name from the email From: header, if any
 
         Returns:
             ReviewAnalysis with complete analysis results
         """
         logger.info(f"Starting analysis for review: {subject[:50]}...")
 
+        # Full results are cached as msgpack, so a re-analysis of the same
+        # email skips the graph entirely
+        cache_key = None
+        if settings.llm_cache_enabled:
+            cache_key = self._analysis_cache_key(review_text, subject, sender_name)
+            try:
+                redis = await get_redis_binary_client()
+                cached = await redis.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"Analysis cache hit for {cache_key}")
+                    return decode_analysis(cached)
+            except Exception as e:
+                logger.warning(f"Redis analysis cache read error: {e}")
+
+        # While the LLM is failing, skip the graph and its per-node timeouts;
+        # the basic analysis makes no LLM call with the breaker open
+        if self._breaker.is_open:
+            logger.warning("LLM circuit breaker open, using basic analysis")
+            return self.analyze_basic(review_text, subject)
+
         # Initialize state
-        initial_state = AnalysisState(
-            review_text=review_text,
-            subject=subject,
-        )
+        initial_state = initial_analysis_state(review_text, subject, sender_name)
 
         # Run the graph
-        final_state = self.graph.invoke(initial_state)
+        final_state = await self.graph.ainvoke(initial_state)
+
+        self.analyzed_count += 1
+        if final_state.get("triaged"):
+            self.triaged_count += 1
+            logger.info(
+                f"Review triaged without LLM "
+                f"({self.triaged_count}/{self.analyzed_count} so far)"
+            )
 
-        # Convert to ReviewAnalysis
-        result = ReviewAnalysis(
+        # Every node clamps its output to the allowed values, so the final
+        # state is already valid and revalidating it would be wasted work
+        result = ReviewAnalysis.model_construct(
             sentiment=final_state.get("sentiment", "neutral"),
             priority=final_state.get("priority", "normal"),
             summary=final_state.get("summary", ""),
@@ -426,8 +898,44 @@ class ReviewAnalyzer:
             f"priority={result.priority}, requires_response={result.requires_response}"
         )
 
+        # Fallback results are not cached so the next attempt retries the LLM
+        if cache_key is not None and not final_state.get("error"):
+            try:
+                redis = await get_redis_binary_client()
+                await redis.setex(
+                    cache_key, settings.llm_cache_ttl_seconds, encode_analysis(result)
+                )
+            except Exception as e:
+                logger.warning(f"Redis analysis cache write error: {e}")
+
         return result
 
+    def analyze(
+        self,
+        review_text: str,
+        subject: str = "",
+        sender_name: Optional[str] = None,
+    ) -> ReviewAnalysis:
+        """
+        Synchronous wrapper around analyze_async for Celery tasks.
+
+        Runs on a private event loop that is reused across calls, so the
+        LLM client's async connection pool stays bound to a live loop.
+
+        Args:
+            review_text: The text of the review to analyze
+            subject: The subject/title of the review (e.g., email subject)
+            sender_name: Display name from the email From: header, if any
+
+        Returns:
+            ReviewAnalysis with complete analysis results
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(
+            self.analyze_async(review_text, subject, sender_name)
+        )
+
     def analyze_basic(self, review_text: str, subject: str = "") -> ReviewAnalysis:
         """
         Basic analysis for FREE tier - only sentiment and priority.
@@ -442,19 +950,13 @@ class ReviewAnalyzer:
         logger.info(f"Starting basic analysis for review: {subject[:50]}...")
 
         # Clean text
-        text = re.sub(r"\s+", " ", review_text).strip()
-        text = re.sub(r"<[^>]+>", "", text)
-        if len(text) > 4000:
-            text = text[:4000] + "..."
+        text = _clean_text(review_text)
 
         # Classify sentiment
         try:
-            prompt = SENTIMENT_PROMPT.format(subject=subject, text=text)
+            prompt = _review_prompt(subject, text, SENTIMENT_PROMPT)
             response = self._call_llm(prompt)
-            result = self._parse_json_response(response, {"sentiment": "neutral"})
-            sentiment = result.get("sentiment", "neutral")
-            if sentiment not in ["positive", "negative", "neutral"]:
-                sentiment = "neutral"
+            sentiment = self._parse_json_response(response, SentimentResult).sentiment
         except Exception as e:
             logger.error(f"Error in basic sentiment: {e}")
             sentiment = "neutral"
@@ -463,9 +965,10 @@ class ReviewAnalyzer:
         priority = "important" if sentiment == "negative" else "normal"
 
         # Basic summary (truncate text)
-        summary = text[:200] + "..." if len(text) > 200 else text
+        summary = _fallback_summary(text)
 
-        return ReviewAnalysis(
+        # sentiment comes from SentimentResult, priority is derived from it
+        return ReviewAnalysis.model_construct(
             sentiment=sentiment,
             priority=priority,
             summary=summary,
@@ -476,8 +979,35 @@ class ReviewAnalyzer:
         )
 
 
-# Singleton instance
+# Singleton instances
 _analyzer_instance: Optional[ReviewAnalyzer] = None
+_mistral_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_mistral_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the process-wide async HTTP client for the Mistral API.
+
+    Shared by every ChatMistralAI instance so connections and the TLS
+    context are reused. HTTP/2 is used when the h2 package is installed.
+    """
+    global _mistral_http_client
+    if _mistral_http_client is None:
+        _mistral_http_client = httpx.AsyncClient(
+            base_url=MISTRAL_API_BASE_URL,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Authorization": f"Bearer {settings.mistral_api_key}",
+            },
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=MISTRAL_MAX_CONNECTIONS,
+                max_keepalive_connections=MISTRAL_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _mistral_http_client
 
 
 def get_review_analyzer() -> ReviewAnalyzer:
@@ -1,28 +1,38 @@
 """
 Analytics service for generating reports and statistics.
 
-Includes Redis caching.
+Summary, trend and response-time figures are read from the
+review_daily_stats_mv daily rollup. Includes Redis caching.
 """
-import json
+import asyncio
 import logging
-from collections import Counter
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+import weakref
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, extract, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+import zstandard
+from cachetools import TTLCache
+from pydantic import TypeAdapter
+from sqlalchemy import Numeric, and_, bindparam, cast, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models.email_account import EmailAccount
-from app.models.enums import PriorityType, SentimentType
 from app.models.review import Review
+from app.models.review_daily_stats import review_daily_stats
 from app.schemas.analytics import (
+    ANALYTICS_SUMMARY_ADAPTER,
+    PROBLEM_STAT_LIST_ADAPTER,
+    RESPONSE_TIME_STATS_ADAPTER,
+    TREND_POINT_LIST_ADAPTER,
+    AnalyticsDashboard,
     AnalyticsSummary,
     ProblemStat,
     ResponseTimeStats,
     TrendPoint,
 )
-from app.services.redis_client import get_redis_client
+from app.services.redis_client import get_redis_binary_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +44,58 @@ CACHE_TTL = {
     "all": 3600,     # 1 hour
 }
 
+# Naive datetimes are cached as UTC; UUIDs and datetimes serialize natively
+CACHE_DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_UUID
+
+
+# Payloads at least this large are stored zstd-compressed; smaller ones
+# (e.g. a summary) don't shrink enough to pay for the frame overhead
+CACHE_COMPRESS_MIN_BYTES = 1024
+ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Cache stampede protection: the lock:{key} sentinel expires on its own if
+# the worker holding it dies, and waiters stop polling well before that
+CACHE_LOCK_TTL_SECONDS = 30
+CACHE_LOCK_WAIT_SECONDS = 5
+
+# Per-key recompute locks; entries vanish once no coroutine holds a lock
+_recompute_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+# In-process L1 in front of Redis, holding uncompressed JSON bytes; entries
+# live far shorter than the Redis TTLs, so workers drift apart only briefly
+LOCAL_CACHE_TTL_SECONDS = 30
+_local_cache: TTLCache = TTLCache(maxsize=1024, ttl=LOCAL_CACHE_TTL_SECONDS)
+
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cache payload to JSON bytes."""
+    return orjson.dumps(value, default=str, option=CACHE_DUMPS_OPTIONS)
+
+
+def _pack(payload: bytes) -> bytes:
+    """Compress a serialized cache payload if it is large enough."""
+    if len(payload) < CACHE_COMPRESS_MIN_BYTES:
+        return payload
+    return _compressor.compress(payload)
+
+
+def _unpack(data: bytes) -> bytes:
+    """Undo _pack; compressed entries are recognized by the zstd frame magic."""
+    if data.startswith(ZSTD_FRAME_MAGIC):
+        return _decompressor.decompress(data)
+    return data
+
 
 async def get_cached_or_compute(
     cache_key: str,
     period: str,
     compute_fn: Callable,
+    adapter: Optional[TypeAdapter] = None,
 ) -> Any:
     """
     Get data from Redis cache or compute and store it.
@@ -47,37 +104,314 @@ async def get_cached_or_compute(
         cache_key: Redis key for caching
         period: Period string for TTL lookup
         compute_fn: Async function to compute data if cache miss
+        adapter: TypeAdapter for the computed value; when given, the value
+            is cached as its JSON dump and hits are validated straight from
+            the cached bytes
 
     Returns:
-        Cached or computed data (dict)
+        Cached or computed data
     """
+    local = _local_cache.get(cache_key)
+    if local is not None:
+        return _decode(local, adapter)
+
+    redis = None
     try:
-        redis = await get_redis_client()
+        redis = await get_redis_binary_client()
         cached = await redis.get(cache_key)
         if cached:
             logger.debug(f"Cache hit for {cache_key}")
-            return json.loads(cached)
+            data = _unpack(cached)
+            _local_cache[cache_key] = data
+            return _decode(data, adapter)
     except Exception as e:
         logger.warning(f"Redis cache read error: {e}")
 
-    result = await compute_fn()
+    if redis is None:
+        return await compute_fn()
+
+    # Only one coroutine per process recomputes a key; the rest queue on
+    # the lock and then find the fresh value in Redis
+    async with _key_lock(cache_key):
+        cached, claimed = await _claim_recompute(redis, cache_key)
+        if cached:
+            try:
+                data = _unpack(cached)
+                result = _decode(data, adapter)
+                _local_cache[cache_key] = data
+                return result
+            except Exception as e:
+                logger.warning(f"Redis cache read error: {e}")
+
+        try:
+            result = await compute_fn()
+
+            # Reuse the client from the read rather than fetching it again
+            try:
+                ttl = CACHE_TTL.get(period, 900)
+                payload = adapter.dump_json(result) if adapter is not None else _dumps(result)
+                _local_cache[cache_key] = payload
+                await redis.setex(cache_key, ttl, _pack(payload))
+                logger.debug(f"Cached {cache_key} with TTL {ttl}s")
+            except Exception as e:
+                logger.warning(f"Redis cache write error: {e}")
+        finally:
+            # Release the sentinel even if compute_fn raised, so other
+            # workers don't wait out its TTL
+            if claimed:
+                try:
+                    await redis.delete(f"lock:{cache_key}")
+                except Exception as e:
+                    logger.warning(f"Redis lock release error: {e}")
+
+    return result
+
+
+def _decode(data: bytes, adapter: Optional[TypeAdapter]) -> Any:
+    """Decode uncompressed cached JSON, validating it with the adapter if given."""
+    if adapter is not None:
+        return adapter.validate_json(data)
+    return orjson.loads(data)
+
+
+def clear_local_cache() -> None:
+    """Drop every entry from the in-process analytics cache."""
+    _local_cache.clear()
+
+
+def _key_lock(cache_key: str) -> asyncio.Lock:
+    """Get the in-process lock for a cache key, creating it on first use."""
+    lock = _recompute_locks.get(cache_key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _recompute_locks[cache_key] = lock
+    return lock
+
+
+async def _claim_recompute(redis, cache_key: str) -> Tuple[Optional[bytes], bool]:
+    """
+    Re-check the cache and claim the recompute across processes.
+
+    Another worker may be recomputing the same key; while its lock:{key}
+    sentinel exists, poll the key with backoff for up to
+    CACHE_LOCK_WAIT_SECONDS before giving up and computing anyway.
+
+    Args:
+        redis: Binary Redis client
+        cache_key: Redis key being recomputed
+
+    Returns:
+        Tuple of (cached value if another worker filled the key,
+        whether this caller set the sentinel)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + CACHE_LOCK_WAIT_SECONDS
+    delay = 0.05
+    try:
+        while True:
+            cached = await redis.get(cache_key)
+            if cached:
+                return cached, False
+            if await redis.set(
+                f"lock:{cache_key}", b"1", nx=True, ex=CACHE_LOCK_TTL_SECONDS
+            ):
+                return None, True
+            if loop.time() >= deadline:
+                return None, False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    except Exception as e:
+        logger.warning(f"Redis cache lock error: {e}")
+        return None, False
+
+
+class _RawJSON:
+    """Adapter stand-in that keeps cached JSON as bytes instead of decoding it."""
 
+    @staticmethod
+    def validate_json(data: bytes) -> bytes:
+        return bytes(data)
+
+    @staticmethod
+    def dump_json(value: bytes) -> bytes:
+        return value
+
+
+async def get_cached_json(
+    cache_key: str,
+    period: str,
+    compute_fn: Callable,
+    adapter: TypeAdapter,
+) -> bytes:
+    """
+    Get the JSON bytes for a cached value, computing it on a miss.
+
+    Shares cache entries with get_cached_or_compute, but a hit is returned
+    as the stored JSON without parsing it, ready to send as a response body.
+
+    Args:
+        cache_key: Redis key for caching
+        period: Period string for TTL lookup
+        compute_fn: Async function to compute the value if cache miss
+        adapter: TypeAdapter used to dump the computed value
+
+    Returns:
+        JSON bytes of the cached or computed value
+    """
+
+    async def compute_json() -> bytes:
+        return adapter.dump_json(await compute_fn())
+
+    return await get_cached_or_compute(cache_key, period, compute_json, _RawJSON)
+
+
+async def get_many_cached(adapters: Dict[str, TypeAdapter]) -> Dict[str, Any]:
+    """
+    Read several cache keys, checking the local cache before one MGET.
+
+    Args:
+        adapters: TypeAdapter to validate each cached value with, by Redis key
+
+    Returns:
+        Validated values for the keys that were cached
+    """
+    found: Dict[str, Any] = {}
+    remote_keys = []
+    for key in adapters:
+        local = _local_cache.get(key)
+        if local is None:
+            remote_keys.append(key)
+            continue
+        try:
+            found[key] = adapters[key].validate_json(local)
+        except Exception as e:
+            logger.warning(f"Cache decode error for {key}: {e}")
+            _local_cache.pop(key, None)
+
+    if remote_keys:
+        try:
+            redis = await get_redis_binary_client()
+            values = await redis.mget(remote_keys)
+        except Exception as e:
+            logger.warning(f"Redis cache read error: {e}")
+            values = []
+        for key, value in zip(remote_keys, values):
+            if not value:
+                continue
+            # A corrupt or old-format entry is treated as a miss
+            try:
+                data = _unpack(value)
+                found[key] = adapters[key].validate_json(data)
+            except Exception as e:
+                logger.warning(f"Cache decode error for {key}: {e}")
+                continue
+            _local_cache[key] = data
+
+    return found
+
+
+async def set_many_cached(items: Dict[str, bytes], period: str) -> None:
+    """
+    Write several cache entries in one pipelined round-trip.
+
+    Args:
+        items: Serialized values to cache by Redis key
+        period: Period string for TTL lookup
+    """
     try:
-        redis = await get_redis_client()
+        redis = await get_redis_binary_client()
         ttl = CACHE_TTL.get(period, 900)
-        await redis.setex(cache_key, ttl, json.dumps(result, default=str))
-        logger.debug(f"Cached {cache_key} with TTL {ttl}s")
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                _local_cache[key] = value
+                pipe.setex(key, ttl, _pack(value))
+            await pipe.execute()
     except Exception as e:
         logger.warning(f"Redis cache write error: {e}")
 
-    return result
+
+# Cache key segment -> (adapter, compute method) for each metric endpoint
+ANALYTICS_METRICS: Dict[str, Tuple[TypeAdapter, str]] = {
+    "summary": (ANALYTICS_SUMMARY_ADAPTER, "_compute_summary"),
+    "trends": (TREND_POINT_LIST_ADAPTER, "_compute_trends"),
+    "problems": (PROBLEM_STAT_LIST_ADAPTER, "_compute_problems_breakdown"),
+    "response_time": (RESPONSE_TIME_STATS_ADAPTER, "_compute_response_time_stats"),
+}
+
+
+def _rollup_total(column):
+    return func.coalesce(func.sum(column), 0)
+
+
+# Rollup statements are built once and executed with :user_id/:start_day
+# bind params, so each call reuses the same construct (and its cached
+# compiled form) instead of rebuilding the expression tree
+_stats = review_daily_stats.c
+_ROLLUP_FILTER = and_(
+    _stats.email_account_id.in_(
+        select(EmailAccount.id)
+        .where(EmailAccount.user_id == bindparam("user_id"))
+        .scalar_subquery()
+    ),
+    _stats.day >= bindparam("start_day"),
+)
+
+SUMMARY_STMT = select(
+    _rollup_total(_stats.total),
+    _rollup_total(_stats.positive),
+    _rollup_total(_stats.negative),
+    _rollup_total(_stats.neutral),
+    _rollup_total(_stats.mixed),
+    # Priority (backend: critical/important/normal → frontend: critical/high/medium/low)
+    _rollup_total(_stats.critical),
+    _rollup_total(_stats.important),
+    _rollup_total(_stats.normal),
+    _rollup_total(_stats.processed),
+    _rollup_total(_stats.unprocessed),
+    _rollup_total(_stats.responded),
+    _rollup_total(_stats.sum_response_seconds),
+).where(_ROLLUP_FILTER)
+
+TRENDS_STMT = (
+    select(
+        _stats.day,
+        func.sum(_stats.positive),
+        func.sum(_stats.negative),
+        func.sum(_stats.neutral),
+        func.sum(_stats.total),
+    )
+    .where(_ROLLUP_FILTER)
+    .group_by(_stats.day)
+    .order_by(_stats.day)
+)
+
+RESPONSE_TIME_STMT = select(
+    _rollup_total(_stats.total),
+    _rollup_total(_stats.responded),
+    func.sum(_stats.sum_response_seconds),
+    func.min(_stats.min_response_seconds),
+    func.max(_stats.max_response_seconds),
+).where(_ROLLUP_FILTER)
 
 
 class AnalyticsService:
     """Service for generating analytics and reports."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        session_factory: Optional[async_sessionmaker] = None,
+    ):
+        """
+        Initialize the analytics service.
+
+        Args:
+            db: Database session
+            session_factory: Optional factory used to run independent
+                queries concurrently, each on its own connection
+        """
         self.db = db
+        self.session_factory = session_factory
 
     def _get_date_range(self, period: str) -> Optional[datetime]:
         """Get start date for a given period."""
@@ -91,19 +425,123 @@ class AnalyticsService:
         else:  # 'all'
             return None
 
-    async def _get_user_email_account_ids(self, user_id: UUID) -> List[UUID]:
-        """Get all email account IDs for a user."""
-        result = await self.db.execute(
-            select(EmailAccount.id).where(EmailAccount.user_id == user_id)
+    def _account_ids_subquery(self, user_id: UUID):
+        """
+        Scalar subquery for a user's email account IDs.
+
+        Used inside IN (...) so the account set is resolved in the same
+        statement rather than fetched first and sent back as parameters.
+        """
+        return (
+            select(EmailAccount.id)
+            .where(EmailAccount.user_id == user_id)
+            .scalar_subquery()
         )
-        return [row[0] for row in result.fetchall()]
 
-    async def _count_by_conditions(self, conditions: list) -> int:
-        """Count reviews matching conditions."""
-        result = await self.db.execute(
-            select(func.count(Review.id)).where(and_(*conditions))
+    def _rollup_params(self, user_id: UUID, period: str) -> Dict[str, Any]:
+        """
+        Bind params for the module-level rollup statements.
+
+        The rollup is per UTC day, so the period starts at the beginning of
+        its first day; 'all' starts at date.min so one statement serves
+        every period.
+        """
+        start_date = self._get_date_range(period)
+        return {
+            "user_id": user_id,
+            "start_day": start_date.date() if start_date else date.min,
+        }
+
+    async def get_dashboard(
+        self, user_id: UUID, period: str = "30d"
+    ) -> AnalyticsDashboard:
+        """
+        Get summary, trends, problems and response times together.
+
+        Shares the per-endpoint cache entries, but reads them all with one
+        MGET and writes any misses back in one pipeline. With a
+        session_factory, several misses are computed concurrently.
+        """
+        prefix = f"{user_id}:{period}"
+        computes = {
+            f"analytics:summary:{prefix}": (
+                ANALYTICS_SUMMARY_ADAPTER,
+                AnalyticsService._compute_summary,
+            ),
+            f"analytics:trends:{prefix}": (
+                TREND_POINT_LIST_ADAPTER,
+                AnalyticsService._compute_trends,
+            ),
+            f"analytics:problems:{prefix}": (
+                PROBLEM_STAT_LIST_ADAPTER,
+                AnalyticsService._compute_problems_breakdown,
+            ),
+            f"analytics:response_time:{prefix}": (
+                RESPONSE_TIME_STATS_ADAPTER,
+                AnalyticsService._compute_response_time_stats,
+            ),
+        }
+        data = await get_many_cached(
+            {key: adapter for key, (adapter, _) in computes.items()}
+        )
+
+        missing = [key for key in computes if key not in data]
+        if self.session_factory is not None and len(missing) > 1:
+            # One AsyncSession runs its queries one at a time, so each
+            # concurrent compute gets its own session and connection
+            results = await asyncio.gather(
+                *(
+                    self._compute_in_own_session(computes[key][1], user_id, period)
+                    for key in missing
+                )
+            )
+        else:
+            results = [
+                await computes[key][1](self, user_id, period) for key in missing
+            ]
+
+        misses: Dict[str, bytes] = {}
+        for key, result in zip(missing, results):
+            data[key] = result
+            misses[key] = computes[key][0].dump_json(result)
+
+        if misses:
+            await set_many_cached(misses, period)
+
+        summary, trends, problems, response_time = (data[key] for key in computes)
+        return AnalyticsDashboard(
+            summary=summary,
+            trends=trends,
+            problems=problems,
+            response_time=response_time,
+        )
+
+    async def _compute_in_own_session(
+        self, compute: Callable, user_id: UUID, period: str
+    ) -> Any:
+        """Run a _compute_* method on a fresh session from session_factory."""
+        async with self.session_factory() as session:
+            return await compute(AnalyticsService(session), user_id, period)
+
+    async def get_metric_json(self, metric: str, user_id: UUID, period: str) -> bytes:
+        """
+        Get one analytics metric as JSON bytes, for returning verbatim.
+
+        Args:
+            metric: One of ANALYTICS_METRICS
+            user_id: User to compute analytics for
+            period: Period string
+
+        Returns:
+            JSON body for the metric's endpoint
+        """
+        adapter, compute_name = ANALYTICS_METRICS[metric]
+        return await get_cached_json(
+            f"analytics:{metric}:{user_id}:{period}",
+            period,
+            lambda: getattr(self, compute_name)(user_id, period),
+            adapter,
         )
-        return result.scalar() or 0
 
     async def get_summary(
         self, user_id: UUID, period: str = "all"
@@ -111,68 +549,44 @@ class AnalyticsService:
         """Get summary analytics for a user with caching."""
         cache_key = f"analytics:summary:{user_id}:{period}"
 
-        async def compute():
-            return (await self._compute_summary(user_id, period)).model_dump()
-
-        data = await get_cached_or_compute(cache_key, period, compute)
-
-        if isinstance(data, dict):
-            return AnalyticsSummary(**data)
-        return data
+        return await get_cached_or_compute(
+            cache_key,
+            period,
+            lambda: self._compute_summary(user_id, period),
+            ANALYTICS_SUMMARY_ADAPTER,
+        )
 
     async def _compute_summary(
         self, user_id: UUID, period: str
     ) -> AnalyticsSummary:
-        """Compute summary analytics (no cache)."""
-        account_ids = await self._get_user_email_account_ids(user_id)
-        if not account_ids:
-            return AnalyticsSummary()
-
-        start_date = self._get_date_range(period)
-
-        conditions = [Review.email_account_id.in_(account_ids)]
-        if start_date:
-            conditions.append(Review.received_at >= start_date)
-
-        total_reviews = await self._count_by_conditions(conditions)
-
-        # Sentiment counts
-        positive = await self._count_by_conditions(
-            conditions + [Review.sentiment == SentimentType.POSITIVE.value]
-        )
-        negative = await self._count_by_conditions(
-            conditions + [Review.sentiment == SentimentType.NEGATIVE.value]
-        )
-        neutral = await self._count_by_conditions(
-            conditions + [Review.sentiment == SentimentType.NEUTRAL.value]
-        )
-        mixed = await self._count_by_conditions(
-            conditions + [Review.sentiment == "mixed"]
-        )
+        """
+        Compute summary analytics (no cache).
 
-        # Priority counts (backend: critical/important/normal → frontend: critical/high/medium/low)
-        critical_count = await self._count_by_conditions(
-            conditions + [Review.priority == PriorityType.CRITICAL.value]
-        )
-        high_count = await self._count_by_conditions(
-            conditions + [Review.priority == PriorityType.IMPORTANT.value]
-        )
-        medium_count = await self._count_by_conditions(
-            conditions + [Review.priority == PriorityType.NORMAL.value]
-        )
-        low_count = 0
-
-        # Processed / unprocessed
-        processed = await self._count_by_conditions(
-            conditions + [Review.is_processed == True]
+        Sums the per-day rows of review_daily_stats_mv instead of scanning
+        the reviews table.
+        """
+        result = await self.db.execute(
+            SUMMARY_STMT, self._rollup_params(user_id, period)
         )
-        unprocessed = await self._count_by_conditions(
-            conditions + [Review.is_processed == False]
+        (
+            total_reviews,
+            positive,
+            negative,
+            neutral,
+            mixed,
+            critical_count,
+            high_count,
+            medium_count,
+            processed,
+            unprocessed,
+            responded,
+            response_seconds,
+        ) = result.one()
+
+        avg_response_time = (
+            round(float(response_seconds) / responded / 3600, 1) if responded else None
         )
 
-        # Average response time
-        avg_response_time = await self._compute_avg_response_time(conditions)
-
         return AnalyticsSummary(
             total_reviews=total_reviews,
             positive_reviews=positive,
@@ -182,89 +596,43 @@ class AnalyticsService:
             critical_count=critical_count,
             high_count=high_count,
             medium_count=medium_count,
-            low_count=low_count,
+            low_count=0,
             avg_response_time_hours=avg_response_time,
             processed_count=processed,
             unprocessed_count=unprocessed,
         )
 
-    async def _compute_avg_response_time(self, conditions: list) -> Optional[float]:
-        """Compute average response time in hours for processed reviews."""
-        result = await self.db.execute(
-            select(
-                func.avg(
-                    extract("epoch", Review.processed_at - Review.received_at) / 3600
-                )
-            ).where(
-                and_(
-                    *conditions,
-                    Review.is_processed == True,
-                    Review.processed_at.isnot(None),
-                )
-            )
-        )
-        avg_val = result.scalar()
-        return round(float(avg_val), 1) if avg_val is not None else None
-
     async def get_trends(
         self, user_id: UUID, period: str = "30d"
     ) -> List[TrendPoint]:
         """Get trend data for charts with caching."""
         cache_key = f"analytics:trends:{user_id}:{period}"
 
-        async def compute():
-            points = await self._compute_trends(user_id, period)
-            return [p.model_dump() for p in points]
-
-        data = await get_cached_or_compute(cache_key, period, compute)
-
-        if isinstance(data, list):
-            return [TrendPoint(**d) if isinstance(d, dict) else d for d in data]
-        return data
+        return await get_cached_or_compute(
+            cache_key,
+            period,
+            lambda: self._compute_trends(user_id, period),
+            TREND_POINT_LIST_ADAPTER,
+        )
 
     async def _compute_trends(
         self, user_id: UUID, period: str
     ) -> List[TrendPoint]:
-        """Compute trend data (no cache)."""
-        account_ids = await self._get_user_email_account_ids(user_id)
-        if not account_ids:
-            return []
-
-        start_date = self._get_date_range(period)
-        conditions = [Review.email_account_id.in_(account_ids)]
-        if start_date:
-            conditions.append(Review.received_at >= start_date)
-
+        """Compute trend data from the daily rollup (no cache)."""
         result = await self.db.execute(
-            select(Review.received_at, Review.sentiment).where(and_(*conditions))
+            TRENDS_STMT, self._rollup_params(user_id, period)
         )
-        reviews = result.fetchall()
-
-        date_data: dict = {}
-        for received_at, sentiment in reviews:
-            date_key = received_at.strftime("%Y-%m-%d")
 
-            if date_key not in date_data:
-                date_data[date_key] = {"positive": 0, "negative": 0, "neutral": 0, "total": 0}
-
-            date_data[date_key]["total"] += 1
-            if sentiment == SentimentType.POSITIVE.value:
-                date_data[date_key]["positive"] += 1
-            elif sentiment == SentimentType.NEGATIVE.value:
-                date_data[date_key]["negative"] += 1
-            elif sentiment == SentimentType.NEUTRAL.value:
-                date_data[date_key]["neutral"] += 1
-
-        sorted_dates = sorted(date_data.keys())
+        # The rollup's day is a DATE, whose isoformat() is already YYYY-MM-DD
         return [
             TrendPoint(
-                date=date_key,
-                positive=date_data[date_key]["positive"],
-                negative=date_data[date_key]["negative"],
-                neutral=date_data[date_key]["neutral"],
-                total=date_data[date_key]["total"],
+                date=day.isoformat(),
+                positive=positive,
+                negative=negative,
+                neutral=neutral,
+                total=total,
             )
-            for date_key in sorted_dates
+            for day, positive, negative, neutral, total in result.all()
         ]
 
     async def get_problems_breakdown(
@@ -273,55 +641,50 @@ class AnalyticsService:
         """Get breakdown of problems with caching."""
         cache_key = f"analytics:problems:{user_id}:{period}"
 
-        async def compute():
-            stats = await self._compute_problems_breakdown(user_id, period)
-            return [s.model_dump() for s in stats]
-
-        data = await get_cached_or_compute(cache_key, period, compute)
-
-        if isinstance(data, list):
-            return [ProblemStat(**d) if isinstance(d, dict) else d for d in data]
-        return data
+        return await get_cached_or_compute(
+            cache_key,
+            period,
+            lambda: self._compute_problems_breakdown(user_id, period),
+            PROBLEM_STAT_LIST_ADAPTER,
+        )
 
     async def _compute_problems_breakdown(
         self, user_id: UUID, period: str
     ) -> List[ProblemStat]:
         """Compute problems breakdown (no cache)."""
-        account_ids = await self._get_user_email_account_ids(user_id)
-        if not account_ids:
-            return []
-
         start_date = self._get_date_range(period)
         conditions = [
-            Review.email_account_id.in_(account_ids),
-            Review.problems.isnot(None),
+            Review.email_account_id.in_(self._account_ids_subquery(user_id)),
+            # problems is a JSON column; JSON null and non-arrays can't be unnested
+            func.json_typeof(Review.problems) == "array",
         ]
         if start_date:
-            conditions.append(Review.received_at >= start_date)
+            # Start at the beginning of the first UTC day, as the rollup
+            # queries do, so this panel covers the same reviews as the others
+            conditions.append(
+                Review.received_at >= datetime.combine(start_date.date(), time.min)
+            )
 
-        result = await self.db.execute(
-            select(Review.problems).where(and_(*conditions))
+        # Unnest and count in Postgres so only one row per distinct problem
+        # comes back; the percentage uses the total over all rows
+        problem = func.json_array_elements_text(Review.problems).table_valued("value")
+        count = func.count()
+        percentage = func.round(
+            cast(100 * count, Numeric) / func.sum(count).over(), 1
         )
-        rows = result.fetchall()
-
-        all_problems: List[str] = []
-        for row in rows:
-            if row[0] and len(row[0]) > 0:
-                all_problems.extend(row[0])
 
-        if not all_problems:
-            return []
-
-        problem_counter = Counter(all_problems)
-        total_problems = len(all_problems)
+        result = await self.db.execute(
+            select(problem.c.value, count, percentage)
+            .select_from(Review)
+            .join(problem, true())
+            .where(and_(*conditions))
+            .group_by(problem.c.value)
+            .order_by(count.desc(), problem.c.value)
+        )
 
         return [
-            ProblemStat(
-                problem=name,
-                count=count,
-                percentage=round(count / total_problems * 100, 1),
-            )
-            for name, count in problem_counter.most_common()
+            ProblemStat(problem=name, count=total, percentage=float(pct))
+            for name, total, pct in result.all()
         ]
 
     async def get_response_time_stats(
@@ -330,35 +693,21 @@ class AnalyticsService:
         """Get response time statistics."""
         cache_key = f"analytics:response_time:{user_id}:{period}"
 
-        async def compute():
-            return (await self._compute_response_time_stats(user_id, period)).model_dump()
-
-        data = await get_cached_or_compute(cache_key, period, compute)
-
-        if isinstance(data, dict):
-            return ResponseTimeStats(**data)
-        return data
+        return await get_cached_or_compute(
+            cache_key,
+            period,
+            lambda: self._compute_response_time_stats(user_id, period),
+            RESPONSE_TIME_STATS_ADAPTER,
+        )
 
     async def _compute_response_time_stats(
         self, user_id: UUID, period: str
     ) -> ResponseTimeStats:
-        """Compute response time stats (no cache)."""
-        account_ids = await self._get_user_email_account_ids(user_id)
-        if not account_ids:
-            return ResponseTimeStats()
-
-        start_date = self._get_date_range(period)
-        conditions = [Review.email_account_id.in_(account_ids)]
-        if start_date:
-            conditions.append(Review.received_at >= start_date)
-
-        total_count = await self._count_by_conditions(conditions)
-
-        processed_conditions = conditions + [
-            Review.is_processed == True,
-            Review.processed_at.isnot(None),
-        ]
-        processed_count = await self._count_by_conditions(processed_conditions)
+        """Compute response time stats from the daily rollup (no cache)."""
+        result = await self.db.execute(
+            RESPONSE_TIME_STMT, self._rollup_params(user_id, period)
+        )
+        total_count, processed_count, total_seconds, min_seconds, max_seconds = result.one()
 
         if processed_count == 0:
             return ResponseTimeStats(
@@ -366,21 +715,13 @@ class AnalyticsService:
                 processed_count=0,
             )
 
-        time_expr = extract("epoch", Review.processed_at - Review.received_at) / 3600
-
-        result = await self.db.execute(
-            select(
-                func.avg(time_expr),
-                func.min(time_expr),
-                func.max(time_expr),
-            ).where(and_(*processed_conditions))
-        )
-        row = result.one()
+        def hours(seconds: Optional[float]) -> Optional[float]:
+            return round(float(seconds) / 3600, 1) if seconds is not None else None
 
         return ResponseTimeStats(
-            avg_hours=round(float(row[0]), 1) if row[0] is not None else None,
-            min_hours=round(float(row[1]), 1) if row[1] is not None else None,
-            max_hours=round(float(row[2]), 1) if row[2] is not None else None,
+            avg_hours=hours(float(total_seconds) / processed_count),
+            min_hours=hours(min_seconds),
+            max_hours=hours(max_seconds),
             processed_count=processed_count,
             total_count=total_count,
         )
@@ -1,10 +1,14 @@
 """
 Authentication service for user registration, login, and token management.
 """
+import asyncio
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy import select
@@ -19,6 +23,12 @@ settings = get_settings()
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded tokens by token string; the short TTL bounds how long a token
+# signed with a rotated secret stays accepted, and expiry is rechecked on
+# every hit
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
+
 
 def hash_password(password: str) -> str:
     """
@@ -48,25 +58,60 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(user_id: UUID) -> str:
+async def hash_password_async(password: str) -> str:
     """
-    Create a JWT access token for a user.
+    Hash a password in a worker thread.
+
+    bcrypt is deliberately slow, pure CPU work; running it off the event
+    loop keeps other requests responsive while it hashes.
 
     Args:
-        user_id: The user's UUID
+        password: Plain text password
 
     Returns:
-        Encoded JWT access token
+        Hashed password string
     """
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash in a worker thread.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+def _encode_token(user_id: UUID, expire: datetime, token_type: str) -> str:
+    """Encode a signed JWT for a user."""
     payload = {
         "sub": str(user_id),
         "exp": expire,
-        "type": "access",
+        "type": token_type,
     }
     return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
 
 
+def create_access_token(user_id: UUID) -> str:
+    """
+    Create a JWT access token for a user.
+
+    Args:
+        user_id: The user's UUID
+
+    Returns:
+        Encoded JWT access token
+    """
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+    return _encode_token(user_id, expire, "access")
+
+
 def create_refresh_token(user_id: UUID) -> str:
     """
     Create a JWT refresh token for a user.
@@ -78,31 +123,55 @@ def create_refresh_token(user_id: UUID) -> str:
         Encoded JWT refresh token
     """
     expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
-    payload = {
-        "sub": str(user_id),
-        "exp": expire,
-        "type": "refresh",
-    }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+    return _encode_token(user_id, expire, "refresh")
+
+
+def create_token_pair(user_id: UUID) -> Token:
+    """
+    Create access and refresh tokens for a user from one timestamp.
+
+    Args:
+        user_id: The user's UUID
+
+    Returns:
+        Token object with access and refresh tokens
+    """
+    now = datetime.now(timezone.utc)
+    return Token(
+        access_token=_encode_token(
+            user_id, now + timedelta(minutes=settings.access_token_expire_minutes), "access"
+        ),
+        refresh_token=_encode_token(
+            user_id, now + timedelta(days=settings.refresh_token_expire_days), "refresh"
+        ),
+    )
 
 
 def decode_token(token: str) -> Optional[TokenPayload]:
     """
     Decode and validate a JWT token.
 
+    Valid tokens are cached briefly, so repeat requests with the same token
+    skip the signature check.
+
     Args:
         token: The JWT token string
 
     Returns:
         TokenPayload if valid, None otherwise
     """
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        return cached if cached.exp > time.time() else None
+
     try:
         payload = jwt.decode(
             token,
             settings.secret_key,
             algorithms=[settings.jwt_algorithm],
         )
-        return TokenPayload(
+        token_payload = TokenPayload(
             sub=payload["sub"],
             exp=payload["exp"],
             type=payload["type"],
@@ -110,6 +179,16 @@ def decode_token(token: str) -> Optional[TokenPayload]:
     except JWTError:
         return None
 
+    with _token_cache_lock:
+        _token_cache[token] = token_payload
+    return token_payload
+
+
+def clear_token_cache() -> None:
+    """Drop all cached token payloads, e.g. after rotating the secret key."""
+    with _token_cache_lock:
+        _token_cache.clear()
+
 
 class AuthService:
     """Service class for authentication operations."""
@@ -142,16 +221,16 @@ class AuthService:
         """
         Get a user by their ID.
 
+        Goes through the session's identity map, so repeat lookups of the
+        same user within a request don't issue another SELECT.
+
         Args:
             user_id: User's UUID
 
         Returns:
             User if found, None otherwise
         """
-        result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await self.db.get(User, user_id)
 
     async def register(self, user_data: UserCreate) -> User:
         """
@@ -174,7 +253,7 @@ class AuthService:
         # Create new user
         user = User(
             email=user_data.email.lower(),
-            hashed_password=hash_password(user_data.password),
+            hashed_password=await hash_password_async(user_data.password),
             full_name=user_data.full_name,
         )
         self.db.add(user)
@@ -201,16 +280,13 @@ class AuthService:
         if not user or not user.hashed_password:
             raise ValueError("Invalid email or password")
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise ValueError("Invalid email or password")
 
         if not user.is_active:
             raise ValueError("User account is deactivated")
 
-        return Token(
-            access_token=create_access_token(user.id),
-            refresh_token=create_refresh_token(user.id),
-        )
+        return create_token_pair(user.id)
 
     async def refresh_token(self, refresh_token: str) -> Token:
         """
@@ -241,7 +317,4 @@ class AuthService:
         if not user.is_active:
             raise ValueError("User account is deactivated")
 
-        return Token(
-            access_token=create_access_token(user.id),
-            refresh_token=create_refresh_token(user.id),
-        )
+        return create_token_pair(user.id)
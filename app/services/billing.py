@@ -6,22 +6,37 @@ Handles:
 - Checkout session creation
 - Customer portal sessions
 - Subscription management
-- Webhook event processing
+- Webhook event intake (verify + queue) and processing
 """
+import asyncio
+import hashlib
+import hmac
 import logging
-from datetime import datetime, timezone
-from typing import Optional
+import time
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Mapping, Optional, Tuple
 from uuid import UUID
 
 import stripe
-from sqlalchemy import select
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.config import get_settings
 from app.models.enums import PlanType, SubscriptionStatus
 from app.models.invoice import Invoice
 from app.models.subscription import Subscription
 from app.models.user import User
+from app.models.webhook_event import WebhookEvent
+from app.services.stripe_cache import (
+    from_stripe_timestamp,
+    get_subscription_period,
+    invalidate_subscription,
+    set_subscription_period,
+)
+from app.utils.serialization import json_loads
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -30,8 +45,8 @@ settings = get_settings()
 stripe.api_key = settings.stripe_secret_key
 
 # Map Stripe price IDs to plan types
-PRICE_TO_PLAN = {}
-PLAN_TO_PRICES = {}
+PRICE_TO_PLAN: Mapping[str, PlanType] = MappingProxyType({})
+PLAN_TO_PRICES: Mapping[PlanType, Mapping[str, str]] = MappingProxyType({})
 
 
 def _init_price_mappings():
@@ -45,21 +60,22 @@ def _init_price_mappings():
         settings.stripe_price_pro_yearly: PlanType.PROFESSIONAL,
         settings.stripe_price_enterprise_monthly: PlanType.ENTERPRISE,
     }
-    PRICE_TO_PLAN = {k: v for k, v in mapping.items() if k}
+    # Read-only views: handlers share these and must never mutate them
+    PRICE_TO_PLAN = MappingProxyType({k: v for k, v in mapping.items() if k})
 
-    PLAN_TO_PRICES = {
-        PlanType.STARTER: {
+    PLAN_TO_PRICES = MappingProxyType({
+        PlanType.STARTER: MappingProxyType({
             "monthly": settings.stripe_price_starter_monthly,
             "yearly": settings.stripe_price_starter_yearly,
-        },
-        PlanType.PROFESSIONAL: {
+        }),
+        PlanType.PROFESSIONAL: MappingProxyType({
             "monthly": settings.stripe_price_pro_monthly,
             "yearly": settings.stripe_price_pro_yearly,
-        },
-        PlanType.ENTERPRISE: {
+        }),
+        PlanType.ENTERPRISE: MappingProxyType({
             "monthly": settings.stripe_price_enterprise_monthly,
-        },
-    }
+        }),
+    })
 
 
 _init_price_mappings()
@@ -74,30 +90,165 @@ WEBHOOK_EVENTS = [
     "invoice.payment_failed",
 ]
 
+# Max age of a webhook signature timestamp (Stripe's own default)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+# Unprocessed webhook events untouched for this long are re-enqueued by the
+# sweeper; Stripe stops redelivering after 3 days, so older ones are left
+WEBHOOK_SWEEP_AFTER = timedelta(minutes=5)
+WEBHOOK_SWEEP_MAX_AGE = timedelta(days=3)
+
+# Default page size for the invoice list
+INVOICE_PAGE_SIZE = 20
+
+# Stripe subscription status -> our status
+STRIPE_STATUS_MAP = {
+    "active": SubscriptionStatus.ACTIVE,
+    "past_due": SubscriptionStatus.PAST_DUE,
+    "canceled": SubscriptionStatus.CANCELED,
+    "trialing": SubscriptionStatus.TRIALING,
+    "incomplete": SubscriptionStatus.INCOMPLETE,
+}
+
+
+def verify_webhook_signature(
+    payload: bytes,
+    header: str,
+    secret: str,
+    tolerance: int = WEBHOOK_TOLERANCE_SECONDS,
+) -> None:
+    """
+    Verify a Stripe-Signature header against the raw request body.
+
+    Same check as stripe.WebhookSignature.verify_header, but the HMAC is
+    fed the body bytes directly instead of decoding, formatting and
+    re-encoding it, and no Event object is built from the payload.
+
+    Args:
+        payload: Raw request body
+        header: Stripe-Signature header ("t=...,v1=...,v1=...")
+        secret: Webhook endpoint secret
+        tolerance: Max signature age in seconds
+
+    Raises:
+        ValueError: If the signature is missing, wrong or too old
+    """
+    if not header or not secret:
+        raise ValueError("Invalid webhook signature")
+
+    timestamp = None
+    signatures = []
+    for item in header.split(","):
+        key, _, value = item.partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+    if not timestamp or not timestamp.isdigit() or not signatures:
+        raise ValueError("Invalid webhook signature")
+
+    mac = hmac.new(secret.encode(), timestamp.encode() + b".", hashlib.sha256)
+    mac.update(payload)
+    expected = mac.hexdigest()
+    if not any(hmac.compare_digest(expected, sig) for sig in signatures):
+        raise ValueError("Invalid webhook signature")
+
+    if tolerance and int(timestamp) < time.time() - tolerance:
+        raise ValueError("Invalid webhook signature")
+
+
+async def _stripe_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking stripe-python API call in a worker thread.
+
+    Keeps the event loop serving other requests during the HTTPS round-trip.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
 
 class BillingService:
     """Manages Stripe billing operations."""
 
+    # Stripe event type -> handler method name
+    _WEBHOOK_HANDLERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "checkout.session.completed": "_handle_checkout_completed",
+        "customer.subscription.created": "_handle_subscription_updated",
+        "customer.subscription.updated": "_handle_subscription_updated",
+        "customer.subscription.deleted": "_handle_subscription_deleted",
+        "invoice.paid": "_handle_invoice_paid",
+        "invoice.payment_failed": "_handle_payment_failed",
+    })
+
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Per-instance lookup memo (one BillingService per request/task);
+        # None is stored too so a missing row is only queried once
+        self._sub_by_user: dict[UUID, Optional[Subscription]] = {}
+        self._sub_by_stripe_id: dict[str, Optional[Subscription]] = {}
+
+    def _remember(self, subscription: Subscription) -> None:
+        """Record a loaded or newly created subscription in both memos."""
+        self._sub_by_user[subscription.user_id] = subscription
+        if subscription.stripe_subscription_id:
+            self._sub_by_stripe_id[subscription.stripe_subscription_id] = subscription
+
+    async def _load_sub_by_user(self, user_id: UUID) -> Optional[Subscription]:
+        """Get a user's subscription, querying at most once per instance."""
+        if user_id not in self._sub_by_user:
+            result = await self.db.execute(
+                select(Subscription)
+                .options(joinedload(Subscription.user))
+                .where(Subscription.user_id == user_id)
+            )
+            subscription = result.scalar_one_or_none()
+            self._sub_by_user[user_id] = subscription
+            if subscription:
+                self._remember(subscription)
+        return self._sub_by_user[user_id]
+
+    async def _load_sub_by_stripe_id(self, stripe_sub_id: str) -> Optional[Subscription]:
+        """Get a subscription by Stripe ID, querying at most once per instance."""
+        if stripe_sub_id not in self._sub_by_stripe_id:
+            result = await self.db.execute(
+                select(Subscription)
+                .options(joinedload(Subscription.user))
+                .where(Subscription.stripe_subscription_id == stripe_sub_id)
+            )
+            subscription = result.scalar_one_or_none()
+            self._sub_by_stripe_id[stripe_sub_id] = subscription
+            if subscription:
+                self._remember(subscription)
+        return self._sub_by_stripe_id[stripe_sub_id]
 
     async def get_or_create_customer(self, user: User) -> str:
-        """Get existing Stripe customer ID or create a new one."""
-        # Check if user already has a subscription with customer ID
-        result = await self.db.execute(
-            select(Subscription).where(Subscription.user_id == user.id)
-        )
-        subscription = result.scalar_one_or_none()
+        """
+        Get the user's Stripe customer ID, creating the customer if needed.
 
+        Normally already set on the user at signup; users from before that
+        fall back to their subscription's customer. A newly created
+        customer is stored on the user so it is only created once.
+        """
+        if user.stripe_customer_id:
+            return user.stripe_customer_id
+
+        # Legacy users: customer ID only recorded on the subscription
+        subscription = await self._load_sub_by_user(user.id)
         if subscription and subscription.stripe_customer_id:
+            user.stripe_customer_id = subscription.stripe_customer_id
+            await self.db.flush()
             return subscription.stripe_customer_id
 
-        # Create new Stripe customer
-        customer = stripe.Customer.create(
+        # Create new Stripe customer. The signup task and a first checkout
+        # can race here; the idempotency key makes both get one customer
+        customer = await _stripe_call(
+            stripe.Customer.create,
             email=user.email,
             name=user.full_name,
             metadata={"user_id": str(user.id)},
+            idempotency_key=f"customer-create-{user.id}",
         )
+        user.stripe_customer_id = customer.id
+        await self.db.flush()
 
         return customer.id
 
@@ -128,7 +279,8 @@ class BillingService:
 
         customer_id = await self.get_or_create_customer(user)
 
-        session = stripe.checkout.Session.create(
+        session = await _stripe_call(
+            stripe.checkout.Session.create,
             customer=customer_id,
             payment_method_types=["card"],
             line_items=[{"price": price_id, "quantity": 1}],
@@ -158,7 +310,8 @@ class BillingService:
         """
         customer_id = await self.get_or_create_customer(user)
 
-        session = stripe.billing_portal.Session.create(
+        session = await _stripe_call(
+            stripe.billing_portal.Session.create,
             customer=customer_id,
             return_url=f"{settings.frontend_url}/dashboard/billing",
         )
@@ -167,77 +320,216 @@ class BillingService:
 
     async def cancel_subscription(self, user: User) -> None:
         """Cancel user's subscription at the end of the billing period."""
-        result = await self.db.execute(
-            select(Subscription).where(
-                Subscription.user_id == user.id,
-                Subscription.status == SubscriptionStatus.ACTIVE,
-            )
-        )
-        subscription = result.scalar_one_or_none()
+        subscription = await self._load_sub_by_user(user.id)
 
-        if not subscription or not subscription.stripe_subscription_id:
+        if (
+            not subscription
+            or subscription.status != SubscriptionStatus.ACTIVE
+            or not subscription.stripe_subscription_id
+        ):
             raise ValueError("No active subscription found")
 
         # Cancel at period end (not immediately)
-        stripe.Subscription.modify(
+        await _stripe_call(
+            stripe.Subscription.modify,
             subscription.stripe_subscription_id,
             cancel_at_period_end=True,
         )
 
         subscription.cancel_at_period_end = True
         await self.db.flush()
+        await invalidate_subscription(subscription.stripe_subscription_id)
 
     async def get_subscription(self, user_id: UUID) -> Optional[Subscription]:
         """Get the user's current subscription."""
-        result = await self.db.execute(
-            select(Subscription).where(Subscription.user_id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await self._load_sub_by_user(user_id)
 
-    async def get_invoices(self, user_id: UUID) -> list[Invoice]:
-        """Get all invoices for a user's subscription."""
-        result = await self.db.execute(
+    async def get_invoices(
+        self,
+        user_id: UUID,
+        limit: int = INVOICE_PAGE_SIZE,
+        before: Optional[Tuple[datetime, UUID]] = None,
+    ) -> Tuple[list[Invoice], bool]:
+        """
+        Get a page of a user's invoices, newest first.
+
+        Pages are keyset-paginated on (created_at, id), so each one is a
+        bounded range read of ix_invoices_sub_created however many invoices
+        exist. The id breaks ties between invoices created in the same
+        transaction, which share created_at.
+
+        Args:
+            user_id: User UUID
+            limit: Maximum number of invoices to return
+            before: (created_at, id) of the last invoice on the previous
+                page; only invoices after it in the ordering are returned
+
+        Returns:
+            Tuple of (invoices ordered by created_at and id descending,
+            whether more invoices follow)
+        """
+        stmt = (
             select(Invoice)
             .join(Subscription)
             .where(Subscription.user_id == user_id)
-            .order_by(Invoice.created_at.desc())
+            .order_by(Invoice.created_at.desc(), Invoice.id.desc())
+            # One extra row tells whether another page exists
+            .limit(limit + 1)
         )
-        return list(result.scalars().all())
+        if before is not None:
+            stmt = stmt.where(tuple_(Invoice.created_at, Invoice.id) < tuple_(*before))
+        result = await self.db.execute(stmt)
+        invoices = list(result.scalars().all())
+        return invoices[:limit], len(invoices) > limit
 
     # --- Webhook handlers ---
 
-    async def handle_webhook(self, payload: bytes, signature: str) -> None:
+    async def receive_webhook(self, payload: bytes, signature: str) -> Optional[UUID]:
         """
-        Process a Stripe webhook event.
+        Verify a Stripe webhook and queue it for processing.
+
+        Only the signature check and one insert happen here, so Stripe gets
+        its response without waiting on Stripe API calls or handler
+        queries. Redeliveries of an already stored event hit the unique
+        external_id; they are dropped once the event is processed, and
+        otherwise hand back the stored event so it is enqueued again.
 
         Args:
             payload: Raw request body
             signature: Stripe-Signature header
+
+        Returns:
+            ID of the WebhookEvent to enqueue, or None if it was already
+            processed
         """
-        try:
-            event = stripe.Webhook.construct_event(
-                payload,
-                signature,
-                settings.stripe_webhook_secret,
+        verify_webhook_signature(payload, signature, settings.stripe_webhook_secret)
+
+        # Store the verified body as plain JSON; handlers only read dicts
+        event = json_loads(payload)
+
+        result = await self.db.execute(
+            pg_insert(WebhookEvent)
+            .values(
+                external_id=event["id"],
+                type=event["type"],
+                payload=event,
+                status="pending",
+            )
+            .on_conflict_do_nothing(index_elements=[WebhookEvent.external_id])
+            .returning(WebhookEvent.id)
+        )
+        event_id = result.scalar_one_or_none()
+        if event_id is not None:
+            logger.info(f"Queued Stripe webhook: {event['type']} ({event['id']})")
+            return event_id
+
+        existing = (
+            await self.db.execute(
+                select(WebhookEvent.id, WebhookEvent.status).where(
+                    WebhookEvent.external_id == event["id"]
+                )
+            )
+        ).one()
+        if existing.status == "processed":
+            logger.info(f"Duplicate Stripe webhook ignored: {event['id']}")
+            return None
+
+        # An earlier delivery was never processed (enqueue failed or retries
+        # ran out); processing skips it if a worker finishes it first
+        logger.info(f"Re-queued unprocessed Stripe webhook: {event['id']}")
+        return existing.id
+
+    async def get_stale_webhook_event_ids(self) -> list[UUID]:
+        """
+        Get unprocessed webhook events that no worker has touched recently.
+
+        Covers events whose enqueue failed after the commit and events whose
+        task retries ran out. Events older than WEBHOOK_SWEEP_MAX_AGE are
+        left alone.
+
+        Returns:
+            IDs of pending or failed events to enqueue again
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(WebhookEvent.id).where(
+                WebhookEvent.status != "processed",
+                WebhookEvent.updated_at < now - WEBHOOK_SWEEP_AFTER,
+                WebhookEvent.created_at > now - WEBHOOK_SWEEP_MAX_AGE,
             )
-        except stripe.SignatureVerificationError:
-            raise ValueError("Invalid webhook signature")
-
-        event_type = event["type"]
-        logger.info(f"Processing Stripe webhook: {event_type}")
-
-        if event_type == "checkout.session.completed":
-            await self._handle_checkout_completed(event["data"]["object"])
-        elif event_type == "customer.subscription.updated":
-            await self._handle_subscription_updated(event["data"]["object"])
-        elif event_type == "customer.subscription.deleted":
-            await self._handle_subscription_deleted(event["data"]["object"])
-        elif event_type == "invoice.paid":
-            await self._handle_invoice_paid(event["data"]["object"])
-        elif event_type == "invoice.payment_failed":
-            await self._handle_payment_failed(event["data"]["object"])
+        )
+        return list(result.scalars().all())
+
+    async def process_webhook_event(self, event_id: UUID) -> bool:
+        """
+        Run the handler for a queued webhook event.
+
+        The handler runs in a savepoint, so a failure rolls back its
+        partial changes but still records the error on the event. Events
+        for the same Stripe subscription are serialized across workers
+        with a transaction-scoped advisory lock.
+
+        Args:
+            event_id: WebhookEvent ID returned by receive_webhook
+
+        Returns:
+            False if the handler failed and the event should be retried
+        """
+        event = await self.db.get(WebhookEvent, event_id, with_for_update=True)
+        if not event or event.status == "processed":
+            return True
+
+        logger.info(f"Processing Stripe webhook: {event.type}")
+        data = event.payload["data"]["object"]
+        await self._lock_subscription(event.type, data)
+        try:
+            async with self.db.begin_nested():
+                await self._dispatch_event(event.type, data)
+        except Exception as e:
+            logger.error(f"Stripe webhook {event.external_id} failed: {e}")
+            event.status = "failed"
+            event.error = str(e)
+            await self.db.flush()
+            return False
+
+        event.status = "processed"
+        event.error = None
+        event.processed_at = datetime.now(timezone.utc)
+        await self.db.flush()
+        return True
+
+    async def _lock_subscription(self, event_type: str, data: dict) -> None:
+        """
+        Take a transaction-scoped advisory lock on the event's subscription.
+
+        Concurrent events for one subscription (e.g. checkout completion and
+        subscription.updated) then apply one after another instead of racing
+        on the same rows. The lock is released at commit. The key comes from
+        hashtextextended so every worker derives the same one; Python's
+        hash() is salted per process.
+        """
+        if event_type.startswith("customer.subscription."):
+            stripe_sub_id = data.get("id")
         else:
+            stripe_sub_id = data.get("subscription")
+        if not stripe_sub_id:
+            return
+
+        # Advisory locks are Postgres-only
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"),
+            {"key": f"stripe_sub:{stripe_sub_id}"},
+        )
+
+    async def _dispatch_event(self, event_type: str, data: dict) -> None:
+        """Route a Stripe event's data object to its handler."""
+        handler_name = self._WEBHOOK_HANDLERS.get(event_type)
+        if handler_name is None:
             logger.info(f"Unhandled webhook event: {event_type}")
+            return
+        await getattr(self, handler_name)(data)
 
     async def _handle_checkout_completed(self, session: dict) -> None:
         """Handle successful checkout: create/update subscription."""
@@ -253,136 +545,151 @@ class BillingService:
         customer_id = session["customer"]
         stripe_sub_id = session.get("subscription")
 
-        # Get or create subscription record
-        result = await self.db.execute(
-            select(Subscription).where(Subscription.user_id == user_id)
-        )
-        subscription = result.scalar_one_or_none()
-
-        # Get subscription details from Stripe
+        # The billing period normally comes from the cached
+        # customer.subscription.* payload; on a miss ask Stripe, since that
+        # event may have arrived before the subscription row existed
         period_start = None
         period_end = None
         if stripe_sub_id:
-            try:
-                stripe_sub = stripe.Subscription.retrieve(stripe_sub_id)
-                period_start = datetime.fromtimestamp(
-                    stripe_sub["current_period_start"], tz=timezone.utc
-                )
-                period_end = datetime.fromtimestamp(
-                    stripe_sub["current_period_end"], tz=timezone.utc
-                )
-            except Exception as e:
-                logger.error(f"Failed to retrieve subscription details: {e}")
-
-        if subscription:
-            subscription.stripe_customer_id = customer_id
-            subscription.stripe_subscription_id = stripe_sub_id
-            subscription.plan = plan
-            subscription.status = SubscriptionStatus.ACTIVE
-            subscription.current_period_start = period_start
-            subscription.current_period_end = period_end
-            subscription.cancel_at_period_end = False
-        else:
-            subscription = Subscription(
-                user_id=user_id,
-                stripe_customer_id=customer_id,
-                stripe_subscription_id=stripe_sub_id,
+            period = await get_subscription_period(stripe_sub_id)
+            if period is None:
+                period = await self._retrieve_subscription_period(stripe_sub_id)
+            if period:
+                period_start, period_end = period
+
+        # Create or overwrite the user's subscription in one statement
+        # instead of SELECT-then-INSERT/UPDATE
+        values = {
+            "stripe_customer_id": customer_id,
+            "stripe_subscription_id": stripe_sub_id,
+            "plan": plan,
+            "status": SubscriptionStatus.ACTIVE,
+            "current_period_start": period_start,
+            "current_period_end": period_end,
+            "cancel_at_period_end": False,
+        }
+        stmt = pg_insert(Subscription).values(user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Subscription.user_id],
+            set_={
+                **{key: stmt.excluded[key] for key in values},
+                # Never replace a known period with NULL
+                "current_period_start": func.coalesce(
+                    stmt.excluded.current_period_start,
+                    Subscription.current_period_start,
+                ),
+                "current_period_end": func.coalesce(
+                    stmt.excluded.current_period_end,
+                    Subscription.current_period_end,
+                ),
+                "updated_at": func.now(),
+            },
+        ).returning(Subscription)
+        result = await self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        subscription = result.one()
+        self._remember(subscription)
+
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
                 plan=plan,
-                status=SubscriptionStatus.ACTIVE,
-                current_period_start=period_start,
-                current_period_end=period_end,
+                plan_expires_at=subscription.current_period_end,
+                stripe_customer_id=customer_id,
             )
-            self.db.add(subscription)
-
-        # Update user plan
-        result = await self.db.execute(
-            select(User).where(User.id == user_id)
         )
-        user = result.scalar_one_or_none()
-        if user:
-            user.plan = plan
-            user.plan_expires_at = period_end
-
-        await self.db.flush()
         logger.info(f"Checkout completed: user={user_id}, plan={plan.value}")
 
+    async def _retrieve_subscription_period(
+        self, stripe_sub_id: str
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Fetch a subscription's billing period from Stripe and cache it."""
+        try:
+            stripe_sub = await _stripe_call(stripe.Subscription.retrieve, stripe_sub_id)
+        except Exception as e:
+            logger.error(f"Failed to retrieve subscription details: {e}")
+            return None
+
+        start = stripe_sub["current_period_start"]
+        end = stripe_sub["current_period_end"]
+        await set_subscription_period(stripe_sub_id, start, end)
+        return from_stripe_timestamp(start), from_stripe_timestamp(end)
+
     async def _handle_subscription_updated(self, sub_data: dict) -> None:
         """Handle subscription changes (plan change, renewal, etc.)."""
         stripe_sub_id = sub_data["id"]
-        customer_id = sub_data["customer"]
 
-        result = await self.db.execute(
-            select(Subscription).where(
-                Subscription.stripe_subscription_id == stripe_sub_id
-            )
+        # The payload is the subscription's new state; refresh the cache from it
+        await set_subscription_period(
+            stripe_sub_id,
+            sub_data["current_period_start"],
+            sub_data["current_period_end"],
         )
-        subscription = result.scalar_one_or_none()
 
-        if not subscription:
-            logger.warning(f"Subscription {stripe_sub_id} not found in DB")
-            return
-
-        # Update status
         stripe_status = sub_data["status"]
-        status_map = {
-            "active": SubscriptionStatus.ACTIVE,
-            "past_due": SubscriptionStatus.PAST_DUE,
-            "canceled": SubscriptionStatus.CANCELED,
-            "trialing": SubscriptionStatus.TRIALING,
-            "incomplete": SubscriptionStatus.INCOMPLETE,
+        values = {
+            "status": STRIPE_STATUS_MAP.get(stripe_status, SubscriptionStatus.ACTIVE),
+            "current_period_start": from_stripe_timestamp(sub_data["current_period_start"]),
+            "current_period_end": from_stripe_timestamp(sub_data["current_period_end"]),
+            "cancel_at_period_end": sub_data.get("cancel_at_period_end", False),
         }
-        subscription.status = status_map.get(stripe_status, SubscriptionStatus.ACTIVE)
-
-        # Update period
-        subscription.current_period_start = datetime.fromtimestamp(
-            sub_data["current_period_start"], tz=timezone.utc
-        )
-        subscription.current_period_end = datetime.fromtimestamp(
-            sub_data["current_period_end"], tz=timezone.utc
-        )
-        subscription.cancel_at_period_end = sub_data.get("cancel_at_period_end", False)
 
         # Detect plan change from price
+        new_plan = None
         items = sub_data.get("items", {}).get("data", [])
         if items:
             price_id = items[0].get("price", {}).get("id")
-            if price_id and price_id in PRICE_TO_PLAN:
-                new_plan = PRICE_TO_PLAN[price_id]
-                subscription.plan = new_plan
+            new_plan = PRICE_TO_PLAN.get(price_id) if price_id else None
+        if new_plan:
+            values["plan"] = new_plan
+
+        update_sub = (
+            update(Subscription)
+            .where(Subscription.stripe_subscription_id == stripe_sub_id)
+            .values(**values)
+        )
+        if new_plan:
+            # One round-trip: update the subscription and carry its plan and
+            # period end to the user in a data-modifying CTE
+            updated = update_sub.returning(
+                Subscription.user_id, Subscription.current_period_end
+            ).cte("updated_sub")
+            stmt = (
+                update(User)
+                .where(User.id == updated.c.user_id)
+                .values(plan=new_plan, plan_expires_at=updated.c.current_period_end)
+                .returning(User.id)
+            )
+        else:
+            stmt = update_sub.returning(Subscription.id)
 
-                # Update user plan
-                result = await self.db.execute(
-                    select(User).where(User.id == subscription.user_id)
-                )
-                user = result.scalar_one_or_none()
-                if user:
-                    user.plan = new_plan
-                    user.plan_expires_at = subscription.current_period_end
+        result = await self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        if result.first() is None:
+            logger.warning(f"Subscription {stripe_sub_id} not found in DB")
+            return
 
-        await self.db.flush()
+        # Loaded copies of the row are now stale
+        self._sub_by_stripe_id.pop(stripe_sub_id, None)
         logger.info(f"Subscription updated: {stripe_sub_id}, status={stripe_status}")
 
     async def _handle_subscription_deleted(self, sub_data: dict) -> None:
         """Handle subscription cancellation/expiration."""
         stripe_sub_id = sub_data["id"]
+        await invalidate_subscription(stripe_sub_id)
 
-        result = await self.db.execute(
-            select(Subscription).where(
-                Subscription.stripe_subscription_id == stripe_sub_id
-            )
-        )
-        subscription = result.scalar_one_or_none()
+        subscription = await self._load_sub_by_stripe_id(stripe_sub_id)
 
         if not subscription:
             return
 
         subscription.status = SubscriptionStatus.CANCELED
 
-        # Downgrade user to FREE
-        result = await self.db.execute(
-            select(User).where(User.id == subscription.user_id)
-        )
-        user = result.scalar_one_or_none()
+        # Downgrade user to FREE (loaded with the subscription)
+        user = subscription.user
         if user:
             user.plan = PlanType.FREE
             user.plan_expires_at = None
@@ -398,36 +705,31 @@ class BillingService:
         if not stripe_sub_id:
             return
 
-        result = await self.db.execute(
-            select(Subscription).where(
-                Subscription.stripe_subscription_id == stripe_sub_id
-            )
-        )
-        subscription = result.scalar_one_or_none()
+        subscription = await self._load_sub_by_stripe_id(stripe_sub_id)
 
         if not subscription:
             return
 
-        # Check for duplicate
-        existing = await self.db.execute(
-            select(Invoice).where(Invoice.stripe_invoice_id == stripe_invoice_id)
+        # Redelivered invoices hit the unique stripe_invoice_id and are skipped
+        amount = invoice_data.get("amount_paid", 0)
+        result = await self.db.execute(
+            pg_insert(Invoice)
+            .values(
+                subscription_id=subscription.id,
+                stripe_invoice_id=stripe_invoice_id,
+                amount=amount,
+                currency=invoice_data.get("currency", "usd"),
+                status="paid",
+                paid_at=datetime.now(timezone.utc),
+                pdf_url=invoice_data.get("invoice_pdf"),
+            )
+            .on_conflict_do_nothing(index_elements=[Invoice.stripe_invoice_id])
+            .returning(Invoice.id)
         )
-        if existing.scalar_one_or_none():
+        if result.scalar_one_or_none() is None:
             return
 
-        invoice = Invoice(
-            subscription_id=subscription.id,
-            stripe_invoice_id=stripe_invoice_id,
-            amount=invoice_data.get("amount_paid", 0),
-            currency=invoice_data.get("currency", "usd"),
-            status="paid",
-            paid_at=datetime.now(timezone.utc),
-            pdf_url=invoice_data.get("invoice_pdf"),
-        )
-        self.db.add(invoice)
-        await self.db.flush()
-
-        logger.info(f"Invoice recorded: {stripe_invoice_id}, amount={invoice.amount}")
+        logger.info(f"Invoice recorded: {stripe_invoice_id}, amount={amount}")
 
     async def _handle_payment_failed(self, invoice_data: dict) -> None:
         """Handle failed payment: mark subscription as past_due."""
@@ -436,12 +738,7 @@ class BillingService:
         if not stripe_sub_id:
             return
 
-        result = await self.db.execute(
-            select(Subscription).where(
-                Subscription.stripe_subscription_id == stripe_sub_id
-            )
-        )
-        subscription = result.scalar_one_or_none()
+        subscription = await self._load_sub_by_stripe_id(stripe_sub_id)
 
         if not subscription:
             return
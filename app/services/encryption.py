@@ -1,26 +1,57 @@
 """
-Token encryption service using AES-256-GCM via Fernet.
+Token encryption service using AES-256-GCM.
 
-Fernet uses AES-128-CBC with HMAC for authentication. For stronger encryption
-requirements, this could be upgraded to raw AES-256-GCM, but Fernet provides
-a simpler, safer interface with built-in key rotation support.
+New tokens are sealed with AES-256-GCM, a single-pass AEAD that runs on
+AES-NI/PCLMULQDQ where available. Its key is derived with HKDF from the
+configured Fernet key, so no new secret is needed. Tokens written before
+the switch are Fernet (AES-128-CBC + HMAC-SHA256) and still decrypt.
 """
 import base64
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from app.config import get_settings
 
+settings = get_settings()
+
+# Marks AES-GCM tokens; Fernet tokens are plain urlsafe base64 and never
+# contain ':'
+AESGCM_TOKEN_PREFIX = "v2:"
+AESGCM_NONCE_SIZE = 12
+AESGCM_HKDF_INFO = b"email-agent token encryption v2"
+
+
+@lru_cache(maxsize=4)
+def _build_ciphers(key: bytes) -> Tuple[Fernet, AESGCM]:
+    """
+    Build the Fernet and AES-GCM ciphers for a key, reusing them for repeat keys.
+
+    Both are stateless after construction, so one pair per key can be
+    shared by every TokenEncryption built with that key.
+    """
+    fernet = Fernet(key)
+    aead_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=AESGCM_HKDF_INFO,
+    ).derive(base64.urlsafe_b64decode(key))
+    return fernet, AESGCM(aead_key)
+
 
 class TokenEncryption:
     """
     Service for encrypting and decrypting OAuth tokens.
 
-    Uses Fernet symmetric encryption (AES-128-CBC + HMAC-SHA256).
-    For AES-256, we could use raw cryptography primitives, but Fernet
-    provides better security guarantees for most use cases.
+    Encrypts with AES-256-GCM under a key derived from the Fernet key;
+    decrypts both AES-GCM and legacy Fernet tokens.
     """
 
     def __init__(self, key: Optional[str] = None):
@@ -30,7 +61,6 @@ class TokenEncryption:
         Args:
             key: Base64-encoded Fernet key. If not provided, uses config.
         """
-        settings = get_settings()
         encryption_key = key or settings.token_encryption_key
 
         if not encryption_key:
@@ -43,7 +73,7 @@ class TokenEncryption:
         if isinstance(encryption_key, str):
             encryption_key = encryption_key.encode()
 
-        self._fernet = Fernet(encryption_key)
+        self._fernet, self._aead = _build_ciphers(encryption_key)
 
     def encrypt(self, token: str) -> str:
         """
@@ -53,20 +83,22 @@ class TokenEncryption:
             token: Plain text token to encrypt
 
         Returns:
-            Base64-encoded encrypted token
+            "v2:" followed by base64 of nonce + ciphertext + tag
         """
         if not token:
             raise ValueError("Cannot encrypt empty token")
 
-        encrypted = self._fernet.encrypt(token.encode())
-        return encrypted.decode()
+        nonce = os.urandom(AESGCM_NONCE_SIZE)
+        sealed = self._aead.encrypt(nonce, token.encode(), None)
+        # base64 output is pure ASCII, the cheapest codec to decode
+        return AESGCM_TOKEN_PREFIX + base64.urlsafe_b64encode(nonce + sealed).decode("ascii")
 
     def decrypt(self, encrypted: str) -> str:
         """
         Decrypt an encrypted token.
 
         Args:
-            encrypted: Base64-encoded encrypted token
+            encrypted: Token from encrypt(), or a legacy Fernet token
 
         Returns:
             Original plain text token
@@ -77,11 +109,22 @@ class TokenEncryption:
         if not encrypted:
             raise ValueError("Cannot decrypt empty string")
 
+        if not encrypted.startswith(AESGCM_TOKEN_PREFIX):
+            try:
+                return self._fernet.decrypt(encrypted.encode()).decode()
+            except InvalidToken as e:
+                raise ValueError("Failed to decrypt token: invalid key or corrupted data") from e
+
         try:
-            decrypted = self._fernet.decrypt(encrypted.encode())
-            return decrypted.decode()
-        except InvalidToken as e:
-            raise ValueError(f"Failed to decrypt token: invalid key or corrupted data") from e
+            raw = memoryview(
+                base64.urlsafe_b64decode(encrypted[len(AESGCM_TOKEN_PREFIX):])
+            )
+            # Slicing the view hands nonce and ciphertext over without copies
+            return self._aead.decrypt(
+                raw[:AESGCM_NONCE_SIZE], raw[AESGCM_NONCE_SIZE:], None
+            ).decode()
+        except (InvalidTag, ValueError) as e:
+            raise ValueError("Failed to decrypt token: invalid key or corrupted data") from e
 
 
 def generate_encryption_key() -> str:
@@ -2,18 +2,20 @@
 Gmail API client for fetching and managing emails.
 
 Provides methods to:
-- Fetch messages from Gmail
+- Fetch messages from Gmail (batched messages.get)
 - Get message details
 - Mark messages as read
 - Handle authentication and token refresh
 """
 import base64
+import hashlib
 import logging
 import re
 from datetime import datetime, timezone
 from email.utils import parseaddr
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from cachetools import TTLCache
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -26,6 +28,30 @@ from app.services.encryption import get_token_encryption
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Gmail accepts at most 100 calls in one batch request
+GMAIL_BATCH_SIZE = 100
+
+# Built services are reused across GmailClient instances for this long;
+# shorter than the 1h access token lifetime
+GMAIL_SERVICE_CACHE_TTL = 45 * 60
+GMAIL_SERVICE_CACHE_SIZE = 256
+
+# Headers requested for list fetches; format="metadata" omits the body
+# and attachments
+GMAIL_METADATA_HEADERS = ["From", "Subject", "Date"]
+
+# account id -> (credentials, service, token fingerprint); bounded, and
+# expired entries are dropped on insert, so accounts that stop syncing
+# don't keep a service alive for the life of the worker
+_SERVICE_CACHE: TTLCache = TTLCache(
+    maxsize=GMAIL_SERVICE_CACHE_SIZE, ttl=GMAIL_SERVICE_CACHE_TTL
+)
+
+
+def _token_fingerprint(encrypted_token: str) -> str:
+    """Short digest identifying the stored token a cached service was built from."""
+    return hashlib.sha256(encrypted_token.encode()).hexdigest()[:16]
+
 
 class GmailClientError(Exception):
     """Base exception for Gmail client errors."""
@@ -106,10 +132,22 @@ class GmailClient:
         """
         Get or create Gmail API service.
 
+        Services are cached per account across instances, so polling an
+        account again skips token decryption and discovery parsing. An
+        entry is rebuilt once it expires or the stored token changes, and
+        dropped on a 401.
+
         Returns:
             Gmail API service object
         """
         if self._service is None:
+            account_id = self.email_account.id
+            fingerprint = _token_fingerprint(self.email_account.oauth_token or "")
+            cached = _SERVICE_CACHE.get(account_id)
+            if cached and cached[2] == fingerprint:
+                self._service = cached[1]
+                return self._service
+
             credentials = self._get_credentials()
             logger.info(f"Building Gmail service for {self.email_account.email}")
             try:
@@ -117,6 +155,7 @@ class GmailClient:
                     "gmail", "v1", credentials=credentials, cache_discovery=False
                 )
                 logger.info("Gmail service built successfully")
+                _SERVICE_CACHE[account_id] = (credentials, self._service, fingerprint)
             except Exception as e:
                 logger.error(f"Failed to build Gmail service: {e}", exc_info=True)
                 raise GmailClientError(f"Failed to build Gmail service: {e}")
@@ -138,6 +177,7 @@ class GmailClient:
         status_code = error.resp.status if error.resp else 0
 
         if status_code == 401:
+            _SERVICE_CACHE.pop(self.email_account.id, None)
             raise GmailAuthError("OAuth token expired or revoked")
         elif status_code == 403:
             error_reason = str(error)
@@ -184,81 +224,74 @@ class GmailClient:
                 return header.get("value", "")
         return ""
 
-    def _extract_body_text(self, payload: dict) -> str:
+    def _decode_body(self, data: str) -> Optional[str]:
+        """Decode a base64url body, or return None if it is malformed."""
+        try:
+            return base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
+        except Exception as e:
+            logger.warning(f"Failed to decode body: {e}")
+            return None
+
+    def _extract_bodies(self, payload: dict) -> Tuple[str, Optional[str]]:
         """
-        Extract plain text body from message payload.
+        Extract plain text and HTML bodies in one pass over the MIME tree.
 
-        Handles multipart messages and base64 encoding.
+        Parts are visited depth-first in document order with an explicit
+        stack, and each is decoded at most once. The first text/plain and
+        text/html parts win; a single-part message's own body is the text
+        fallback.
 
         Args:
             payload: Gmail message payload
 
         Returns:
-            Plain text body content
+            Tuple of (plain text body, HTML body or None)
         """
-        body_text = ""
+        text: Optional[str] = None
+        html: Optional[str] = None
+        stack = list(reversed(payload.get("parts", [])))
 
-        # Check for direct body
-        if "body" in payload and payload["body"].get("data"):
-            try:
-                body_text = base64.urlsafe_b64decode(
-                    payload["body"]["data"]
-                ).decode("utf-8", errors="replace")
-            except Exception as e:
-                logger.warning(f"Failed to decode body: {e}")
+        while stack and (text is None or html is None):
+            part = stack.pop()
+            mime_type = part.get("mimeType", "")
+            data = part.get("body", {}).get("data")
 
-        # Handle multipart messages
-        if "parts" in payload:
-            for part in payload["parts"]:
-                mime_type = part.get("mimeType", "")
+            if data and mime_type == "text/plain" and text is None:
+                text = self._decode_body(data)
+            elif data and mime_type == "text/html" and html is None:
+                html = self._decode_body(data)
 
-                # Prefer plain text
-                if mime_type == "text/plain" and part.get("body", {}).get("data"):
-                    try:
-                        body_text = base64.urlsafe_b64decode(
-                            part["body"]["data"]
-                        ).decode("utf-8", errors="replace")
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to decode text/plain part: {e}")
+            if mime_type.startswith("multipart/") and "parts" in part:
+                stack.extend(reversed(part["parts"]))
 
-                # Recursively handle nested multipart
-                if mime_type.startswith("multipart/") and "parts" in part:
-                    nested_text = self._extract_body_text(part)
-                    if nested_text:
-                        body_text = nested_text
-                        break
+        if text is None and payload.get("body", {}).get("data"):
+            text = self._decode_body(payload["body"]["data"])
 
-        return body_text.strip()
+        return (text or "").strip(), html
 
-    def _extract_body_html(self, payload: dict) -> Optional[str]:
+    def _extract_body_text(self, payload: dict) -> str:
         """
-        Extract HTML body from message payload.
+        Extract plain text body from message payload.
 
         Args:
             payload: Gmail message payload
 
         Returns:
-            HTML body content or None
+            Plain text body content
         """
-        if "parts" in payload:
-            for part in payload["parts"]:
-                mime_type = part.get("mimeType", "")
+        return self._extract_bodies(payload)[0]
 
-                if mime_type == "text/html" and part.get("body", {}).get("data"):
-                    try:
-                        return base64.urlsafe_b64decode(
-                            part["body"]["data"]
-                        ).decode("utf-8", errors="replace")
-                    except Exception:
-                        pass
+    def _extract_body_html(self, payload: dict) -> Optional[str]:
+        """
+        Extract HTML body from message payload.
 
-                if mime_type.startswith("multipart/") and "parts" in part:
-                    html = self._extract_body_html(part)
-                    if html:
-                        return html
+        Args:
+            payload: Gmail message payload
 
-        return None
+        Returns:
+            HTML body content or None
+        """
+        return self._extract_bodies(payload)[1]
 
     def _parse_date(self, date_str: str) -> datetime:
         """
@@ -300,17 +333,106 @@ class GmailClient:
 
         return " ".join(query_parts) if query_parts else ""
 
+    def _parse_message(self, message: dict) -> MessageDetails:
+        """
+        Build MessageDetails from a raw Gmail message resource.
+
+        Args:
+            message: Message returned by messages.get. With
+                format="metadata" the bodies come back empty.
+
+        Returns:
+            MessageDetails object with full message content
+        """
+        payload = message.get("payload", {})
+        headers = payload.get("headers", [])
+
+        # Parse headers
+        from_header = self._get_header_value(headers, "From")
+        sender_email, sender_name = self._parse_email_address(from_header)
+        # Review.subject is String(255); Gmail allows much longer headers
+        subject = (self._get_header_value(headers, "Subject") or "(No Subject)")[:255]
+        date_str = self._get_header_value(headers, "Date")
+
+        # Extract body
+        body_text, body_html = self._extract_bodies(payload)
+
+        # Parse labels
+        labels = message.get("labelIds", [])
+
+        # Extract attachments info
+        attachments = []
+        if "parts" in payload:
+            for part in payload["parts"]:
+                if part.get("filename"):
+                    attachments.append(
+                        {
+                            "filename": part["filename"],
+                            "mimeType": part.get("mimeType"),
+                            "size": part.get("body", {}).get("size", 0),
+                        }
+                    )
+
+        return MessageDetails(
+            message_id=message["id"],
+            thread_id=message.get("threadId", ""),
+            sender_email=sender_email,
+            sender_name=sender_name,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            received_at=self._parse_date(date_str),
+            labels=labels,
+            snippet=message.get("snippet"),
+            attachments=attachments,
+        )
+
+
+    def _get_params(self, message_format: str) -> Dict[str, Any]:
+        """
+        Build messages.get parameters for a response format.
+
+        Args:
+            message_format: "metadata" for list views, "full" for bodies
+
+        Returns:
+            Dict of format (and metadataHeaders) parameters
+        """
+        params: Dict[str, Any] = {"format": message_format}
+        if message_format == "metadata":
+            params["metadataHeaders"] = GMAIL_METADATA_HEADERS
+        return params
+
+    def _to_gmail_message(self, details: MessageDetails) -> GmailMessage:
+        """Reduce MessageDetails to the list view GmailMessage."""
+        return GmailMessage(
+            message_id=details.message_id,
+            thread_id=details.thread_id,
+            sender_email=details.sender_email,
+            sender_name=details.sender_name,
+            subject=details.subject,
+            body_text=details.body_text,
+            snippet=details.snippet,
+            received_at=details.received_at,
+            labels=details.labels,
+        )
+
     def get_messages(
         self,
         after: Optional[datetime] = None,
         max_results: int = 50,
+        message_format: str = "metadata",
     ) -> List[GmailMessage]:
         """
         Get messages from Gmail inbox.
 
+        The default "metadata" format fetches only headers, labels and
+        snippet, leaving body_text empty; pass "full" to download bodies.
+
         Args:
             after: Only get messages after this datetime
             max_results: Maximum number of messages to return (default 50)
+            message_format: messages.get format, "metadata" or "full"
 
         Returns:
             List of GmailMessage objects
@@ -353,24 +475,22 @@ class GmailClient:
             logger.info(f"Gmail API returned {len(messages)} message IDs")
             gmail_messages = []
 
-            for msg in messages:
-                try:
-                    details = self.get_message_details(msg["id"])
-                    gmail_messages.append(
-                        GmailMessage(
-                            message_id=details.message_id,
-                            thread_id=details.thread_id,
-                            sender_email=details.sender_email,
-                            sender_name=details.sender_name,
-                            subject=details.subject,
-                            body_text=details.body_text,
-                            received_at=details.received_at,
-                            labels=details.labels,
-                        )
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to get message {msg['id']}: {e}")
-                    continue
+            message_ids = [msg["id"] for msg in messages]
+            for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+                chunk = message_ids[start:start + GMAIL_BATCH_SIZE]
+                fetched = self._batch_get_messages(service, chunk, message_format)
+
+                for message_id in chunk:
+                    message, error = fetched.get(message_id, (None, None))
+                    if error is not None or message is None:
+                        logger.error(f"Failed to get message {message_id}: {error}")
+                        continue
+                    try:
+                        details = self._parse_message(message)
+                    except Exception as e:
+                        logger.error(f"Failed to parse message {message_id}: {e}")
+                        continue
+                    gmail_messages.append(self._to_gmail_message(details))
 
             logger.info(
                 f"Fetched {len(gmail_messages)} messages for {self.email_account.email}"
@@ -385,6 +505,38 @@ class GmailClient:
             logger.error(f"Unexpected error fetching messages: {e}")
             raise GmailClientError(f"Failed to fetch messages: {e}")
 
+    def _batch_get_messages(
+        self, service, message_ids: List[str], message_format: str = "full"
+    ) -> Dict[str, Tuple[Optional[dict], Optional[Exception]]]:
+        """
+        Fetch messages in one Gmail batch request.
+
+        One multipart HTTP round trip replaces a messages.get call per
+        message. A failed sub-request only affects its own message.
+
+        Args:
+            service: Gmail API service
+            message_ids: Up to GMAIL_BATCH_SIZE message IDs
+            message_format: messages.get format, "metadata" or "full"
+
+        Returns:
+            Dict of message ID -> (message, exception); exactly one is set
+        """
+        fetched: Dict[str, Tuple[Optional[dict], Optional[Exception]]] = {}
+
+        def _collect(request_id: str, response: Optional[dict], exception) -> None:
+            fetched[request_id] = (response, exception)
+
+        params = self._get_params(message_format)
+        batch = service.new_batch_http_request(callback=_collect)
+        for message_id in message_ids:
+            batch.add(
+                service.users().messages().get(userId="me", id=message_id, **params),
+                request_id=message_id,
+            )
+        batch.execute()
+        return fetched
+
     def get_message_details(self, message_id: str) -> MessageDetails:
         """
         Get detailed information about a specific message.
@@ -409,49 +561,8 @@ class GmailClient:
                 .get(userId="me", id=message_id, format="full")
                 .execute()
             )
-
-            payload = message.get("payload", {})
-            headers = payload.get("headers", [])
-
-            # Parse headers
-            from_header = self._get_header_value(headers, "From")
-            sender_email, sender_name = self._parse_email_address(from_header)
-            subject = self._get_header_value(headers, "Subject") or "(No Subject)"
-            date_str = self._get_header_value(headers, "Date")
-
-            # Extract body
-            body_text = self._extract_body_text(payload)
-            body_html = self._extract_body_html(payload)
-
-            # Parse labels
-            labels = message.get("labelIds", [])
-
-            # Extract attachments info
-            attachments = []
-            if "parts" in payload:
-                for part in payload["parts"]:
-                    if part.get("filename"):
-                        attachments.append(
-                            {
-                                "filename": part["filename"],
-                                "mimeType": part.get("mimeType"),
-                                "size": part.get("body", {}).get("size", 0),
-                            }
-                        )
-
-            return MessageDetails(
-                message_id=message_id,
-                thread_id=message.get("threadId", ""),
-                sender_email=sender_email,
-                sender_name=sender_name,
-                subject=subject,
-                body_text=body_text,
-                body_html=body_html,
-                received_at=self._parse_date(date_str),
-                labels=labels,
-                snippet=message.get("snippet"),
-                attachments=attachments,
-            )
+            message.setdefault("id", message_id)
+            return self._parse_message(message)
 
         except HttpError as e:
             self._handle_http_error(e)
@@ -6,8 +6,9 @@ Provides async Redis operations for:
 - Session caching
 - Rate limiting
 """
+import asyncio
 import logging
-from typing import Optional
+from typing import Callable, Dict
 
 import redis.asyncio as redis
 
@@ -17,41 +18,80 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Global Redis connection pool
-_redis_pool: Optional[redis.Redis] = None
+# Connection pools per event loop. A redis.asyncio client is bound to the
+# loop it first connected on, and Celery tasks each run on a fresh loop.
+_redis_pools: Dict[asyncio.AbstractEventLoop, redis.Redis] = {}
+_redis_binary_pools: Dict[asyncio.AbstractEventLoop, redis.Redis] = {}
+
+
+def _pool_for_running_loop(
+    pools: Dict[asyncio.AbstractEventLoop, redis.Redis],
+    factory: Callable[[], redis.Redis],
+    name: str,
+) -> redis.Redis:
+    """Get the running loop's client from pools, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    client = pools.get(loop)
+    if client is None:
+        # Forget clients whose loop was closed without close_redis_client()
+        for stale in [other for other in pools if other.is_closed()]:
+            del pools[stale]
+        client = pools[loop] = factory()
+        logger.debug(f"Created {name} connection pool")
+    return client
 
 
 async def get_redis_client() -> redis.Redis:
     """
-    Get async Redis client instance.
+    Get async Redis client instance for the running event loop.
 
     Uses a connection pool for efficient connection management.
 
     Returns:
         Async Redis client
     """
-    global _redis_pool
-
-    if _redis_pool is None:
-        _redis_pool = redis.from_url(
+    return _pool_for_running_loop(
+        _redis_pools,
+        lambda: redis.from_url(
             settings.redis_url,
             encoding="utf-8",
             decode_responses=True,
-        )
-        logger.info("Created Redis connection pool")
+        ),
+        "Redis",
+    )
+
+
+async def get_redis_binary_client() -> redis.Redis:
+    """
+    Get async Redis client that returns raw bytes.
 
-    return _redis_pool
+    Used for binary payloads such as msgpack-encoded cache entries.
+
+    Returns:
+        Async Redis client without response decoding
+    """
+    return _pool_for_running_loop(
+        _redis_binary_pools,
+        lambda: redis.from_url(settings.redis_url),
+        "binary Redis",
+    )
 
 
 async def close_redis_client() -> None:
     """
-    Close Redis connection pool.
+    Close the running event loop's Redis connection pools.
 
-    Should be called during application shutdown.
+    Should be called during application shutdown, and before a Celery
+    task's event loop is closed.
     """
-    global _redis_pool
+    loop = asyncio.get_running_loop()
+
+    client = _redis_pools.pop(loop, None)
+    if client is not None:
+        await client.close()
+        logger.debug("Closed Redis connection pool")
 
-    if _redis_pool is not None:
-        await _redis_pool.close()
-        _redis_pool = None
-        logger.info("Closed Redis connection pool")
+    client = _redis_binary_pools.pop(loop, None)
+    if client is not None:
+        await client.close()
+        logger.debug("Closed binary Redis connection pool")
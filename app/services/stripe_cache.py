@@ -0,0 +1,95 @@
+"""
+Short-lived Redis cache for Stripe subscription billing periods.
+
+Filled from customer.subscription.* webhook payloads so the
+checkout.session.completed handler normally doesn't have to call the
+Stripe API.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Long enough to outlast Stripe's checkout.session.completed retries
+STRIPE_SUB_CACHE_TTL = 3 * 24 * 3600  # 3 days
+
+SubscriptionPeriod = Tuple[datetime, datetime]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def from_stripe_timestamp(ts: int) -> datetime:
+    """
+    Convert a Stripe Unix timestamp to an aware UTC datetime.
+
+    Plain epoch arithmetic; skips the tzinfo.fromutc() round-trip of
+    datetime.fromtimestamp(ts, tz=timezone.utc).
+    """
+    return _EPOCH + timedelta(seconds=ts)
+
+
+def _cache_key(sub_id: str) -> str:
+    return f"stripe_sub:{sub_id}"
+
+
+def _to_period(start: int, end: int) -> SubscriptionPeriod:
+    return from_stripe_timestamp(start), from_stripe_timestamp(end)
+
+
+async def get_subscription_period(sub_id: str) -> Optional[SubscriptionPeriod]:
+    """
+    Get a Stripe subscription's cached billing period.
+
+    The cache is filled from customer.subscription.* webhook payloads; no
+    Stripe API call is made here, so callers fall back to Stripe on a miss.
+
+    Args:
+        sub_id: Stripe subscription ID
+
+    Returns:
+        (current_period_start, current_period_end) as UTC datetimes, or None
+    """
+    try:
+        redis = await get_redis_client()
+        cached = await redis.get(_cache_key(sub_id))
+    except Exception as e:
+        logger.warning(f"Stripe cache read error: {e}")
+        return None
+
+    if not cached:
+        return None
+    start, end = cached.split(":")
+    return _to_period(int(start), int(end))
+
+
+async def set_subscription_period(sub_id: str, start: int, end: int) -> None:
+    """
+    Cache a subscription's billing period from Unix timestamps.
+
+    Args:
+        sub_id: Stripe subscription ID
+        start: current_period_start
+        end: current_period_end
+    """
+    try:
+        redis = await get_redis_client()
+        await redis.setex(_cache_key(sub_id), STRIPE_SUB_CACHE_TTL, f"{start}:{end}")
+    except Exception as e:
+        logger.warning(f"Stripe cache write error: {e}")
+
+
+async def invalidate_subscription(sub_id: str) -> None:
+    """
+    Drop a cached subscription after it changes.
+
+    Args:
+        sub_id: Stripe subscription ID
+    """
+    try:
+        redis = await get_redis_client()
+        await redis.delete(_cache_key(sub_id))
+    except Exception as e:
+        logger.warning(f"Stripe cache delete error: {e}")
@@ -14,12 +14,14 @@ import tempfile
 import uuid
 from collections import Counter
 from datetime import date, datetime, timedelta
+from itertools import chain
 from typing import Dict, List, Optional
 from uuid import UUID
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_mistralai import ChatMistralAI
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
@@ -36,6 +38,17 @@ settings = get_settings()
 # Plans with access to weekly reports
 REPORT_PLANS = {PlanType.PROFESSIONAL, PlanType.ENTERPRISE}
 
+# Enum values bound once, so the per-review loop compares plain strings
+REPORT_SENTIMENTS = (
+    SentimentType.POSITIVE.value,
+    SentimentType.NEGATIVE.value,
+    SentimentType.NEUTRAL.value,
+)
+CRITICAL_PRIORITY = PriorityType.CRITICAL.value
+
+# Rows fetched per round-trip when streaming a week's reviews
+REPORT_STREAM_BATCH_SIZE = 5000
+
 RECOMMENDATIONS_SYSTEM_PROMPT = """Ты - AI-консультант по работе с клиентами.
 Анализируй статистику отзывов и давай конкретные, actionable рекомендации на русском языке."""
 
@@ -144,13 +157,17 @@ class WeeklyReportService:
         week_end = week_start + timedelta(days=6)
         return week_start, week_end
 
-    async def _get_user_account_ids(self, user_id: UUID) -> List[UUID]:
-        result = await self.db.execute(
-            select(EmailAccount.id).where(EmailAccount.user_id == user_id)
+    def _account_ids_subquery(self, user_id: UUID):
+        """Scalar subquery for a user's email account IDs, for use in IN (...)."""
+        return (
+            select(EmailAccount.id)
+            .where(EmailAccount.user_id == user_id)
+            .scalar_subquery()
         )
-        return [row[0] for row in result.fetchall()]
 
-    async def generate_report(self, user_id: UUID) -> WeeklyReport:
+    async def generate_report(
+        self, user_id: UUID, regenerate: bool = False
+    ) -> WeeklyReport:
         """
         Generate a weekly report for a user.
 
@@ -158,25 +175,32 @@ class WeeklyReportService:
         1. Aggregate data for the week
         2. Compare with previous week
         3. Generate AI recommendations
-        4. Save report to DB
+        4. Upsert report into DB
+
+        Args:
+            user_id: User UUID
+            regenerate: Recompute and overwrite this week's report if it
+                already exists, instead of returning it (costs an LLM call)
+
+        Returns:
+            This week's WeeklyReport
         """
         week_start, week_end = self._get_week_range()
 
-        # Check if report already exists
-        existing = await self.db.execute(
-            select(WeeklyReport).where(
-                and_(
-                    WeeklyReport.user_id == user_id,
-                    WeeklyReport.week_start == week_start,
+        if not regenerate:
+            existing_report = await self.db.scalar(
+                select(WeeklyReport).where(
+                    and_(
+                        WeeklyReport.user_id == user_id,
+                        WeeklyReport.week_start == week_start,
+                    )
                 )
             )
-        )
-        existing_report = existing.scalar_one_or_none()
-        if existing_report:
-            logger.info(f"Report for user {user_id} week {week_start} already exists")
-            return existing_report
+            if existing_report:
+                logger.info(f"Report for user {user_id} week {week_start} already exists")
+                return existing_report
 
-        account_ids = await self._get_user_account_ids(user_id)
+        account_ids = self._account_ids_subquery(user_id)
 
         # Current week data
         week_start_dt = datetime.combine(week_start, datetime.min.time())
@@ -188,35 +212,35 @@ class WeeklyReportService:
             Review.received_at <= week_end_dt,
         ]
 
-        reviews_result = await self.db.execute(
-            select(Review).where(and_(*conditions))
+        # Stream only the columns the report needs, in server-side batches,
+        # so a busy week never holds every review (and its problems) in memory
+        reviews_result = await self.db.stream(
+            select(Review.id, Review.sentiment, Review.priority, Review.problems)
+            .where(and_(*conditions))
+            .execution_options(yield_per=REPORT_STREAM_BATCH_SIZE)
         )
-        reviews = list(reviews_result.scalars().all())
 
-        total_reviews = len(reviews)
+        total_reviews = 0
 
         # Sentiment breakdown
-        sentiment_breakdown = {"positive": 0, "negative": 0, "neutral": 0}
+        sentiment_breakdown = dict.fromkeys(REPORT_SENTIMENTS, 0)
         critical_review_ids = []
-        all_problems: List[str] = []
+        problem_counter: Counter = Counter()
 
-        for review in reviews:
-            sentiment = review.sentiment
-            if sentiment == SentimentType.POSITIVE.value:
-                sentiment_breakdown["positive"] += 1
-            elif sentiment == SentimentType.NEGATIVE.value:
-                sentiment_breakdown["negative"] += 1
-            elif sentiment == SentimentType.NEUTRAL.value:
-                sentiment_breakdown["neutral"] += 1
-
-            if review.priority == PriorityType.CRITICAL.value:
-                critical_review_ids.append(str(review.id))
+        async for partition in reviews_result.partitions():
+            total_reviews += len(partition)
+            # One Counter.update per batch keeps the tally in C
+            problem_counter.update(
+                chain.from_iterable(row.problems for row in partition if row.problems)
+            )
+            for review_id, sentiment, priority, _ in partition:
+                if sentiment in sentiment_breakdown:
+                    sentiment_breakdown[sentiment] += 1
 
-            if review.problems:
-                all_problems.extend(review.problems)
+                if priority == CRITICAL_PRIORITY:
+                    critical_review_ids.append(str(review_id))
 
-        # Top problems
-        problem_counter = Counter(all_problems)
+        # Top problems (most_common(n) is a heapq.nlargest, not a full sort)
         top_problems = [
             {"name": name, "count": count}
             for name, count in problem_counter.most_common(10)
@@ -233,17 +257,19 @@ class WeeklyReportService:
             Review.received_at >= prev_start_dt,
             Review.received_at <= prev_end_dt,
         ]
+        # Only counts are needed for the comparison, so group in SQL and
+        # get back one row per sentiment instead of one per review
         prev_result = await self.db.execute(
-            select(Review.sentiment).where(and_(*prev_conditions))
+            select(Review.sentiment, func.count())
+            .where(and_(*prev_conditions))
+            .group_by(Review.sentiment)
         )
-        prev_reviews = prev_result.fetchall()
-        prev_total = len(prev_reviews)
-
-        prev_sentiments = {"positive": 0, "negative": 0, "neutral": 0}
-        for row in prev_reviews:
-            s = row[0]
-            if s in prev_sentiments:
-                prev_sentiments[s] += 1
+        prev_total = 0
+        prev_sentiments = dict.fromkeys(REPORT_SENTIMENTS, 0)
+        for sentiment, count in prev_result.all():
+            prev_total += count
+            if sentiment in prev_sentiments:
+                prev_sentiments[sentiment] = count
 
         total_change_percent = 0.0
         if prev_total > 0:
@@ -269,27 +295,57 @@ class WeeklyReportService:
         )
 
         # Save report
-        report = WeeklyReport(
-            id=uuid.uuid4(),
-            user_id=user_id,
-            week_start=week_start,
-            week_end=week_end,
-            total_reviews=total_reviews,
-            sentiment_breakdown=sentiment_breakdown,
-            top_problems=top_problems,
-            critical_reviews=critical_review_ids,
-            total_change_percent=total_change_percent,
-            sentiment_change=sentiment_change,
-            recommendations=recommendations,
+        report = await self._upsert_report(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "week_start": week_start,
+                "week_end": week_end,
+                "total_reviews": total_reviews,
+                "positive_count": sentiment_breakdown["positive"],
+                "negative_count": sentiment_breakdown["negative"],
+                "neutral_count": sentiment_breakdown["neutral"],
+                "top_problems": top_problems,
+                "critical_reviews": critical_review_ids,
+                "total_change_percent": total_change_percent,
+                "sentiment_change": sentiment_change,
+                "recommendations": recommendations,
+            }
         )
-
-        self.db.add(report)
         await self.db.commit()
-        await self.db.refresh(report)
 
         logger.info(f"Generated weekly report {report.id} for user {user_id}")
         return report
 
+    async def _upsert_report(self, values: Dict) -> WeeklyReport:
+        """
+        Insert a report or overwrite this week's existing one in one statement.
+
+        Uses ON CONFLICT on ix_weekly_reports_user_week, so a report created
+        concurrently or regenerated on purpose is updated in place. Delivery
+        fields (sent_at, pdf_url) and the original id are kept on conflict.
+
+        Args:
+            values: Column values for the report row
+
+        Returns:
+            The inserted or updated WeeklyReport
+        """
+        stmt = pg_insert(WeeklyReport).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WeeklyReport.user_id, WeeklyReport.week_start],
+            set_={
+                key: stmt.excluded[key]
+                for key in values
+                if key not in ("id", "user_id", "week_start")
+            },
+        ).returning(WeeklyReport)
+
+        result = await self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return result.one()
+
     async def generate_recommendations(
         self,
         total_reviews: int,
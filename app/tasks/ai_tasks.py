@@ -24,6 +24,7 @@ from app.services.gmail_client import (
     GmailClientError,
 )
 from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -43,7 +44,12 @@ def get_sync_session() -> Session:
         "postgresql+asyncpg://", "postgresql://"
     )
 
-    sync_engine = create_engine(sync_url, pool_pre_ping=True)
+    sync_engine = create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
     SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
     return SessionLocal()
 
@@ -170,7 +176,9 @@ def analyze_review(self, review_id: str) -> dict:
             use_full_analysis = user.plan != PlanType.FREE
 
             if use_full_analysis:
-                analysis = analyzer.analyze(email_text, review.subject)
+                analysis = analyzer.analyze(
+                    email_text, review.subject, review.sender_name
+                )
             else:
                 analysis = analyzer.analyze_basic(email_text, review.subject)
 
@@ -0,0 +1,58 @@
+"""
+Celery tasks for analytics.
+
+Contains:
+- refresh_review_daily_stats: Refresh the review_daily_stats_mv rollup (scheduled)
+"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def get_sync_session() -> Session:
+    """Create a synchronous database session for Celery tasks."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    sync_url = settings.database_url.replace(
+        "postgresql+asyncpg://", "postgresql://"
+    )
+    sync_engine = create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
+    SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
+    return SessionLocal()
+
+
+@celery_app.task(name="app.tasks.analytics_tasks.refresh_review_daily_stats")
+def refresh_review_daily_stats() -> None:
+    """
+    Refresh the review_daily_stats_mv materialized view.
+
+    CONCURRENTLY keeps the view readable by the analytics endpoints while
+    it is rebuilt.
+    """
+    session = get_sync_session()
+    try:
+        session.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY review_daily_stats_mv")
+        )
+        session.commit()
+        logger.info("Refreshed review_daily_stats_mv")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error refreshing review_daily_stats_mv: {e}")
+        raise
+    finally:
+        session.close()
@@ -0,0 +1,169 @@
+"""
+Celery tasks for billing.
+
+Contains:
+- process_stripe_webhook: Apply a queued Stripe webhook event
+- create_stripe_customer: Create a new user's Stripe customer after signup
+- sweep_stripe_webhooks: Re-enqueue webhook events that were never processed
+"""
+import asyncio
+import logging
+from uuid import UUID
+
+from app.config import get_settings
+from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def get_async_session_for_celery():
+    """Create an async session for use within Celery tasks (via run_async)."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    engine = create_async_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    return session_maker, engine
+
+
+def run_async(coro):
+    """Run async coroutine in sync Celery task."""
+    from app.services.redis_client import close_redis_client
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            # The Redis pool is bound to this loop; close it before the loop
+            await close_redis_client()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+
+async def _process_event(event_id: UUID) -> bool:
+    from app.services.billing import BillingService
+
+    session_maker, engine = get_async_session_for_celery()
+    try:
+        async with session_maker() as db:
+            processed = await BillingService(db).process_webhook_event(event_id)
+            await db.commit()
+            return processed
+    finally:
+        await engine.dispose()
+
+
+async def _stale_event_ids() -> list[UUID]:
+    from app.services.billing import BillingService
+
+    session_maker, engine = get_async_session_for_celery()
+    try:
+        async with session_maker() as db:
+            return await BillingService(db).get_stale_webhook_event_ids()
+    finally:
+        await engine.dispose()
+
+
+async def _create_customer(user_id: UUID) -> bool:
+    from app.models.user import User
+    from app.services.billing import BillingService
+
+    session_maker, engine = get_async_session_for_celery()
+    try:
+        async with session_maker() as db:
+            user = await db.get(User, user_id)
+            if not user:
+                return False
+            await BillingService(db).get_or_create_customer(user)
+            await db.commit()
+            return True
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.billing_tasks.process_stripe_webhook",
+    max_retries=5,
+    default_retry_delay=30,
+    retry_backoff=True,
+    retry_backoff_max=600,
+)
+def process_stripe_webhook(self, event_id: str) -> dict:
+    """
+    Apply a Stripe webhook event queued by BillingService.receive_webhook.
+
+    Args:
+        event_id: UUID of the WebhookEvent row
+
+    Returns:
+        Dict with processing result
+    """
+    logger.info(f"Processing queued Stripe webhook {event_id}")
+
+    processed = run_async(_process_event(UUID(event_id)))
+    if not processed:
+        # The failure is recorded on the event; retry with backoff
+        raise self.retry()
+
+    return {"success": True, "event_id": event_id}
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.billing_tasks.create_stripe_customer",
+    max_retries=3,
+    default_retry_delay=60,
+    retry_backoff=True,
+)
+def create_stripe_customer(self, user_id: str) -> dict:
+    """
+    Create the Stripe customer for a newly registered user.
+
+    Args:
+        user_id: UUID of the User
+
+    Returns:
+        Dict with creation result
+    """
+    try:
+        created = run_async(_create_customer(UUID(user_id)))
+    except Exception as e:
+        logger.error(f"Failed to create Stripe customer for user {user_id}: {e}")
+        raise self.retry(exc=e)
+
+    if not created:
+        logger.warning(f"User {user_id} not found for Stripe customer creation")
+    return {"success": created, "user_id": user_id}
+
+
+@celery_app.task(name="app.tasks.billing_tasks.sweep_stripe_webhooks")
+def sweep_stripe_webhooks() -> dict:
+    """
+    Re-enqueue pending or failed Stripe webhook events.
+
+    Runs periodically via Celery Beat. Picks up events whose enqueue
+    failed after they were stored and events whose retries ran out.
+
+    Returns:
+        Dict with the number of events enqueued
+    """
+    event_ids = run_async(_stale_event_ids())
+    for event_id in event_ids:
+        process_stripe_webhook.delay(str(event_id))
+
+    if event_ids:
+        logger.info(f"Re-enqueued {len(event_ids)} unprocessed Stripe webhooks")
+    return {"enqueued": len(event_ids)}
@@ -23,6 +23,8 @@ celery_app = Celery(
         "app.tasks.ai_tasks",
         "app.tasks.notification_tasks",
         "app.tasks.response_tasks",
+        "app.tasks.analytics_tasks",
+        "app.tasks.billing_tasks",
     ],
 )
 
@@ -46,6 +48,16 @@ celery_app.conf.beat_schedule = {
         "schedule": 60.0,  # Every 60 seconds
         "options": {"queue": "default"},
     },
+    "refresh-review-daily-stats": {
+        "task": "app.tasks.analytics_tasks.refresh_review_daily_stats",
+        "schedule": 300.0,  # Every 5 minutes, the shortest analytics cache TTL
+        "options": {"queue": "default"},
+    },
+    "sweep-stripe-webhooks": {
+        "task": "app.tasks.billing_tasks.sweep_stripe_webhooks",
+        "schedule": 300.0,  # Every 5 minutes, matching WEBHOOK_SWEEP_AFTER
+        "options": {"queue": "default"},
+    },
     "send-weekly-reports": {
         "task": "app.tasks.notification_tasks.send_weekly_reports",
         "schedule": crontab(hour=9, minute=0, day_of_week="monday"),  # Every Monday at 9 AM
@@ -27,6 +27,7 @@ from app.services.gmail_client import (
     GmailTemporaryError,
 )
 from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -47,7 +48,12 @@ def get_sync_session() -> Session:
         "postgresql+asyncpg://", "postgresql://"
     )
 
-    sync_engine = create_engine(sync_url, pool_pre_ping=True)
+    sync_engine = create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
     SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
     return SessionLocal()
 
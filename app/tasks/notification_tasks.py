@@ -19,6 +19,7 @@ from app.models.enums import PlanType
 from app.models.review import Review
 from app.models.user import User
 from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -35,7 +36,12 @@ def get_sync_session() -> Session:
     sync_url = settings.database_url.replace(
         "postgresql+asyncpg://", "postgresql://"
     )
-    sync_engine = create_engine(sync_url, pool_pre_ping=True)
+    sync_engine = create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
     SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
     return SessionLocal()
 
@@ -44,7 +50,12 @@ def get_async_session_for_celery():
     """Create an async session for use within Celery tasks (via run_async)."""
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-    engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+    engine = create_async_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
     session_maker = async_sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -53,9 +64,18 @@ def get_async_session_for_celery():
 
 def run_async(coro):
     """Run async coroutine in sync Celery task."""
+    from app.services.redis_client import close_redis_client
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            # The Redis pool is bound to this loop; close it before the loop
+            await close_redis_client()
+
     loop = asyncio.new_event_loop()
     try:
-        return loop.run_until_complete(coro)
+        return loop.run_until_complete(_run())
     finally:
         loop.close()
 
@@ -27,6 +27,7 @@ from app.services.gmail_client import (
     GmailClientError,
 )
 from app.tasks.celery_app import celery_app
+from app.utils.serialization import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -55,16 +56,30 @@ def get_sync_session() -> Session:
         "postgresql+asyncpg://", "postgresql://"
     )
 
-    sync_engine = create_engine(sync_url, pool_pre_ping=True)
+    sync_engine = create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
+    )
     SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
     return SessionLocal()
 
 
 def _run_async(coro):
     """Run an async coroutine in a sync context."""
+    from app.services.redis_client import close_redis_client
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            # The Redis pool is bound to this loop; close it before the loop
+            await close_redis_client()
+
     loop = asyncio.new_event_loop()
     try:
-        return loop.run_until_complete(coro)
+        return loop.run_until_complete(_run())
     finally:
         loop.close()
 
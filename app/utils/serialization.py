@@ -0,0 +1,18 @@
+"""
+Fast JSON helpers backed by orjson.
+
+Used as the SQLAlchemy JSON column (de)serializer for every engine.
+"""
+from typing import Any
+
+import orjson
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string."""
+    return orjson.dumps(obj).decode()
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Deserialize a JSON string or bytes."""
+    return orjson.loads(data)
@@ -21,6 +21,7 @@ from app.models.email_account import EmailAccount
 from app.models.review import Review
 from app.models.draft_response import DraftResponse
 from app.models.notification_settings import NotificationSettings
+from app.models.review_daily_stats import view_metadata
 from app.services.auth import create_access_token, hash_password
 
 # SQLite async engine for tests
@@ -43,11 +44,15 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create tables and provide a test database session with rollback."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # The analytics rollup is a materialized view in Postgres; a plain
+        # table stands in for it here
+        await conn.run_sync(view_metadata.create_all)
 
     async with TestingSessionLocal() as session:
         yield session
 
     async with engine.begin() as conn:
+        await conn.run_sync(view_metadata.drop_all)
         await conn.run_sync(Base.metadata.drop_all)
 
 
@@ -18,7 +18,7 @@ class TestAnalyticsSummary:
         email_account: EmailAccount,
     ):
         """Summary with no reviews returns zeros."""
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -38,7 +38,7 @@ class TestAnalyticsSummary:
         multiple_reviews: list[Review],
     ):
         """Summary with reviews returns correct counts."""
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -66,7 +66,7 @@ class TestAnalyticsTrends:
         auth_headers: dict,
         email_account: EmailAccount,
     ):
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -83,7 +83,7 @@ class TestAnalyticsTrends:
         auth_headers: dict,
         multiple_reviews: list[Review],
     ):
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -107,7 +107,7 @@ class TestProblemsBreakdown:
         auth_headers: dict,
         email_account: EmailAccount,
     ):
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -124,7 +124,7 @@ class TestProblemsBreakdown:
         auth_headers: dict,
         multiple_reviews: list[Review],
     ):
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
@@ -145,7 +145,7 @@ class TestResponseTime:
         auth_headers: dict,
         multiple_reviews: list[Review],
     ):
-        with patch("app.services.analytics.get_redis_client", new_callable=AsyncMock) as mock_redis:
+        with patch("app.services.analytics.get_redis_binary_client", new_callable=AsyncMock) as mock_redis:
             mock_redis.return_value.get = AsyncMock(return_value=None)
             mock_redis.return_value.setex = AsyncMock()
 
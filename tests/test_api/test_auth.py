@@ -1,4 +1,6 @@
 """Tests for authentication API endpoints."""
+from unittest.mock import patch
+
 import pytest
 from httpx import AsyncClient
 
@@ -24,6 +26,26 @@ class TestRegister:
         assert data["plan"] == "free"
         assert "id" in data
 
+    async def test_register_survives_enqueue_failure(self, client: AsyncClient):
+        from app.api.routes import auth
+
+        with patch.object(auth.settings, "stripe_secret_key", "sk_test"), \
+                patch(
+                    "app.tasks.billing_tasks.create_stripe_customer.delay",
+                    side_effect=ConnectionError("broker down"),
+                ):
+            response = await client.post(
+                "/api/auth/register",
+                json={
+                    "email": "queued@example.com",
+                    "password": "NewPass123",
+                    "full_name": "Queued User",
+                },
+            )
+
+        assert response.status_code == 201
+        assert "access_token" in response.json()
+
     async def test_register_duplicate_email(self, client: AsyncClient, user: User):
         response = await client.post(
             "/api/auth/register",
@@ -1,8 +1,10 @@
 """Tests for AI analysis service."""
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 
-from app.schemas.analysis import ReviewAnalysis, AnalysisState
+from app.schemas.analysis import ReviewAnalysis, AnalysisState, initial_analysis_state
 
 
 class TestReviewAnalysisSchema:
@@ -54,14 +56,14 @@ class TestReviewAnalysisSchema:
 
 
 class TestAnalysisState:
-    """Tests for AnalysisState model."""
+    """Tests for the AnalysisState graph state."""
 
     def test_default_state(self):
-        state = AnalysisState()
-        assert state.review_text == ""
-        assert state.sentiment is None
-        assert state.problems == []
-        assert state.analysis_failed is False
+        state = initial_analysis_state()
+        assert state["review_text"] == ""
+        assert state["sentiment"] is None
+        assert state["problems"] == []
+        assert state["analysis_failed"] is False
 
     def test_state_with_data(self):
         state = AnalysisState(
@@ -71,5 +73,495 @@ class TestAnalysisState:
             priority="normal",
             summary="Positive feedback",
         )
-        assert state.review_text == "Great product!"
-        assert state.sentiment == "positive"
+        assert state["review_text"] == "Great product!"
+        assert state["sentiment"] == "positive"
+
+    def test_default_lists_not_shared(self):
+        first = initial_analysis_state()
+        first["problems"].append("Late")
+        assert initial_analysis_state()["problems"] == []
+
+
+def _make_analyzer(unified: bool):
+    """Create a ReviewAnalyzer with the Mistral client mocked out."""
+    from app.services import ai_analysis
+
+    with patch.object(ai_analysis.settings, "mistral_api_key", "test-key"), \
+            patch.object(ai_analysis.settings, "ai_unified_analysis", unified):
+        analyzer = ai_analysis.ReviewAnalyzer()
+        analyzer.graph  # built lazily, so build it while the flag is patched
+    analyzer.llm = MagicMock()
+    return analyzer
+
+
+@pytest.fixture
+def analyzer():
+    """Analyzer using the single-prompt workflow."""
+    return _make_analyzer(unified=True)
+
+
+@pytest.fixture
+def graph_analyzer():
+    """Analyzer using the multi-node workflow."""
+    return _make_analyzer(unified=False)
+
+
+def _fake_llm_reply(messages) -> str:
+    """Return a canned JSON answer based on which prompt was sent."""
+    prompt = messages[-1].content
+    if '"sentiment"' in prompt and '"requires_response"' in prompt:
+        return (
+            '```json\n{"sentiment": "negative", "problems": ["Late delivery"], '
+            '"suggestions": [], "summary": "Order arrived late", '
+            '"priority": "normal", "customer_name": "Иван", '
+            '"requires_response": false}\n```'
+        )
+    if '"sentiment"' in prompt:
+        return '{"sentiment": "negative"}'
+    if '"problems"' in prompt:
+        return '{"problems": ["Late delivery"]}'
+    if '"suggestions"' in prompt:
+        return '{"suggestions": []}'
+    if '"summary"' in prompt:
+        return '{"summary": "Order arrived late"}'
+    if '"priority"' in prompt:
+        return '{"priority": "critical"}'
+    if '"customer_name"' in prompt:
+        return '{"customer_name": "Иван"}'
+    return '{"requires_response": true}'
+
+
+class TestReviewAnalyzerGraph:
+    """Tests for the LangGraph workflow in ReviewAnalyzer."""
+
+    async def test_analyze_async_runs_independent_nodes_concurrently(self, graph_analyzer):
+        analyzer = graph_analyzer
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_ainvoke(messages):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        analyzer.llm.ainvoke = fake_ainvoke
+
+        result = await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        assert max_in_flight == 5
+        assert result.sentiment == "negative"
+        assert result.priority == "critical"
+        assert result.problems == ["Late delivery"]
+        assert result.customer_name == "Иван"
+        assert result.requires_response is True
+
+    async def test_prompts_share_review_prefix(self, graph_analyzer):
+        prompts = []
+
+        async def fake_ainvoke(messages):
+            prompts.append(messages[-1].content)
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        graph_analyzer.llm.ainvoke = fake_ainvoke
+
+        await graph_analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        prefix = "Тема письма: Доставка\n\nТекст отзыва:\nЗаказ пришёл с опозданием\n\n"
+        assert len(prompts) == 7
+        assert all(prompt.startswith(prefix) for prompt in prompts)
+
+    def test_analyze_sync_wrapper(self, analyzer):
+        async def fake_ainvoke(messages):
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        analyzer.llm.ainvoke = fake_ainvoke
+
+        first = analyzer.analyze("Заказ пришёл с опозданием", "Доставка")
+        second = analyzer.analyze("Заказ пришёл с опозданием", "Доставка")
+
+        assert first == second
+        assert first.summary == "Order arrived late"
+
+    async def test_unified_analysis_single_call(self, analyzer):
+        calls = 0
+
+        async def fake_ainvoke(messages):
+            nonlocal calls
+            calls += 1
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        analyzer.llm.ainvoke = fake_ainvoke
+
+        result = await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        assert calls == 1
+        assert result.sentiment == "negative"
+        assert result.problems == ["Late delivery"]
+        assert result.customer_name == "Иван"
+        # Deterministic rules: negative escalates priority and forces a response
+        assert result.priority == "important"
+        assert result.requires_response is True
+
+    async def test_unified_analysis_llm_failure(self, analyzer):
+        analyzer.llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+
+        result = await analyzer.analyze_async("Спасибо за быстрый заказ!", "Отзыв")
+
+        assert result.sentiment == "neutral"
+        assert result.priority == "normal"
+        assert result.summary == "Спасибо за быстрый заказ!"
+
+
+    async def test_graph_nodes_fall_back_on_llm_failure(self, graph_analyzer):
+        graph_analyzer.llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+
+        result = await graph_analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        assert result.sentiment == "neutral"
+        assert result.priority == "normal"
+        assert result.summary == "Заказ пришёл с опозданием"
+        assert result.problems == []
+        assert result.customer_name is None
+        assert result.requires_response is False
+
+
+class TestSenderName:
+    """Tests for taking the customer name from the From: header."""
+
+    async def test_graph_skips_name_extraction(self, graph_analyzer):
+        prompts = []
+
+        async def fake_ainvoke(messages):
+            prompts.append(messages[-1].content)
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        graph_analyzer.llm.ainvoke = fake_ainvoke
+
+        result = await graph_analyzer.analyze_async(
+            "Заказ пришёл с опозданием", "Доставка", "Пётр Петров"
+        )
+
+        assert result.customer_name == "Пётр Петров"
+        assert result.priority == "critical"
+        assert not any('"customer_name"' in prompt for prompt in prompts)
+
+    async def test_invalid_sender_name_falls_back_to_llm(self, graph_analyzer):
+        async def fake_ainvoke(messages):
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        graph_analyzer.llm.ainvoke = fake_ainvoke
+
+        result = await graph_analyzer.analyze_async(
+            "Заказ пришёл с опозданием", "Доставка", " x "
+        )
+
+        assert result.customer_name == "Иван"
+
+    async def test_unified_prefers_sender_name(self, analyzer):
+        async def fake_ainvoke(messages):
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        analyzer.llm.ainvoke = fake_ainvoke
+
+        result = await analyzer.analyze_async(
+            "Заказ пришёл с опозданием", "Доставка", "Пётр Петров"
+        )
+
+        assert result.customer_name == "Пётр Петров"
+
+
+class TestTriage:
+    """Tests for rule-based handling of short messages."""
+
+    async def test_thank_you_note_skips_llm(self, analyzer):
+        analyzer.llm.ainvoke = AsyncMock()
+
+        result = await analyzer.analyze_async("Спасибо!", "Re: заказ")
+
+        analyzer.llm.ainvoke.assert_not_called()
+        assert result.sentiment == "positive"
+        assert result.priority == "normal"
+        assert result.requires_response is False
+        assert result.problems == []
+        assert analyzer.triaged_count == 1
+
+    async def test_short_complaint_in_graph_workflow(self, graph_analyzer):
+        graph_analyzer.llm.ainvoke = AsyncMock()
+
+        result = await graph_analyzer.analyze_async("<p>Ужасно!</p>", "Отзыв")
+
+        graph_analyzer.llm.ainvoke.assert_not_called()
+        assert result.sentiment == "negative"
+        assert result.priority == "important"
+        assert result.requires_response is True
+
+    async def test_short_text_without_keywords_uses_llm(self, analyzer):
+        async def fake_ainvoke(messages):
+            return MagicMock(content=_fake_llm_reply(messages))
+
+        analyzer.llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+
+        result = await analyzer.analyze_async("Где заказ?", "Доставка")
+
+        analyzer.llm.ainvoke.assert_called_once()
+        assert result.sentiment == "negative"
+        assert analyzer.triaged_count == 0
+
+
+class TestParseJsonResponse:
+    """Tests for ReviewAnalyzer._parse_json_response."""
+
+    def test_code_fenced_nested_json(self, analyzer):
+        from app.schemas.analysis import UnifiedAnalysisResult
+
+        response = '```json\n{"sentiment": "positive", "problems": [], "extra": {"a": 1}}\n```'
+        result = analyzer._parse_json_response(response, UnifiedAnalysisResult)
+        assert result.sentiment == "positive"
+
+    def test_invalid_value_raises(self, analyzer):
+        from pydantic import ValidationError
+
+        from app.schemas.analysis import SentimentResult
+
+        with pytest.raises(ValidationError):
+            analyzer._parse_json_response('{"sentiment": "angry"}', SentimentResult)
+
+    def test_unified_labels_normalized_per_field(self, analyzer):
+        from app.schemas.analysis import UnifiedAnalysisResult
+
+        response = (
+            '{"sentiment": "Positive", "priority": "urgent", '
+            '"problems": ["Долгая доставка"]}'
+        )
+        result = analyzer._parse_json_response(response, UnifiedAnalysisResult)
+        assert result.sentiment == "positive"
+        assert result.priority is None
+        assert result.problems == ["Долгая доставка"]
+
+        result = analyzer._parse_json_response(
+            '{"sentiment": "angry", "priority": "MEDIUM "}', UnifiedAnalysisResult
+        )
+        assert result.sentiment == "neutral"
+        assert result.priority is None
+
+        result = analyzer._parse_json_response(
+            '{"priority": " Critical"}', UnifiedAnalysisResult
+        )
+        assert result.priority == "critical"
+
+
+class TestLLMCache:
+    """Tests for the Redis-backed LLM reply cache."""
+
+    async def test_repeated_prompt_served_from_cache(self, analyzer):
+        store = {}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, value))
+        analyzer.llm.ainvoke = AsyncMock(return_value=MagicMock(content='{"sentiment": "positive"}'))
+
+        with patch("app.services.ai_analysis.get_redis_client", AsyncMock(return_value=redis)):
+            first = await analyzer._acall_llm("prompt")
+            second = await analyzer._acall_llm("prompt")
+
+        assert first == second == '{"sentiment": "positive"}'
+        assert analyzer.llm.ainvoke.await_count == 1
+        assert all(key.startswith("llm:") for key in store)
+
+    async def test_redis_failure_falls_through(self, analyzer):
+        analyzer.llm.ainvoke = AsyncMock(return_value=MagicMock(content="ok"))
+
+        with patch(
+            "app.services.ai_analysis.get_redis_client",
+            AsyncMock(side_effect=ConnectionError("down")),
+        ):
+            assert await analyzer._acall_llm("prompt") == "ok"
+
+
+class TestAnalysisCache:
+    """Tests for the msgpack-encoded analysis result cache."""
+
+    async def test_repeated_review_served_from_cache(self, analyzer):
+        store = {}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, value))
+        analyzer.llm.ainvoke = AsyncMock(
+            side_effect=lambda messages: MagicMock(content=_fake_llm_reply(messages))
+        )
+
+        with patch(
+            "app.services.ai_analysis.get_redis_binary_client",
+            AsyncMock(return_value=redis),
+        ):
+            first = await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+            second = await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        assert first == second
+        assert analyzer.llm.ainvoke.await_count == 1
+        assert all(
+            key.startswith("analysis:") and isinstance(value, bytes)
+            for key, value in store.items()
+        )
+
+    async def test_failed_analysis_not_cached(self, analyzer):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.setex = AsyncMock()
+        analyzer.llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+
+        with patch(
+            "app.services.ai_analysis.get_redis_binary_client",
+            AsyncMock(return_value=redis),
+        ):
+            await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        redis.setex.assert_not_called()
+
+    def test_key_changes_with_prompts_and_sampling(self, analyzer):
+        from app.services import ai_analysis
+
+        key = analyzer._analysis_cache_key("Текст", "Тема", None)
+
+        with patch.object(ai_analysis, "_PROMPTS_DIGEST", "changed"):
+            assert analyzer._analysis_cache_key("Текст", "Тема", None) != key
+        with patch.object(ai_analysis.settings, "ai_temperature", 0.9):
+            assert analyzer._analysis_cache_key("Текст", "Тема", None) != key
+        assert analyzer._analysis_cache_key("Текст", "Тема", None) == key
+
+    def test_encode_decode_round_trip(self):
+        from app.schemas.analysis import decode_analysis, encode_analysis
+
+        analysis = ReviewAnalysis(
+            sentiment="negative",
+            priority="critical",
+            summary="Late delivery",
+            problems=["Late"],
+            customer_name="Иван",
+            requires_response=True,
+        )
+
+        assert decode_analysis(encode_analysis(analysis)) == analysis
+
+    def test_decode_rejects_invalid_values(self):
+        import msgspec
+
+        from app.schemas.analysis import decode_analysis
+
+        payload = msgspec.msgpack.encode(["angry", "normal", "", [], [], None, True])
+
+        with pytest.raises(msgspec.ValidationError):
+            decode_analysis(payload)
+
+
+class TestLLMShield:
+    """Tests for the circuit breaker and per-minute request budget."""
+
+    async def test_open_breaker_skips_llm(self, analyzer):
+        from app.services.ai_analysis import LLMUnavailableError
+
+        analyzer.llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+        for _ in range(analyzer._breaker.fail_max):
+            with pytest.raises(RuntimeError):
+                await analyzer._acall_llm("prompt")
+
+        with pytest.raises(LLMUnavailableError):
+            await analyzer._acall_llm("prompt")
+
+        analyzer.llm.invoke = MagicMock()
+        result = await analyzer.analyze_async("Заказ пришёл с опозданием", "Доставка")
+
+        assert analyzer.llm.ainvoke.await_count == analyzer._breaker.fail_max
+        analyzer.llm.invoke.assert_not_called()
+        assert result.sentiment == "neutral"
+        assert result.summary == "Заказ пришёл с опозданием"
+
+    async def test_breaker_retries_after_reset(self, analyzer):
+        analyzer._breaker.reset_seconds = 0
+        analyzer.llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+        for _ in range(analyzer._breaker.fail_max):
+            with pytest.raises(RuntimeError):
+                await analyzer._acall_llm("prompt")
+
+        analyzer.llm.ainvoke = AsyncMock(return_value=MagicMock(content="ok"))
+
+        assert await analyzer._acall_llm("prompt") == "ok"
+        assert analyzer._breaker.is_open is False
+
+    async def test_rpm_budget_exhausted(self, analyzer):
+        from app.services import ai_analysis
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[3, True])
+        redis = MagicMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+        analyzer.llm.ainvoke = AsyncMock()
+
+        with patch.object(ai_analysis.settings, "mistral_rpm_budget", 2), \
+                patch.object(ai_analysis.settings, "llm_cache_enabled", False), \
+                patch("app.services.ai_analysis.get_redis_client", AsyncMock(return_value=redis)):
+            with pytest.raises(ai_analysis.LLMUnavailableError):
+                await analyzer._acall_llm("prompt")
+
+        analyzer.llm.ainvoke.assert_not_called()
+
+    async def test_rpm_budget_fails_closed_on_repeated_redis_errors(self, analyzer):
+        from app.services import ai_analysis
+
+        redis = MagicMock()
+        redis.pipeline.return_value.execute = AsyncMock(
+            side_effect=ConnectionError("Redis down")
+        )
+        analyzer.llm.ainvoke = AsyncMock(return_value=MagicMock(content="ok"))
+
+        with patch.object(ai_analysis.settings, "mistral_rpm_budget", 2), \
+                patch.object(ai_analysis.settings, "llm_cache_enabled", False), \
+                patch("app.services.ai_analysis.get_redis_client", AsyncMock(return_value=redis)):
+            for _ in range(ai_analysis.RPM_BUDGET_MAX_REDIS_ERRORS - 1):
+                assert await analyzer._acall_llm("prompt") == "ok"
+            with pytest.raises(ai_analysis.LLMUnavailableError):
+                await analyzer._acall_llm("prompt")
+
+        assert (
+            analyzer.llm.ainvoke.await_count
+            == ai_analysis.RPM_BUDGET_MAX_REDIS_ERRORS - 1
+        )
+
+
+class TestCleanText:
+    """Tests for review text preprocessing."""
+
+    def test_strips_html_and_whitespace(self):
+        from app.services.ai_analysis import _clean_text
+
+        assert _clean_text("  Hello <b>world</b>\n\n  bye ") == "Hello world bye"
+
+    def test_plain_text_untouched(self):
+        from app.services.ai_analysis import _clean_text
+
+        assert _clean_text("Цена 5 < 10") == "Цена 5 < 10"
+
+    def test_long_text_truncated(self):
+        from app.services.ai_analysis import MAX_REVIEW_CHARS, _clean_text
+
+        result = _clean_text("a" * (MAX_REVIEW_CHARS + 10))
+        assert result == "a" * MAX_REVIEW_CHARS + "..."
+
+
+class TestLazyInit:
+    """Tests for lazy ReviewAnalyzer construction."""
+
+    def test_llm_created_on_first_use(self):
+        from app.services import ai_analysis
+
+        with patch.object(ai_analysis.settings, "mistral_api_key", "test-key"), \
+                patch.object(ai_analysis, "ChatMistralAI") as chat_cls:
+            analyzer = ai_analysis.ReviewAnalyzer()
+            chat_cls.assert_not_called()
+
+            assert analyzer.llm is analyzer.llm
+            chat_cls.assert_called_once()
+            assert chat_cls.call_args.kwargs["async_client"] is ai_analysis.get_mistral_http_client()
@@ -0,0 +1,477 @@
+"""Tests for analytics service."""
+import asyncio
+import json
+import uuid
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from app.models.email_account import EmailAccount
+from app.models.review_daily_stats import review_daily_stats
+from app.schemas.analytics import (
+    ANALYTICS_SUMMARY_ADAPTER,
+    TREND_POINT_LIST_ADAPTER,
+    AnalyticsSummary,
+    ResponseTimeStats,
+    TrendPoint,
+)
+from app.services.analytics import (
+    AnalyticsService,
+    clear_local_cache,
+    get_cached_or_compute,
+    get_many_cached,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_local_cache():
+    """Keep the in-process analytics cache from leaking between tests."""
+    clear_local_cache()
+    yield
+    clear_local_cache()
+
+
+def _stats_row(account_id, day, **counts) -> dict:
+    """Build a review_daily_stats_mv row with zero defaults."""
+    row = {
+        "email_account_id": account_id,
+        "day": day,
+        "total": 0,
+        "positive": 0,
+        "negative": 0,
+        "neutral": 0,
+        "mixed": 0,
+        "critical": 0,
+        "important": 0,
+        "normal": 0,
+        "processed": 0,
+        "unprocessed": 0,
+        "responded": 0,
+        "sum_response_seconds": 0.0,
+        "min_response_seconds": None,
+        "max_response_seconds": None,
+    }
+    row.update(counts)
+    return row
+
+
+@pytest_asyncio.fixture
+async def daily_stats(db_session, email_account: EmailAccount):
+    """Fill the rollup with three days of stats."""
+    today = date.today()
+    await db_session.execute(
+        insert(review_daily_stats),
+        [
+            _stats_row(
+                email_account.id, today,
+                total=3, positive=2, negative=1, critical=1, normal=2,
+                processed=2, unprocessed=1, responded=2,
+                sum_response_seconds=3 * 3600.0,
+                min_response_seconds=3600.0, max_response_seconds=2 * 3600.0,
+            ),
+            _stats_row(
+                email_account.id, today - timedelta(days=1),
+                total=2, negative=1, neutral=1, important=1, normal=1,
+                processed=1, unprocessed=1, responded=1,
+                sum_response_seconds=6 * 3600.0,
+                min_response_seconds=6 * 3600.0, max_response_seconds=6 * 3600.0,
+            ),
+            _stats_row(
+                email_account.id, today - timedelta(days=40),
+                total=4, positive=4, normal=4, unprocessed=4,
+            ),
+        ],
+    )
+    await db_session.commit()
+
+    return today
+
+
+class TestGetCachedOrCompute:
+    """Tests for the single-key cache helper."""
+
+    async def test_cache_hit_decodes_bytes(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=b'{"total_reviews": 3}')
+        compute = AsyncMock()
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            result = await get_cached_or_compute("key", "7d", compute)
+
+        assert result == {"total_reviews": 3}
+        compute.assert_not_called()
+
+    async def test_miss_stores_uuid_and_naive_datetime(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.setex = AsyncMock()
+        value = {"id": uuid.UUID(int=1), "at": datetime(2026, 1, 2, 3, 4, 5)}
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            result = await get_cached_or_compute("key", "7d", AsyncMock(return_value=value))
+
+        assert result == value
+        key, ttl, payload = redis.setex.await_args.args
+        assert ttl == 300
+        assert json.loads(payload) == {
+            "id": "00000000-0000-0000-0000-000000000001",
+            "at": "2026-01-02T03:04:05+00:00",
+        }
+
+    async def test_adapter_round_trips_model(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.setex = AsyncMock()
+        summary = AnalyticsSummary(total_reviews=5, avg_response_time_hours=1.5)
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            await get_cached_or_compute(
+                "key", "7d", AsyncMock(return_value=summary), ANALYTICS_SUMMARY_ADAPTER
+            )
+            redis.get = AsyncMock(return_value=redis.setex.await_args.args[2])
+            cached = await get_cached_or_compute(
+                "key", "7d", AsyncMock(), ANALYTICS_SUMMARY_ADAPTER
+            )
+
+        assert isinstance(cached, AnalyticsSummary)
+        assert cached == summary
+
+    async def test_large_payload_stored_compressed(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.setex = AsyncMock()
+        points = [
+            TrendPoint(date=f"2026-01-{day:02d}", positive=day, total=day)
+            for day in range(1, 29)
+        ]
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            await get_cached_or_compute(
+                "key", "30d", AsyncMock(return_value=points), TREND_POINT_LIST_ADAPTER
+            )
+            payload = redis.setex.await_args.args[2]
+            redis.get = AsyncMock(return_value=payload)
+            cached = await get_cached_or_compute(
+                "key", "30d", AsyncMock(), TREND_POINT_LIST_ADAPTER
+            )
+
+        assert payload.startswith(b"\x28\xb5\x2f\xfd")
+        assert len(payload) < len(TREND_POINT_LIST_ADAPTER.dump_json(points))
+        assert cached == points
+
+
+class TestLocalCache:
+    """Tests for the in-process cache in front of Redis."""
+
+    async def test_redis_hit_served_locally_next_time(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=b'{"total_reviews": 3}')
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            first = await get_cached_or_compute("key", "7d", AsyncMock())
+            second = await get_cached_or_compute("key", "7d", AsyncMock())
+
+        assert first == second == {"total_reviews": 3}
+        redis.get.assert_awaited_once()
+
+    async def test_models_not_shared_between_hits(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=b'{"total_reviews": 3}')
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            first = await get_cached_or_compute("key", "7d", AsyncMock(), ANALYTICS_SUMMARY_ADAPTER)
+            first.total_reviews = 100
+            second = await get_cached_or_compute("key", "7d", AsyncMock(), ANALYTICS_SUMMARY_ADAPTER)
+
+        assert second.total_reviews == 3
+
+
+class TestGetManyCached:
+    """Tests for the batched cache read behind the dashboard."""
+
+    async def test_invalid_entry_treated_as_miss(self):
+        from app.services import analytics
+
+        redis = MagicMock()
+        redis.mget = AsyncMock(return_value=[b'{"total_reviews": 3}', b'{"old": "format"}'])
+        adapters = {"good": ANALYTICS_SUMMARY_ADAPTER, "stale": TREND_POINT_LIST_ADAPTER}
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            found = await get_many_cached(adapters)
+
+        assert found["good"].total_reviews == 3
+        assert "stale" not in found
+        assert "stale" not in analytics._local_cache
+
+    async def test_invalid_local_entry_dropped(self):
+        from app.services import analytics
+
+        analytics._local_cache["stale"] = b"not json"
+        redis = MagicMock()
+        redis.mget = AsyncMock(return_value=[])
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            found = await get_many_cached({"stale": ANALYTICS_SUMMARY_ADAPTER})
+
+        assert found == {}
+        assert "stale" not in analytics._local_cache
+
+
+class TestGetMetricJson:
+    """Tests for AnalyticsService.get_metric_json."""
+
+    async def test_hit_returned_verbatim(self, db_session, user):
+        body = b'{"total_reviews":4}'
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=body)
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            result = await AnalyticsService(db_session).get_metric_json("summary", user.id, "7d")
+
+        assert result == body
+        redis.get.assert_awaited_once_with(f"analytics:summary:{user.id}:7d")
+
+    async def test_miss_returns_and_caches_model_json(self, db_session, user, daily_stats):
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.set = AsyncMock(return_value=True)
+        redis.setex = AsyncMock()
+        redis.delete = AsyncMock()
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            result = await AnalyticsService(db_session).get_metric_json("summary", user.id, "all")
+
+        assert json.loads(result)["total_reviews"] == 9
+        assert redis.setex.await_args.args[2] == result
+
+
+class TestCacheStampede:
+    """Tests for recompute coalescing in get_cached_or_compute."""
+
+    @staticmethod
+    def _redis(store: dict):
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+        async def set_nx(key, value, nx=False, ex=None):
+            if nx and key in store:
+                return None
+            store[key] = value
+            return True
+
+        async def setex(key, ttl, value):
+            store[key] = value
+
+        async def delete(key):
+            store.pop(key, None)
+
+        redis.set = AsyncMock(side_effect=set_nx)
+        redis.setex = AsyncMock(side_effect=setex)
+        redis.delete = AsyncMock(side_effect=delete)
+        return redis
+
+    async def test_concurrent_misses_compute_once(self):
+        store: dict = {}
+        redis = self._redis(store)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"total_reviews": 1}
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            results = await asyncio.gather(
+                *(get_cached_or_compute("stampede", "7d", compute) for _ in range(5))
+            )
+
+        assert calls == 1
+        assert results == [{"total_reviews": 1}] * 5
+        assert "lock:stampede" not in store
+
+    async def test_waits_for_other_worker(self):
+        store: dict = {"lock:shared": b"1"}
+        redis = self._redis(store)
+        compute = AsyncMock()
+
+        async def other_worker():
+            await asyncio.sleep(0.02)
+            store["shared"] = b'{"total_reviews": 7}'
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            result, _ = await asyncio.gather(
+                get_cached_or_compute("shared", "7d", compute), other_worker()
+            )
+
+        assert result == {"total_reviews": 7}
+        compute.assert_not_called()
+
+    async def test_lock_released_when_compute_fails(self):
+        store: dict = {}
+        redis = self._redis(store)
+        compute = AsyncMock(side_effect=RuntimeError("db down"))
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            with pytest.raises(RuntimeError):
+                await get_cached_or_compute("failing", "7d", compute)
+
+        assert "lock:failing" not in store
+
+
+class TestComputeSummary:
+    """Tests for AnalyticsService._compute_summary."""
+
+    async def test_summary_counts(self, db_session, user, daily_stats):
+        summary = await AnalyticsService(db_session)._compute_summary(user.id, "all")
+
+        assert summary.total_reviews == 9
+        assert summary.positive_reviews == 6
+        assert summary.negative_reviews == 2
+        assert summary.neutral_reviews == 1
+        assert summary.mixed_reviews == 0
+        assert summary.critical_count == 1
+        assert summary.high_count == 1
+        assert summary.medium_count == 7
+        assert summary.processed_count == 3
+        assert summary.unprocessed_count == 6
+        assert summary.avg_response_time_hours == 3.0
+
+    async def test_summary_period_filter(self, db_session, user, daily_stats):
+        summary = await AnalyticsService(db_session)._compute_summary(user.id, "30d")
+
+        assert summary.total_reviews == 5
+        assert summary.positive_reviews == 2
+
+    async def test_summary_without_accounts(self, db_session, daily_stats):
+        summary = await AnalyticsService(db_session)._compute_summary(uuid.uuid4(), "all")
+
+        assert summary.total_reviews == 0
+        assert summary.avg_response_time_hours is None
+
+
+class TestComputeTrends:
+    """Tests for AnalyticsService._compute_trends."""
+
+    async def test_trend_points_ordered_by_day(self, db_session, user, daily_stats):
+        points = await AnalyticsService(db_session)._compute_trends(user.id, "30d")
+
+        today = daily_stats
+        assert [p.date for p in points] == [
+            (today - timedelta(days=1)).isoformat(),
+            today.isoformat(),
+        ]
+        assert points[1].positive == 2
+        assert points[1].total == 3
+
+
+class TestComputeResponseTimeStats:
+    """Tests for AnalyticsService._compute_response_time_stats."""
+
+    async def test_response_time_stats(self, db_session, user, daily_stats):
+        stats = await AnalyticsService(db_session)._compute_response_time_stats(
+            user.id, "all"
+        )
+
+        assert stats.total_count == 9
+        assert stats.processed_count == 3
+        assert stats.avg_hours == 3.0
+        assert stats.min_hours == 1.0
+        assert stats.max_hours == 6.0
+
+
+class _SessionContext:
+    """Async context manager handing out an existing session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestGetDashboard:
+    """Tests for AnalyticsService.get_dashboard."""
+
+    @staticmethod
+    def _redis(cached: dict):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        redis = MagicMock()
+        redis.mget = AsyncMock(side_effect=lambda keys: [cached.get(k) for k in keys])
+        redis.pipeline = MagicMock(return_value=pipe)
+        return redis, pipe
+
+    async def test_one_mget_and_misses_written_back(self, db_session, user, daily_stats):
+        problems_key = f"analytics:problems:{user.id}:all"
+        redis, pipe = self._redis(
+            {problems_key: json.dumps([{"problem": "Late", "count": 2, "percentage": 100.0}]).encode()}
+        )
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            dashboard = await AnalyticsService(db_session).get_dashboard(user.id, "all")
+
+        redis.mget.assert_awaited_once()
+        assert dashboard.summary.total_reviews == 9
+        assert len(dashboard.trends) == 3
+        assert dashboard.problems[0].problem == "Late"
+        assert dashboard.response_time.processed_count == 3
+        written = {call.args[0] for call in pipe.setex.call_args_list}
+        assert problems_key not in written
+        assert len(written) == 3
+
+    async def test_misses_computed_on_own_sessions(self, db_session, user):
+        redis, pipe = self._redis({})
+        sessions = []
+
+        def factory():
+            sessions.append(MagicMock())
+            return _SessionContext(sessions[-1])
+
+        used = []
+
+        def compute(result):
+            async def run(service, user_id, period):
+                used.append(service.db)
+                return result
+            return run
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)), \
+                patch.object(AnalyticsService, "_compute_summary", compute(AnalyticsSummary(total_reviews=2))), \
+                patch.object(AnalyticsService, "_compute_trends", compute([])), \
+                patch.object(AnalyticsService, "_compute_problems_breakdown", compute([])), \
+                patch.object(AnalyticsService, "_compute_response_time_stats", compute(ResponseTimeStats())):
+            dashboard = await AnalyticsService(
+                db_session, session_factory=factory
+            ).get_dashboard(user.id, "all")
+
+        assert len(sessions) == 4
+        assert sorted(map(id, used)) == sorted(map(id, sessions))
+        assert dashboard.summary.total_reviews == 2
+        assert pipe.setex.call_count == 4
+
+    async def test_all_cached_skips_database(self, db_session, user):
+        keys = {
+            f"analytics:summary:{user.id}:7d": {"total_reviews": 4},
+            f"analytics:trends:{user.id}:7d": [],
+            f"analytics:problems:{user.id}:7d": [],
+            f"analytics:response_time:{user.id}:7d": {"total_count": 4},
+        }
+        redis, pipe = self._redis({k: json.dumps(v).encode() for k, v in keys.items()})
+        db_session.execute = AsyncMock()
+
+        with patch("app.services.analytics.get_redis_binary_client", AsyncMock(return_value=redis)):
+            dashboard = await AnalyticsService(db_session).get_dashboard(user.id, "7d")
+
+        db_session.execute.assert_not_called()
+        pipe.execute.assert_not_called()
+        assert dashboard.summary.total_reviews == 4
+        assert dashboard.response_time.total_count == 4
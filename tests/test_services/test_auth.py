@@ -0,0 +1,66 @@
+"""Tests for auth service token helpers."""
+import time
+import uuid
+from unittest.mock import patch
+
+from app.schemas.auth import TokenPayload
+from app.services import auth
+from app.services.auth import (
+    clear_token_cache,
+    create_access_token,
+    create_token_pair,
+    decode_token,
+)
+
+
+class TestDecodeTokenCache:
+    """Tests for the decoded-token cache."""
+
+    def setup_method(self):
+        clear_token_cache()
+
+    def test_repeat_decode_skips_signature_check(self):
+        user_id = uuid.uuid4()
+        token = create_access_token(user_id)
+
+        first = decode_token(token)
+        with patch.object(auth.jwt, "decode") as jwt_decode:
+            second = decode_token(token)
+
+        jwt_decode.assert_not_called()
+        assert second == first
+        assert second.sub == str(user_id)
+
+    def test_invalid_token_not_cached(self):
+        assert decode_token("not-a-token") is None
+        assert "not-a-token" not in auth._token_cache
+
+    def test_expired_cached_token_rejected(self):
+        auth._token_cache["stale"] = TokenPayload(
+            sub=str(uuid.uuid4()), exp=int(time.time()) - 1, type="access"
+        )
+
+        assert decode_token("stale") is None
+
+    def test_clear_token_cache(self):
+        token = create_access_token(uuid.uuid4())
+        decode_token(token)
+
+        clear_token_cache()
+
+        assert token not in auth._token_cache
+
+
+class TestCreateTokenPair:
+    """Tests for create_token_pair."""
+
+    def test_pair_types_and_subject(self):
+        user_id = uuid.uuid4()
+
+        tokens = create_token_pair(user_id)
+
+        access = decode_token(tokens.access_token)
+        refresh = decode_token(tokens.refresh_token)
+        assert (access.type, refresh.type) == ("access", "refresh")
+        assert access.sub == refresh.sub == str(user_id)
+        assert refresh.exp > access.exp
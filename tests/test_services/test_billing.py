@@ -0,0 +1,532 @@
+"""Tests for Stripe webhook intake and processing."""
+import hashlib
+import hmac
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+from sqlalchemy import func, select
+
+from app.models.enums import PlanType
+from app.models.invoice import Invoice
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.models.webhook_event import WebhookEvent
+from app.services import stripe_cache
+from app.services.billing import BillingService, settings, verify_webhook_signature
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def _event_payload(event_id: str = "evt_1", event_type: str = "invoice.paid") -> bytes:
+    return orjson.dumps(
+        {
+            "id": event_id,
+            "type": event_type,
+            "data": {"object": {"id": "in_1", "subscription": "sub_1"}},
+        }
+    )
+
+
+def _sign(payload: bytes, timestamp: int = None, secret: str = WEBHOOK_SECRET) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class TestVerifyWebhookSignature:
+    """Tests for verify_webhook_signature."""
+
+    def test_valid_signature(self):
+        payload = _event_payload()
+
+        verify_webhook_signature(payload, _sign(payload), WEBHOOK_SECRET)
+
+    def test_any_v1_signature_may_match(self):
+        payload = _event_payload()
+        header = _sign(payload).replace("v1=", "v1=deadbeef,v1=")
+
+        verify_webhook_signature(payload, header, WEBHOOK_SECRET)
+
+    @pytest.mark.parametrize(
+        "header",
+        ["", "t=abc,v1=00", "v1=00", "t=1700000000"],
+    )
+    def test_malformed_header_rejected(self, header):
+        with pytest.raises(ValueError):
+            verify_webhook_signature(_event_payload(), header, WEBHOOK_SECRET)
+
+    def test_wrong_secret_rejected(self):
+        payload = _event_payload()
+
+        with pytest.raises(ValueError):
+            verify_webhook_signature(payload, _sign(payload, secret="other"), WEBHOOK_SECRET)
+
+    def test_modified_payload_rejected(self):
+        header = _sign(_event_payload())
+
+        with pytest.raises(ValueError):
+            verify_webhook_signature(_event_payload("evt_2"), header, WEBHOOK_SECRET)
+
+    def test_old_timestamp_rejected(self):
+        payload = _event_payload()
+        header = _sign(payload, timestamp=int(time.time()) - 3600)
+
+        with pytest.raises(ValueError):
+            verify_webhook_signature(payload, header, WEBHOOK_SECRET)
+
+
+class TestReceiveWebhook:
+    """Tests for BillingService.receive_webhook."""
+
+    @pytest.fixture(autouse=True)
+    def _webhook_secret(self):
+        with patch.object(settings, "stripe_webhook_secret", WEBHOOK_SECRET):
+            yield
+
+    async def test_event_queued_as_pending(self, db_session):
+        service = BillingService(db_session)
+        payload = _event_payload()
+
+        event_id = await service.receive_webhook(payload, _sign(payload))
+
+        event = await db_session.get(WebhookEvent, event_id)
+        assert event.external_id == "evt_1"
+        assert event.type == "invoice.paid"
+        assert event.status == "pending"
+        assert event.payload["data"]["object"]["id"] == "in_1"
+
+    async def test_duplicate_of_processed_event_ignored(self, db_session):
+        service = BillingService(db_session)
+
+        payload = _event_payload()
+
+        first = await service.receive_webhook(payload, _sign(payload))
+        event = await db_session.get(WebhookEvent, first)
+        event.status = "processed"
+        await db_session.flush()
+        second = await service.receive_webhook(payload, _sign(payload))
+
+        assert first is not None
+        assert second is None
+        count = await db_session.scalar(select(func.count()).select_from(WebhookEvent))
+        assert count == 1
+
+    @pytest.mark.parametrize("status", ["pending", "failed"])
+    async def test_duplicate_of_unprocessed_event_requeued(self, db_session, status):
+        service = BillingService(db_session)
+        payload = _event_payload()
+
+        first = await service.receive_webhook(payload, _sign(payload))
+        event = await db_session.get(WebhookEvent, first)
+        event.status = status
+        await db_session.flush()
+
+        assert await service.receive_webhook(payload, _sign(payload)) == first
+
+    async def test_invalid_signature_rejected(self, db_session):
+        service = BillingService(db_session)
+
+        with pytest.raises(ValueError):
+            await service.receive_webhook(_event_payload(), "t=1,v1=00")
+
+
+class TestProcessWebhookEvent:
+    """Tests for BillingService.process_webhook_event."""
+
+    async def _queue(self, db_session, event_type: str = "invoice.paid") -> WebhookEvent:
+        event = WebhookEvent(
+            external_id="evt_1",
+            type=event_type,
+            payload=orjson.loads(_event_payload(event_type=event_type)),
+        )
+        db_session.add(event)
+        await db_session.flush()
+        return event
+
+    async def test_dispatches_and_marks_processed(self, db_session):
+        event = await self._queue(db_session)
+        service = BillingService(db_session)
+
+        with patch.object(service, "_handle_invoice_paid", AsyncMock()) as handler:
+            assert await service.process_webhook_event(event.id) is True
+
+        handler.assert_awaited_once_with({"id": "in_1", "subscription": "sub_1"})
+        assert event.status == "processed"
+        assert event.processed_at is not None
+
+    async def test_processed_event_not_handled_again(self, db_session):
+        event = await self._queue(db_session)
+        event.status = "processed"
+        service = BillingService(db_session)
+
+        with patch.object(service, "_handle_invoice_paid", AsyncMock()) as handler:
+            assert await service.process_webhook_event(event.id) is True
+
+        handler.assert_not_awaited()
+
+    async def test_handler_failure_recorded(self, db_session):
+        event = await self._queue(db_session)
+        service = BillingService(db_session)
+
+        with patch.object(
+            service, "_handle_invoice_paid", AsyncMock(side_effect=RuntimeError("boom"))
+        ):
+            assert await service.process_webhook_event(event.id) is False
+
+        assert event.status == "failed"
+        assert event.error == "boom"
+
+
+class TestGetStaleWebhookEventIds:
+    """Tests for BillingService.get_stale_webhook_event_ids."""
+
+    async def test_only_old_unprocessed_events(self, db_session):
+        now = datetime.now(timezone.utc)
+        stale = now - timedelta(minutes=10)
+        events = {
+            "stale_pending": ("pending", stale, stale),
+            "stale_failed": ("failed", stale, stale),
+            "processed": ("processed", stale, stale),
+            "recently_touched": ("failed", stale, now),
+            "expired": ("pending", now - timedelta(days=4), stale),
+        }
+        for external_id, (status, created_at, updated_at) in events.items():
+            db_session.add(
+                WebhookEvent(
+                    external_id=external_id,
+                    type="invoice.paid",
+                    payload={},
+                    status=status,
+                    created_at=created_at,
+                    updated_at=updated_at,
+                )
+            )
+        await db_session.flush()
+
+        event_ids = await BillingService(db_session).get_stale_webhook_event_ids()
+
+        external_ids = await db_session.scalars(
+            select(WebhookEvent.external_id).where(WebhookEvent.id.in_(event_ids))
+        )
+        assert set(external_ids) == {"stale_pending", "stale_failed"}
+
+
+class TestStripeSubscriptionCache:
+    """Tests for the Stripe subscription period cache."""
+
+    async def test_hit_returns_period(self):
+        redis = AsyncMock()
+        redis.get.return_value = "1700000000:1702592000"
+
+        with patch("app.services.stripe_cache.get_redis_client", return_value=redis):
+            start, end = await stripe_cache.get_subscription_period("sub_1")
+
+        redis.get.assert_awaited_once_with("stripe_sub:sub_1")
+        assert start.timestamp() == 1700000000
+        assert end.timestamp() == 1702592000
+
+    async def test_miss_returns_none(self):
+        redis = AsyncMock()
+        redis.get.return_value = None
+
+        with patch("app.services.stripe_cache.get_redis_client", return_value=redis):
+            assert await stripe_cache.get_subscription_period("sub_1") is None
+
+    async def test_set_stores_timestamps(self):
+        redis = AsyncMock()
+
+        with patch("app.services.stripe_cache.get_redis_client", return_value=redis):
+            await stripe_cache.set_subscription_period("sub_1", 1700000000, 1702592000)
+
+        redis.setex.assert_awaited_once_with(
+            "stripe_sub:sub_1",
+            stripe_cache.STRIPE_SUB_CACHE_TTL,
+            "1700000000:1702592000",
+        )
+
+
+class TestSubscriptionLookupMemo:
+    """Tests for BillingService's per-instance subscription lookups."""
+
+    async def test_user_lookup_queried_once(self, db_session, user):
+        subscription = Subscription(
+            user_id=user.id,
+            stripe_customer_id="cus_1",
+            stripe_subscription_id="sub_1",
+            plan=PlanType.STARTER,
+        )
+        db_session.add(subscription)
+        await db_session.flush()
+        service = BillingService(db_session)
+
+        with patch.object(db_session, "execute", wraps=db_session.execute) as execute:
+            assert await service.get_subscription(user.id) is subscription
+            assert await service.get_or_create_customer(user) == "cus_1"
+            assert await service._load_sub_by_stripe_id("sub_1") is subscription
+
+        assert execute.await_count == 1
+
+    async def test_missing_subscription_remembered(self, db_session, user):
+        service = BillingService(db_session)
+
+        with patch.object(db_session, "execute", wraps=db_session.execute) as execute:
+            assert await service.get_subscription(user.id) is None
+            assert await service.get_subscription(user.id) is None
+
+        assert execute.await_count == 1
+
+    async def test_user_loaded_with_subscription(self, db_session, pro_user):
+        db_session.add(
+            Subscription(
+                user_id=pro_user.id,
+                stripe_customer_id="cus_1",
+                stripe_subscription_id="sub_1",
+                plan=PlanType.PROFESSIONAL,
+            )
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+        service = BillingService(db_session)
+
+        with patch("app.services.billing.invalidate_subscription", AsyncMock()), \
+                patch.object(db_session, "execute", wraps=db_session.execute) as execute:
+            await service._handle_subscription_deleted({"id": "sub_1"})
+
+        assert execute.await_count == 1
+        user = await db_session.get(User, pro_user.id)
+        assert user.plan == PlanType.FREE
+
+
+class TestGetOrCreateCustomer:
+    """Tests for BillingService.get_or_create_customer."""
+
+    async def test_customer_on_user_skips_lookups(self, db_session, user):
+        user.stripe_customer_id = "cus_user"
+        service = BillingService(db_session)
+
+        with patch.object(db_session, "execute", wraps=db_session.execute) as execute, \
+                patch("app.services.billing.stripe.Customer.create") as create:
+            assert await service.get_or_create_customer(user) == "cus_user"
+
+        execute.assert_not_awaited()
+        create.assert_not_called()
+
+    async def test_new_customer_stored_on_user(self, db_session, user):
+        service = BillingService(db_session)
+
+        with patch(
+            "app.services.billing.stripe.Customer.create",
+            return_value=type("Customer", (), {"id": "cus_new"})(),
+        ) as create:
+            assert await service.get_or_create_customer(user) == "cus_new"
+            assert await service.get_or_create_customer(user) == "cus_new"
+
+        create.assert_called_once()
+        assert create.call_args.kwargs["idempotency_key"] == f"customer-create-{user.id}"
+        assert user.stripe_customer_id == "cus_new"
+
+
+class TestHandleInvoicePaid:
+    """Tests for recording paid invoices."""
+
+    async def test_redelivered_invoice_recorded_once(self, db_session, user):
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                stripe_customer_id="cus_1",
+                stripe_subscription_id="sub_1",
+                plan=PlanType.STARTER,
+            )
+        )
+        await db_session.flush()
+        service = BillingService(db_session)
+        invoice_data = {"id": "in_1", "subscription": "sub_1", "amount_paid": 1900}
+
+        await service._handle_invoice_paid(invoice_data)
+        await service._handle_invoice_paid(invoice_data)
+
+        invoices = (await db_session.scalars(select(Invoice))).all()
+        assert len(invoices) == 1
+        assert invoices[0].amount == 1900
+
+
+class TestGetInvoices:
+    """Tests for BillingService.get_invoices."""
+
+    async def _add_invoices(self, db_session, user, created_at: list) -> None:
+        subscription = Subscription(
+            user_id=user.id,
+            stripe_customer_id="cus_1",
+            stripe_subscription_id="sub_1",
+            plan=PlanType.STARTER,
+        )
+        db_session.add(subscription)
+        await db_session.flush()
+        for i, created in enumerate(created_at):
+            db_session.add(
+                Invoice(
+                    subscription_id=subscription.id,
+                    stripe_invoice_id=f"in_{i}",
+                    amount=1900,
+                    status="paid",
+                    created_at=created,
+                )
+            )
+        await db_session.flush()
+
+    async def _all_pages(self, service, user_id, limit: int) -> list:
+        pages = []
+        before = None
+        while True:
+            invoices, has_more = await service.get_invoices(user_id, limit=limit, before=before)
+            pages.append([inv.stripe_invoice_id for inv in invoices])
+            if not has_more:
+                return pages
+            before = (invoices[-1].created_at, invoices[-1].id)
+
+    async def test_keyset_pages(self, db_session, user):
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        await self._add_invoices(db_session, user, [base + timedelta(days=i) for i in range(5)])
+
+        pages = await self._all_pages(BillingService(db_session), user.id, limit=2)
+
+        assert pages == [["in_4", "in_3"], ["in_2", "in_1"], ["in_0"]]
+
+    async def test_full_last_page_has_no_next(self, db_session, user):
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        await self._add_invoices(db_session, user, [base + timedelta(days=i) for i in range(4)])
+
+        pages = await self._all_pages(BillingService(db_session), user.id, limit=2)
+
+        assert pages == [["in_3", "in_2"], ["in_1", "in_0"]]
+
+    async def test_shared_created_at_not_skipped(self, db_session, user):
+        same = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        await self._add_invoices(db_session, user, [same] * 5)
+
+        pages = await self._all_pages(BillingService(db_session), user.id, limit=2)
+
+        seen = [invoice_id for page in pages for invoice_id in page]
+        assert sorted(seen) == [f"in_{i}" for i in range(5)]
+
+
+class TestHandleSubscriptionUpdated:
+    """Tests for the customer.subscription.updated handler."""
+
+    @pytest.fixture(autouse=True)
+    def _no_cache(self):
+        with patch("app.services.billing.set_subscription_period", AsyncMock()):
+            yield
+
+    def _sub_data(self, status: str = "past_due") -> dict:
+        return {
+            "id": "sub_1",
+            "customer": "cus_1",
+            "status": status,
+            "current_period_start": 1700000000,
+            "current_period_end": 1702592000,
+            "cancel_at_period_end": True,
+        }
+
+    async def test_updates_status_and_period(self, db_session, user):
+        subscription = Subscription(
+            user_id=user.id,
+            stripe_customer_id="cus_1",
+            stripe_subscription_id="sub_1",
+            plan=PlanType.STARTER,
+        )
+        db_session.add(subscription)
+        await db_session.commit()
+
+        await BillingService(db_session)._handle_subscription_updated(self._sub_data())
+
+        await db_session.refresh(subscription)
+        assert subscription.status == "past_due"
+        assert subscription.cancel_at_period_end is True
+        assert subscription.current_period_end.timestamp() == 1702592000
+
+    async def test_unknown_subscription_ignored(self, db_session):
+        await BillingService(db_session)._handle_subscription_updated(self._sub_data())
+
+
+class TestHandleCheckoutCompleted:
+    """Tests for the checkout.session.completed handler."""
+
+    @pytest.fixture(autouse=True)
+    def _no_stripe_period(self):
+        with patch(
+            "app.services.billing.get_subscription_period",
+            AsyncMock(return_value=None),
+        ), patch(
+            "app.services.billing.stripe.Subscription.retrieve",
+            side_effect=RuntimeError("Stripe unavailable"),
+        ):
+            yield
+
+    def _session(self, user, plan: str, sub_id: str) -> dict:
+        return {
+            "metadata": {"user_id": str(user.id), "plan": plan},
+            "customer": "cus_1",
+            "subscription": sub_id,
+        }
+
+    async def test_creates_then_overwrites_subscription(self, db_session, user):
+        service = BillingService(db_session)
+
+        await service._handle_checkout_completed(self._session(user, "starter", "sub_1"))
+        await service._handle_checkout_completed(
+            self._session(user, "professional", "sub_2")
+        )
+
+        subscriptions = (await db_session.scalars(select(Subscription))).all()
+        assert len(subscriptions) == 1
+        assert subscriptions[0].plan == PlanType.PROFESSIONAL
+        assert subscriptions[0].stripe_subscription_id == "sub_2"
+        await db_session.refresh(user)
+        assert user.plan == PlanType.PROFESSIONAL
+
+    async def test_cache_miss_fetches_period_from_stripe(self, db_session, user):
+        with patch(
+            "app.services.billing.stripe.Subscription.retrieve",
+            return_value={
+                "current_period_start": 1700000000,
+                "current_period_end": 1702592000,
+            },
+        ) as retrieve, patch(
+            "app.services.billing.set_subscription_period", AsyncMock()
+        ) as cache_set:
+            await BillingService(db_session)._handle_checkout_completed(
+                self._session(user, "starter", "sub_1")
+            )
+
+        retrieve.assert_called_once_with("sub_1")
+        cache_set.assert_awaited_once_with("sub_1", 1700000000, 1702592000)
+        subscription = await db_session.scalar(select(Subscription))
+        assert subscription.current_period_end.timestamp() == 1702592000
+        await db_session.refresh(user)
+        assert user.plan_expires_at.timestamp() == 1702592000
+
+    async def test_unknown_period_keeps_existing(self, db_session, user):
+        period_end = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        db_session.add(Subscription(
+            user_id=user.id,
+            stripe_customer_id="cus_1",
+            stripe_subscription_id="sub_1",
+            plan=PlanType.STARTER,
+            current_period_end=period_end,
+        ))
+        await db_session.commit()
+
+        await BillingService(db_session)._handle_checkout_completed(
+            self._session(user, "starter", "sub_1")
+        )
+
+        subscription = await db_session.scalar(select(Subscription))
+        assert subscription.current_period_end.replace(tzinfo=timezone.utc) == period_end
+        await db_session.refresh(user)
+        assert user.plan_expires_at.replace(tzinfo=timezone.utc) == period_end
@@ -0,0 +1,44 @@
+"""Tests for OAuth token encryption."""
+import pytest
+from cryptography.fernet import Fernet
+
+from app.services.encryption import (
+    AESGCM_TOKEN_PREFIX,
+    TokenEncryption,
+    generate_encryption_key,
+)
+
+
+class TestTokenEncryption:
+    """Tests for TokenEncryption."""
+
+    def test_round_trip_uses_aesgcm(self):
+        encryption = TokenEncryption(generate_encryption_key())
+
+        encrypted = encryption.encrypt("refresh-token")
+
+        assert encrypted.startswith(AESGCM_TOKEN_PREFIX)
+        assert encryption.decrypt(encrypted) == "refresh-token"
+
+    def test_legacy_fernet_token_decrypts(self):
+        key = generate_encryption_key()
+        legacy = Fernet(key.encode()).encrypt(b"refresh-token").decode()
+
+        assert TokenEncryption(key).decrypt(legacy) == "refresh-token"
+
+    def test_wrong_key_rejected(self):
+        encrypted = TokenEncryption(generate_encryption_key()).encrypt("refresh-token")
+
+        with pytest.raises(ValueError):
+            TokenEncryption(generate_encryption_key()).decrypt(encrypted)
+
+    def test_tampered_token_rejected(self):
+        encryption = TokenEncryption(generate_encryption_key())
+        encrypted = encryption.encrypt("refresh-token")
+        # Flip a character inside the ciphertext; trailing characters can
+        # carry only base64 padding bits
+        i = len(encrypted) // 2
+        tampered = encrypted[:i] + ("A" if encrypted[i] != "A" else "B") + encrypted[i + 1:]
+
+        with pytest.raises(ValueError):
+            encryption.decrypt(tampered)
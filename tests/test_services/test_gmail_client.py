@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from cachetools import TTLCache
 
 from app.models.email_account import EmailAccount
 from app.services.gmail_client import (
@@ -48,6 +49,57 @@ class TestGmailClientInit:
             client._get_credentials()
 
 
+class TestServiceCache:
+    def _client(self, account):
+        with patch("app.services.gmail_client.get_token_encryption") as mock_enc:
+            mock_enc.return_value.decrypt.return_value = "decrypted_token"
+            return GmailClient(account)
+
+    def test_service_reused_across_instances(self, email_account_obj):
+        with patch("app.services.gmail_client.build") as build:
+            first = self._client(email_account_obj)._get_service()
+            second = self._client(email_account_obj)._get_service()
+
+        assert first is second
+        build.assert_called_once()
+
+    def test_changed_token_rebuilds(self, email_account_obj):
+        with patch("app.services.gmail_client.build") as build:
+            self._client(email_account_obj)._get_service()
+            email_account_obj.oauth_token = "new_encrypted_token"
+            self._client(email_account_obj)._get_service()
+
+        assert build.call_count == 2
+
+    def test_auth_error_evicts(self, email_account_obj):
+        error = MagicMock()
+        error.resp.status = 401
+
+        with patch("app.services.gmail_client.build") as build:
+            client = self._client(email_account_obj)
+            client._get_service()
+            with pytest.raises(GmailAuthError):
+                client._handle_http_error(error)
+            self._client(email_account_obj)._get_service()
+
+        assert build.call_count == 2
+
+    def test_expired_entries_dropped_on_insert(self, email_account_obj):
+        cache = TTLCache(maxsize=4, ttl=60, timer=lambda: now)
+        now = 0
+        with patch("app.services.gmail_client._SERVICE_CACHE", cache), \
+                patch("app.services.gmail_client.build"):
+            self._client(email_account_obj)._get_service()
+            now = 120
+            other = MagicMock(spec=EmailAccount)
+            other.id = uuid.uuid4()
+            other.oauth_token = "other_token"
+            other.oauth_refresh_token = "other_refresh"
+            self._client(other)._get_service()
+
+        assert list(cache.keys()) == [other.id]
+
+
 class TestParseEmailAddress:
     def test_parse_name_and_email(self, gmail_client):
         email, name = gmail_client._parse_email_address(
@@ -111,6 +163,42 @@ class TestExtractBodyText:
         assert gmail_client._extract_body_text(payload) == ""
 
 
+class TestExtractBodies:
+    def _part(self, mime_type, content):
+        return {
+            "mimeType": mime_type,
+            "body": {"data": base64.urlsafe_b64encode(content).decode()},
+        }
+
+    def test_nested_multipart(self, gmail_client):
+        payload = {
+            "mimeType": "multipart/mixed",
+            "body": {},
+            "parts": [
+                {
+                    "mimeType": "multipart/alternative",
+                    "parts": [
+                        self._part("text/plain", b"Plain"),
+                        self._part("text/html", b"<b>HTML</b>"),
+                    ],
+                },
+                self._part("text/plain", b"Attachment text"),
+            ],
+        }
+
+        with patch.object(
+            gmail_client, "_decode_body", wraps=gmail_client._decode_body
+        ) as decode:
+            assert gmail_client._extract_bodies(payload) == ("Plain", "<b>HTML</b>")
+
+        assert decode.call_count == 2
+
+    def test_single_part_body_is_text(self, gmail_client):
+        payload = self._part("text/html", b"<p>Hi</p>")
+
+        assert gmail_client._extract_bodies(payload) == ("<p>Hi</p>", None)
+
+
 class TestBuildQuery:
     def test_no_after(self, gmail_client):
         assert gmail_client._build_query() == ""
@@ -160,3 +248,120 @@ class TestParseDate:
         dt = gmail_client._parse_date("not a date")
         assert dt.tzinfo is not None
         # Should return current time as fallback
+
+
+class TestGetMessageDetails:
+    def test_long_subject_truncated(self, gmail_client):
+        service = MagicMock()
+        service.users.return_value.messages.return_value.get.return_value.execute.return_value = {
+            "id": "msg1",
+            "threadId": "thread1",
+            "labelIds": [],
+            "payload": {
+                "headers": [
+                    {"name": "From", "value": "john@example.com"},
+                    {"name": "Subject", "value": "x" * 1000},
+                ],
+                "body": {},
+            },
+        }
+        gmail_client._service = service
+
+        details = gmail_client.get_message_details("msg1")
+        assert len(details.subject) == 255
+
+
+class _FakeBatch:
+    """Stands in for BatchHttpRequest, answering from a dict of messages."""
+
+    def __init__(self, callback, messages):
+        self._callback = callback
+        self._messages = messages
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        for request_id in self.request_ids:
+            message = self._messages.get(request_id)
+            if message is None:
+                self._callback(request_id, None, RuntimeError("not found"))
+            else:
+                self._callback(request_id, message, None)
+
+
+class TestGetMessages:
+    def _message(self, message_id):
+        return {
+            "id": message_id,
+            "threadId": f"thread-{message_id}",
+            "labelIds": ["INBOX"],
+            "payload": {
+                "headers": [
+                    {"name": "From", "value": "John <john@example.com>"},
+                    {"name": "Subject", "value": f"Subject {message_id}"},
+                    {"name": "Date", "value": "Mon, 01 Jan 2024 12:00:00 +0000"},
+                ],
+                "body": {"data": base64.urlsafe_b64encode(b"Body").decode()},
+            },
+        }
+
+    def _service(self, ids, messages):
+        service = MagicMock()
+        service.users.return_value.messages.return_value.list.return_value.execute.return_value = {
+            "messages": [{"id": message_id} for message_id in ids]
+        }
+        batches = []
+
+        def new_batch(callback):
+            batch = _FakeBatch(callback, messages)
+            batches.append(batch)
+            return batch
+
+        service.new_batch_http_request.side_effect = new_batch
+        return service, batches
+
+    def test_messages_fetched_in_one_batch(self, gmail_client):
+        ids = ["m1", "m2", "m3"]
+        service, batches = self._service(ids, {i: self._message(i) for i in ids})
+        gmail_client._service = service
+
+        messages = gmail_client.get_messages(message_format="full")
+
+        assert [m.message_id for m in messages] == ids
+        assert messages[0].subject == "Subject m1"
+        assert messages[0].body_text == "Body"
+        assert len(batches) == 1
+        service.users.return_value.messages.return_value.get.return_value.execute.assert_not_called()
+
+    def test_metadata_format_by_default(self, gmail_client):
+        service, _ = self._service(["m1"], {"m1": self._message("m1")})
+        gmail_client._service = service
+
+        gmail_client.get_messages()
+
+        service.users.return_value.messages.return_value.get.assert_called_once_with(
+            userId="me",
+            id="m1",
+            format="metadata",
+            metadataHeaders=["From", "Subject", "Date"],
+        )
+
+    def test_batches_chunked(self, gmail_client):
+        ids = [f"m{i}" for i in range(150)]
+        service, batches = self._service(ids, {i: self._message(i) for i in ids})
+        gmail_client._service = service
+
+        messages = gmail_client.get_messages(max_results=150)
+
+        assert len(messages) == 150
+        assert [len(batch.request_ids) for batch in batches] == [100, 50]
+
+    def test_failed_message_skipped(self, gmail_client):
+        service, _ = self._service(["m1", "m2"], {"m2": self._message("m2")})
+        gmail_client._service = service
+
+        messages = gmail_client.get_messages()
+
+        assert [m.message_id for m in messages] == ["m2"]
@@ -0,0 +1,32 @@
+"""Tests for the per-event-loop Redis client."""
+from unittest.mock import AsyncMock, patch
+
+from app.services import redis_client
+from app.services.redis_client import get_redis_client
+from app.tasks.billing_tasks import run_async
+
+
+def _fake_from_url(*args, **kwargs):
+    return AsyncMock()
+
+
+class TestRedisClientPerLoop:
+    def test_each_task_loop_gets_its_own_client(self):
+        with patch("app.services.redis_client.redis.from_url", _fake_from_url):
+            first = run_async(get_redis_client())
+            second = run_async(get_redis_client())
+
+        assert first is not second
+        first.close.assert_awaited_once()
+        second.close.assert_awaited_once()
+        assert first not in redis_client._redis_pools.values()
+        assert second not in redis_client._redis_pools.values()
+
+    async def test_client_reused_within_loop(self):
+        with patch("app.services.redis_client.redis.from_url", _fake_from_url):
+            client = await get_redis_client()
+            assert await get_redis_client() is client
+            await redis_client.close_redis_client()
+
+        client.close.assert_awaited_once()
+        assert client not in redis_client._redis_pools.values()
@@ -0,0 +1,26 @@
+"""Tests for weekly report generation."""
+from unittest.mock import AsyncMock, patch
+
+from app.models.weekly_report import WeeklyReport
+from app.services.weekly_report import WeeklyReportService
+
+
+class TestGenerateReport:
+    """Tests for WeeklyReportService.generate_report."""
+
+    async def test_existing_report_returned(self, db_session, user):
+        service = WeeklyReportService(db_session)
+        week_start, week_end = service._get_week_range()
+        report = WeeklyReport(
+            user_id=user.id,
+            week_start=week_start,
+            week_end=week_end,
+            total_reviews=3,
+        )
+        db_session.add(report)
+        await db_session.flush()
+
+        with patch.object(service, "generate_recommendations", AsyncMock()) as recommend:
+            assert await service.generate_report(user.id) is report
+
+        recommend.assert_not_awaited()